@@ -2,6 +2,10 @@ from .user import User, UserSettings, UserOauth
 from .wallet import Wallet, WalletUser
 from .catalog import Category, Product
 from .transaction import Transaction, RecurringTransaction
+from .budget import CategoryBudget, CategoryBudgetSpend
+from .period import PeriodSnapshot
+from .fx import FxRate
+from .idempotency import IdempotencyKey
 
 __all__ = [
     "User",
@@ -13,4 +17,9 @@ __all__ = [
     "Product",
     "Transaction",
     "RecurringTransaction",
+    "CategoryBudget",
+    "CategoryBudgetSpend",
+    "PeriodSnapshot",
+    "FxRate",
+    "IdempotencyKey",
 ]
@@ -0,0 +1,84 @@
+# pyright: reportUnannotatedClassAttribute=false
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import DateTime, Numeric, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+
+from ...schemas.budget import CategoryBudgetBase
+from ._common import utcnow
+
+
+class CategoryBudget(CategoryBudgetBase, table=True):
+    __tablename__ = "category_budgets"
+    __table_args__ = (
+        UniqueConstraint(
+            "wallet_id", "category_id", name="uix_category_budget_wallet_category"
+        ),
+    )
+
+    id: uuid.UUID = Field(
+        default_factory=uuid.uuid4,
+        primary_key=True,
+        sa_type=PGUUID(as_uuid=True),
+    )
+
+    wallet_id: uuid.UUID = Field(
+        foreign_key="wallets.id",
+        ondelete="CASCADE",
+        nullable=False,
+        sa_type=PGUUID(as_uuid=True),
+    )
+
+    category_id: uuid.UUID = Field(
+        foreign_key="categories.id",
+        ondelete="CASCADE",
+        nullable=False,
+        sa_type=PGUUID(as_uuid=True),
+    )
+
+    # okres budżetu jest zamrożony przy tworzeniu, żeby liczniki miały stały klucz
+    billing_day: int = Field(nullable=False)
+    timezone: str = Field(nullable=False, sa_type=String)
+
+    created_at: datetime = Field(
+        default_factory=utcnow,
+        nullable=False,
+        sa_type=DateTime(timezone=True),
+    )
+
+    updated_at: datetime = Field(
+        default_factory=utcnow,
+        nullable=False,
+        sa_type=DateTime(timezone=True),
+    )
+
+    category: "Category" = Relationship()
+
+
+class CategoryBudgetSpend(SQLModel, table=True):
+    __tablename__ = "category_budget_spend"
+
+    budget_id: uuid.UUID = Field(
+        foreign_key="category_budgets.id",
+        ondelete="CASCADE",
+        primary_key=True,
+        sa_type=PGUUID(as_uuid=True),
+    )
+
+    period_start: datetime = Field(
+        primary_key=True,
+        sa_type=DateTime(timezone=True),
+    )
+
+    period_end: datetime = Field(nullable=False, sa_type=DateTime(timezone=True))
+
+    spent: Decimal = Field(default=Decimal("0"), nullable=False, sa_type=Numeric(12, 2))
+
+    updated_at: datetime = Field(
+        default_factory=utcnow,
+        nullable=False,
+        sa_type=DateTime(timezone=True),
+    )
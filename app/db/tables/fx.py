@@ -0,0 +1,23 @@
+# pyright: reportUnannotatedClassAttribute=false
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlmodel import Field
+from sqlalchemy import Date, DateTime, Numeric, String
+
+from ...schemas.fx import FxRateBase
+from ._common import utcnow
+
+
+class FxRate(FxRateBase, table=True):
+    __tablename__ = "fx_rates"
+
+    currency: str = Field(primary_key=True, sa_type=String(3))
+    rate_date: date = Field(primary_key=True, sa_type=Date)
+    rate: Decimal = Field(nullable=False, sa_type=Numeric(18, 6))
+
+    loaded_at: datetime = Field(
+        default_factory=utcnow,
+        nullable=False,
+        sa_type=DateTime(timezone=True),
+    )
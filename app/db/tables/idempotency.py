@@ -0,0 +1,38 @@
+# pyright: reportUnannotatedClassAttribute=false
+import uuid
+from datetime import datetime
+
+from sqlmodel import Field, SQLModel
+from sqlalchemy import DateTime, Index, Integer, LargeBinary, String
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+
+from ._common import utcnow
+
+
+class IdempotencyKey(SQLModel, table=True):
+    """Stored response of a write request sent with an `Idempotency-Key` header."""
+
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (Index("ix_idempotency_keys_expires_at", "expires_at"),)
+
+    user_id: uuid.UUID = Field(
+        foreign_key="users.id",
+        ondelete="CASCADE",
+        primary_key=True,
+        sa_type=PGUUID(as_uuid=True),
+    )
+    key: str = Field(primary_key=True, sa_type=String(255))
+
+    # sha256 metody, ścieżki, query i treści żądania
+    request_hash: bytes = Field(nullable=False, sa_type=LargeBinary)
+
+    status_code: int = Field(nullable=False, sa_type=Integer)
+    media_type: str = Field(nullable=False, sa_type=String(100))
+    body: bytes = Field(nullable=False, sa_type=LargeBinary)
+
+    created_at: datetime = Field(
+        default_factory=utcnow,
+        nullable=False,
+        sa_type=DateTime(timezone=True),
+    )
+    expires_at: datetime = Field(nullable=False, sa_type=DateTime(timezone=True))
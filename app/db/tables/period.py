@@ -0,0 +1,54 @@
+# pyright: reportUnannotatedClassAttribute=false
+import uuid
+from datetime import datetime
+from typing import Any
+
+from sqlmodel import Field
+from sqlalchemy import DateTime, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB, UUID as PGUUID
+
+from ...schemas.period import PeriodSnapshotBase
+from ._common import utcnow
+
+
+class PeriodSnapshot(PeriodSnapshotBase, table=True):
+    __tablename__ = "period_snapshots"
+    __table_args__ = (
+        UniqueConstraint(
+            "wallet_id",
+            "period_start",
+            "period_end",
+            name="uix_period_snapshot_wallet_range",
+        ),
+    )
+
+    id: uuid.UUID = Field(
+        default_factory=uuid.uuid4,
+        primary_key=True,
+        sa_type=PGUUID(as_uuid=True),
+    )
+
+    wallet_id: uuid.UUID = Field(
+        foreign_key="wallets.id",
+        ondelete="CASCADE",
+        nullable=False,
+        sa_type=PGUUID(as_uuid=True),
+    )
+
+    period_start: datetime = Field(nullable=False, sa_type=DateTime(timezone=True))
+    period_end: datetime = Field(nullable=False, sa_type=DateTime(timezone=True))
+
+    categories_products: dict[str, Any] = Field(nullable=False, sa_type=JSONB)
+    by_importance: dict[str, Any] = Field(nullable=False, sa_type=JSONB)
+
+    closed_by: uuid.UUID = Field(
+        foreign_key="users.id",
+        nullable=False,
+        sa_type=PGUUID(as_uuid=True),
+    )
+
+    closed_at: datetime = Field(
+        default_factory=utcnow,
+        nullable=False,
+        sa_type=DateTime(timezone=True),
+    )
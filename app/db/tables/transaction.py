@@ -5,16 +5,29 @@ from datetime import datetime
 from typing import Optional
 
 from sqlmodel import SQLModel, Field, Relationship
-from sqlalchemy import DateTime, String
+from sqlalchemy import DateTime, Index, String
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 
 from ...schemas.transaction import TransactionMoney
-from ...schemas.recurring_transactions import RecurringMoney
+from ...schemas.recurring_transactions import RecurringMoney, RecurringSchedule
 from ._common import utcnow
 
 
 class Transaction(TransactionMoney, table=True):
     __tablename__ = "transactions"
+    __table_args__ = (
+        Index("ix_transactions_wallet_occurred_at", "wallet_id", "occurred_at"),
+        Index(
+            "ix_transactions_wallet_user_occurred_at",
+            "wallet_id",
+            "user_id",
+            "occurred_at",
+        ),
+        Index(
+            "ix_transactions_refund_of_transaction_id",
+            "refund_of_transaction_id",
+        ),
+    )
 
     id: uuid.UUID = Field(
         default_factory=uuid.uuid4,
@@ -77,7 +90,7 @@ class Transaction(TransactionMoney, table=True):
     refunds: list["Transaction"] = Relationship(back_populates="refund_of")
 
 
-class RecurringTransaction(RecurringMoney, table=True):
+class RecurringTransaction(RecurringMoney, RecurringSchedule, table=True):
     __tablename__ = "recurring_transactions"
 
     id: uuid.UUID = Field(
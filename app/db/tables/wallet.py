@@ -21,6 +21,19 @@ class Wallet(WalletBase, table=True):
 
     currency: str = Field(nullable=False, sa_type=String(3))
 
+    version: int = Field(
+        default=1,
+        nullable=False,
+        sa_column_kwargs={"server_default": "1"},
+    )
+
+    # tylko zmiany definicji recurring (nie apply) -> klucz cache projekcji
+    recurring_version: int = Field(
+        default=1,
+        nullable=False,
+        sa_column_kwargs={"server_default": "1"},
+    )
+
     owner_id: uuid.UUID = Field(
         foreign_key="users.id",
         nullable=False,
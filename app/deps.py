@@ -12,7 +12,13 @@ from .models import User
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/google")
 
 
-def get_db() -> Generator[Session, None, None]:
+def get_db(request: Request) -> Generator[Session, None, None]:
+    # sub-żądania POST /batch dzielą sesję żądania nadrzędnego (zamyka ją ono)
+    shared = getattr(request.state, "batch_db", None)
+    if shared is not None:
+        yield shared
+        return
+
     db = SessionLocal()
     try:
         yield db
@@ -25,6 +31,12 @@ def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
     db: Annotated[Session, Depends(get_db)],
 ) -> User:
+    # w POST /batch użytkownik jest uwierzytelniony raz, dla całej paczki
+    batch_user = getattr(request.state, "batch_user", None)
+    if batch_user is not None:
+        request.state.user_id = str(batch_user.id)
+        return batch_user
+
     try:
         user_id = decode_access_token(token)
     except InvalidTokenError:
@@ -5,3 +5,12 @@ class ProductImportance(str, enum.Enum):
     NECESSARY = "necessary"
     IMPORTANT = "important"
     UNNECESSARY = "unnecessary"
+
+
+class RecurrenceRule(str, enum.Enum):
+    BILLING_PERIOD = "billing_period"
+    DAILY = "daily"
+    WEEKLY = "weekly"
+    MONTHLY = "monthly"
+    QUARTERLY = "quarterly"
+    YEARLY = "yearly"
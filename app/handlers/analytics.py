@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+from zoneinfo import ZoneInfo
+
+import numpy as np
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from sqlmodel import col
+
+from ..helpers.analytics import (
+    build_daily_matrix,
+    compute_category_stats,
+    day_from_number,
+    fetch_daily_category_sums,
+    local_day_number,
+    rolling_mean,
+    to_money,
+)
+from ..helpers.periods import resolve_period_range_utc
+from ..helpers.users import require_user_settings
+from ..helpers.wallets import ensure_wallet_member
+from ..models import Category, User
+from ..schemas.analytics import CategoryAnalyticsRead, WalletAnalyticsRead
+from ..schemas.category import CategoryRead
+
+MAX_ANOMALY_DAYS = 10
+
+
+def wallet_analytics(
+    *,
+    wallet_id: UUID,
+    db: Session,
+    current_user: User,
+    days: int = 365,
+    window: int = 7,
+    z_threshold: float = 3.0,
+) -> WalletAnalyticsRead:
+    membership = ensure_wallet_member(db, wallet_id, current_user)
+    currency = membership.wallet.currency
+
+    if not 7 <= days <= 1830:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="days needs to be between 7 and 1830",
+        )
+    if not 1 <= window <= days:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="window needs to be between 1 and days",
+        )
+    if z_threshold <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="z_threshold must be greater than 0",
+        )
+
+    settings = require_user_settings(current_user)
+    today_local = datetime.now(timezone.utc).astimezone(ZoneInfo(settings.timezone))
+    last_day = today_local.date()
+    first_day = last_day - timedelta(days=days - 1)
+
+    pr = resolve_period_range_utc(
+        billing_day=settings.billing_day,
+        timezone_name=settings.timezone,
+        current_period=False,
+        from_date=first_day,
+        to_date=last_day,
+    )
+
+    sums = fetch_daily_category_sums(
+        db,
+        wallet_id=wallet_id,
+        timezone_name=settings.timezone,
+        start_utc=pr.period_start_utc,
+        end_utc=pr.period_end_utc,
+    )
+
+    first_day_no = local_day_number(first_day)
+    matrix = build_daily_matrix(sums, first_day=first_day_no, n_days=days)
+    stats = compute_category_stats(matrix, window=window, z_threshold=z_threshold)
+
+    daily_total = matrix.sum(axis=1)
+
+    categories_by_id: dict[UUID, Category] = {}
+    if sums.category_ids:
+        categories_by_id = {
+            c.id: c
+            for c in db.query(Category)
+            .filter(
+                col(Category.wallet_id) == wallet_id,
+                col(Category.id).in_(sums.category_ids),
+            )
+            .all()
+        }
+
+    items: list[CategoryAnalyticsRead] = []
+    for idx in np.argsort(-stats.total, kind="stable"):
+        category = categories_by_id.get(sums.category_ids[idx])
+        if category is None:
+            continue
+
+        anomaly_days = np.flatnonzero(stats.anomalies[:, idx])[-MAX_ANOMALY_DAYS:]
+
+        items.append(
+            CategoryAnalyticsRead(
+                category=CategoryRead.model_validate(category),
+                total=to_money(stats.total[idx]),
+                mean_daily=to_money(stats.mean[idx]),
+                median_daily=to_money(stats.median[idx]),
+                std_daily=to_money(stats.std[idx]),
+                rolling_avg=to_money(stats.rolling_mean[idx]),
+                latest_zscore=round(float(stats.latest_zscore[idx]), 3),
+                anomaly_days=[day_from_number(first_day_no + d) for d in anomaly_days],
+            )
+        )
+
+    return WalletAnalyticsRead(
+        currency=currency,
+        period_start=pr.period_start_utc,
+        period_end=pr.period_end_utc,
+        days=days,
+        window=window,
+        z_threshold=z_threshold,
+        total=to_money(float(daily_total.sum())),
+        mean_daily=to_money(float(daily_total.mean())),
+        rolling_avg=to_money(float(rolling_mean(daily_total[:, None], window)[-1, 0])),
+        categories=items,
+    )
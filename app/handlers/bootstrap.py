@@ -0,0 +1,67 @@
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from ..helpers.fieldsets import nest_rows
+from ..helpers.read_models import (
+    PRODUCT_FIELDSET,
+    categories_select,
+    products_select,
+    wallets_select,
+)
+from ..helpers.serialization import validate_list
+from ..models import User
+from ..schemas.bootstrap import BootstrapRead
+from ..schemas.category import CategoryRead
+from ..schemas.product import ProductRead
+from ..schemas.user import UserRead
+from ..schemas.user_settings import UserSettingsRead
+from ..schemas.wallet import WalletRead
+
+
+def bootstrap(
+    *,
+    db: Session,
+    current_user: User,
+    wallet_id: UUID | None = None,
+) -> BootstrapRead:
+    user_settings = current_user.user_settings
+    wallets = validate_list(
+        WalletRead, db.execute(wallets_select(user_id=current_user.id)).all()
+    )
+
+    # bez wallet_id aktywny jest pierwszy portfel użytkownika
+    if wallet_id is None and wallets:
+        wallet_id = wallets[0].id
+    if wallet_id is not None and wallet_id not in {w.id for w in wallets}:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Wallet not found"
+        )
+
+    categories: list[CategoryRead] = []
+    products: list[ProductRead] = []
+    if wallet_id is not None:
+        categories = validate_list(
+            CategoryRead, db.execute(categories_select(wallet_id=wallet_id)).all()
+        )
+        products = validate_list(
+            ProductRead,
+            nest_rows(
+                db.execute(products_select(wallet_id=wallet_id)).all(),
+                PRODUCT_FIELDSET,
+            ),
+        )
+
+    return BootstrapRead(
+        user=UserRead.model_validate(current_user),
+        settings=(
+            UserSettingsRead.model_validate(user_settings)
+            if user_settings is not None
+            else None
+        ),
+        wallets=wallets,
+        active_wallet_id=wallet_id,
+        categories=categories,
+        products=products,
+    )
@@ -0,0 +1,145 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session, selectinload
+from sqlmodel import col
+
+from ..helpers.budgets import (
+    budget_period,
+    current_spend_by_budget,
+    get_budget,
+    get_budget_or_404,
+    upsert_budget_spend,
+)
+from ..helpers.categories import get_category_or_404
+from ..helpers.users import require_user_settings
+from ..helpers.wallets import ensure_wallet_member
+from ..models import Category, CategoryBudget, User
+from ..schemas.budget import CategoryBudgetSet, CategoryBudgetStatusRead
+from ..schemas.category import CategoryRead
+
+
+def _status_read(
+    budget: CategoryBudget,
+    *,
+    currency: str,
+    period_start: datetime,
+    period_end: datetime,
+    spent: Decimal,
+) -> CategoryBudgetStatusRead:
+    return CategoryBudgetStatusRead(
+        category=CategoryRead.model_validate(budget.category),
+        amount=budget.amount,
+        currency=currency,
+        period_start=period_start,
+        period_end=period_end,
+        spent=spent,
+        remaining=budget.amount - spent,
+    )
+
+
+def list_budgets(
+    *,
+    wallet_id: UUID,
+    db: Session,
+    current_user: User,
+) -> list[CategoryBudgetStatusRead]:
+    membership = ensure_wallet_member(db, wallet_id, current_user)
+    currency = membership.wallet.currency
+
+    budgets = (
+        db.query(CategoryBudget)
+        .join(Category, col(Category.id) == col(CategoryBudget.category_id))
+        .options(selectinload(CategoryBudget.category))
+        .filter(
+            col(CategoryBudget.wallet_id) == wallet_id,
+            col(Category.deleted_at).is_(None),
+        )
+        .order_by(col(Category.created_at))
+        .all()
+    )
+
+    spend = current_spend_by_budget(db, budgets, datetime.now(timezone.utc))
+
+    out: list[CategoryBudgetStatusRead] = []
+    for b in budgets:
+        period, spent = spend[b.id]
+        out.append(
+            _status_read(
+                b,
+                currency=currency,
+                period_start=period.period_start_utc,
+                period_end=period.period_end_utc,
+                spent=spent,
+            )
+        )
+    return out
+
+
+def set_budget(
+    *,
+    wallet_id: UUID,
+    category_id: UUID,
+    body: CategoryBudgetSet,
+    db: Session,
+    current_user: User,
+) -> CategoryBudgetStatusRead:
+    membership = ensure_wallet_member(db, wallet_id, current_user)
+
+    if body.amount <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="amount must be greater than 0",
+        )
+
+    _ = get_category_or_404(
+        db=db,
+        wallet_id=wallet_id,
+        category_id=category_id,
+        require_not_deleted=True,
+    )
+
+    budget = get_budget(db, wallet_id=wallet_id, category_id=category_id)
+    if budget is None:
+        settings = require_user_settings(current_user)
+        budget = CategoryBudget(
+            wallet_id=wallet_id,
+            category_id=category_id,
+            amount=body.amount,
+            billing_day=settings.billing_day,
+            timezone=settings.timezone,
+        )
+        db.add(budget)
+    else:
+        budget.amount = body.amount
+        budget.updated_at = datetime.now(timezone.utc)
+
+    period = budget_period(budget, datetime.now(timezone.utc))
+    spent = upsert_budget_spend(db, budget=budget, period=period, delta=Decimal("0"))
+    db.commit()
+    db.refresh(budget)
+
+    return _status_read(
+        budget,
+        currency=membership.wallet.currency,
+        period_start=period.period_start_utc,
+        period_end=period.period_end_utc,
+        spent=spent,
+    )
+
+
+def delete_budget(
+    *,
+    wallet_id: UUID,
+    category_id: UUID,
+    db: Session,
+    current_user: User,
+) -> None:
+    _ = ensure_wallet_member(db, wallet_id, current_user)
+
+    budget = get_budget_or_404(db, wallet_id=wallet_id, category_id=category_id)
+
+    db.delete(budget)
+    db.commit()
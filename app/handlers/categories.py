@@ -1,22 +1,38 @@
 from uuid import UUID
 from datetime import date
 from decimal import Decimal
+from typing import Any
 
 from fastapi import HTTPException, status
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 from sqlmodel import col
 
+from ..domain.enums import ProductImportance
 from ..models import RecurringTransaction, User, Category, Transaction
-from ..schemas.category import CategoryCreate, CategoryRead, CategoryReadSum
-from ..helpers.wallets import ensure_wallet_member
+from ..schemas.category import (
+    CategoryCreate,
+    CategoryRead,
+    CategoryReadSum,
+    CategoryTopRead,
+)
+from ..helpers.wallets import bump_wallet_version, ensure_wallet_member
 from ..helpers.periods import resolve_period_range_utc
 from ..helpers.categories import (
     ensure_category_name_unique,
     get_category_or_404,
     soft_delete_now,
 )
+from ..helpers.fieldsets import narrow_columns, nest_rows, parse_fields
+from ..helpers.read_models import CATEGORY_PATH_COLUMNS, CATEGORY_SUM_FIELDSET
+from ..helpers.serialization import validate_list
 from ..helpers.users import require_user_settings
+from ..helpers.summary import (
+    ranked_period_sums_sq,
+    resolve_user_comparison_ranges,
+    resolve_user_period_range,
+    share_of_total,
+)
 
 
 def create_category(
@@ -62,6 +78,8 @@ def soft_delete_category(
         db, wallet_id=wallet_id, category_id=category_id, require_not_deleted=True
     )
     soft_delete_now(category)
+    # prognoza w cache trzyma CategoryRead -> unieważnienie po wersji portfela
+    bump_wallet_version(db, wallet_id)
 
     db.commit()
 
@@ -95,6 +113,7 @@ def hard_delete_category(
         )
 
     db.delete(category)
+    bump_wallet_version(db, wallet_id)
     db.commit()
 
 
@@ -107,8 +126,10 @@ def list_categories_with_sum(
     from_date: date | None = None,
     to_date: date | None = None,
     include_empty: bool = True,
-) -> list[CategoryReadSum]:
+    fields: str | None = None,
+) -> list[CategoryReadSum] | list[dict[str, Any]]:
     _ = ensure_wallet_member(db, wallet_id, current_user)
+    fieldset = parse_fields(fields, CATEGORY_SUM_FIELDSET)
 
     settings = require_user_settings(current_user)
     pr = resolve_period_range_utc(
@@ -138,8 +159,13 @@ def list_categories_with_sum(
         "period_sum"
     )
 
+    columns = narrow_columns(
+        fieldset or CATEGORY_SUM_FIELDSET,
+        CATEGORY_PATH_COLUMNS | {"period_sum": period_sum_col},
+    )
     q = (
-        db.query(Category, period_sum_col)
+        db.query(*columns)
+        .select_from(Category)
         .outerjoin(tx_sum_sq, tx_sum_sq.c.category_id == Category.id)
         .filter(
             col(Category.wallet_id) == wallet_id, col(Category.deleted_at).is_(None)
@@ -151,8 +177,81 @@ def list_categories_with_sum(
         q = q.filter(period_sum_col != 0)
 
     rows = q.all()
-    out: list[CategoryReadSum] = []
-    for cat, period_sum in rows:
+    if fieldset is not None:
+        return nest_rows(rows, fieldset)
+    return validate_list(CategoryReadSum, rows)
+
+
+def top_categories(
+    *,
+    wallet_id: UUID,
+    db: Session,
+    current_user: User,
+    limit: int = 5,
+    importance: ProductImportance | None = None,
+    current_period: bool = True,
+    from_date: date | None = None,
+    to_date: date | None = None,
+    include_share: bool = False,
+    include_rank_change: bool = False,
+) -> list[CategoryTopRead]:
+    _ = ensure_wallet_member(db, wallet_id, current_user)
+
+    if not 1 <= limit <= 100:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="limit needs to be between 1 and 100",
+        )
+
+    if include_rank_change:
+        current, previous = resolve_user_comparison_ranges(
+            user=current_user,
+            current_period=current_period,
+            from_date=from_date,
+            to_date=to_date,
+        )
+    else:
+        current = resolve_user_period_range(
+            user=current_user,
+            current_period=current_period,
+            from_date=from_date,
+            to_date=to_date,
+        )
+        previous = None
+
+    ranked = ranked_period_sums_sq(
+        key=col(Transaction.category_id),
+        wallet_id=wallet_id,
+        current=current,
+        previous=previous,
+        importance=importance,
+    )
+
+    columns = [ranked.c.current_sum, ranked.c.rank, ranked.c.total]
+    if include_rank_change:
+        columns.append(ranked.c.previous_rank)
+
+    rows = (
+        db.query(Category, *columns)
+        .join(ranked, ranked.c.key_id == Category.id)
+        .filter(ranked.c.current_sum > 0)
+        .order_by(ranked.c.current_sum.desc(), col(Category.name).asc())
+        .limit(limit)
+        .all()
+    )
+
+    out: list[CategoryTopRead] = []
+    for cat, period_sum, rank, total, *rest in rows:
         base = CategoryRead.model_validate(cat).model_dump()
-        out.append(CategoryReadSum(**(base | {"period_sum": period_sum})))
+        extra = {"period_sum": period_sum, "rank": rank}
+        if include_share:
+            extra["share"] = share_of_total(period_sum, total)
+        if include_rank_change:
+            previous_rank = rest[0]
+            extra["previous_rank"] = previous_rank
+            extra["rank_change"] = (
+                previous_rank - rank if previous_rank is not None else None
+            )
+        out.append(CategoryTopRead(**(base | extra)))
+
     return out
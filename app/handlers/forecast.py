@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import UUID
+from zoneinfo import ZoneInfo
+
+import numpy as np
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from sqlmodel import col
+
+from ..helpers.analytics import (
+    build_daily_matrix,
+    day_from_number,
+    fetch_daily_category_sums,
+    local_day_number,
+    to_money,
+)
+from ..helpers.cache import VersionedCache
+from ..helpers.periods import last_n_period_ranges_utc
+from ..helpers.recurring import due_occurrences
+from ..helpers.users import require_user_settings
+from ..helpers.wallets import ensure_wallet_member
+from ..models import Category, RecurringTransaction, User
+from ..schemas.category import CategoryRead
+from ..schemas.forecast import CategoryForecastRead, WalletForecastRead
+
+_forecast_cache: VersionedCache[WalletForecastRead] = VersionedCache(maxsize=2048)
+
+
+def wallet_forecast(
+    *,
+    wallet_id: UUID,
+    db: Session,
+    current_user: User,
+    history_periods: int = 3,
+) -> WalletForecastRead:
+    membership = ensure_wallet_member(db, wallet_id, current_user)
+    wallet = membership.wallet
+
+    if not 1 <= history_periods <= 12:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="history_periods needs to be between 1 and 12",
+        )
+
+    settings = require_user_settings(current_user)
+    local_tz = ZoneInfo(settings.timezone)
+    now_utc = datetime.now(timezone.utc)
+    today = now_utc.astimezone(local_tz).date()
+
+    cache_key = (
+        wallet_id,
+        wallet.version,
+        settings.billing_day,
+        settings.timezone,
+        today,
+        history_periods,
+    )
+    cached = _forecast_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    ranges = last_n_period_ranges_utc(
+        billing_day=settings.billing_day,
+        timezone_name=settings.timezone,
+        periods=history_periods + 1,
+        now_utc=now_utc,
+    )
+    current = ranges[0]
+    history_start_utc = ranges[-1].period_start_utc
+
+    first_day = local_day_number(history_start_utc.astimezone(local_tz).date())
+    period_first_day = local_day_number(
+        current.period_start_utc.astimezone(local_tz).date()
+    )
+    period_end_day = local_day_number(
+        current.period_end_utc.astimezone(local_tz).date()
+    )
+    today_day = local_day_number(today)
+
+    days_in_period = period_end_day - period_first_day
+    days_elapsed = min(today_day - period_first_day + 1, days_in_period)
+    days_remaining = days_in_period - days_elapsed
+    history_days = period_first_day - first_day
+
+    sums = fetch_daily_category_sums(
+        db,
+        wallet_id=wallet_id,
+        timezone_name=settings.timezone,
+        start_utc=history_start_utc,
+        end_utc=current.period_end_utc,
+    )
+    matrix = build_daily_matrix(
+        sums, first_day=first_day, n_days=period_end_day - first_day
+    )
+
+    recurring_items = (
+        db.query(RecurringTransaction)
+        .filter(
+            col(RecurringTransaction.wallet_id) == wallet_id,
+            col(RecurringTransaction.active).is_(True),
+        )
+        .all()
+    )
+    pending_by_category: defaultdict[UUID, Decimal] = defaultdict(Decimal)
+    for item, _ in due_occurrences(
+        recurring_items,
+        billing_day=settings.billing_day,
+        timezone_name=settings.timezone,
+        window_start=current.period_start_utc.astimezone(local_tz).date(),
+        today=day_from_number(period_end_day - 1),
+    ):
+        pending_by_category[item.category_id] += item.amount_base
+    pending_rows = list(pending_by_category.items())
+
+    category_ids = list(sums.category_ids)
+    known = set(category_ids)
+    category_ids.extend(cat_id for cat_id, _ in pending_rows if cat_id not in known)
+    position = {cat_id: i for i, cat_id in enumerate(category_ids)}
+
+    n_tracked = len(sums.category_ids)
+    spent = np.zeros(len(category_ids))
+    historical = np.zeros(len(category_ids))
+    pending = np.zeros(len(category_ids))
+
+    spent[:n_tracked] = matrix[history_days:].sum(axis=0)
+    if history_days > 0:
+        historical[:n_tracked] = matrix[:history_days].mean(axis=0)
+    for cat_id, amount in pending_rows:
+        pending[position[cat_id]] = float(amount)
+
+    run_rate = spent / max(days_elapsed, 1)
+    weight = days_elapsed / days_in_period if historical.any() else 1.0
+    blended_rate = weight * run_rate + (1.0 - weight) * historical
+    projected = spent + blended_rate * days_remaining + pending
+
+    categories_by_id: dict[UUID, Category] = {}
+    if category_ids:
+        categories_by_id = {
+            c.id: c
+            for c in db.query(Category)
+            .filter(
+                col(Category.wallet_id) == wallet_id,
+                col(Category.id).in_(category_ids),
+            )
+            .all()
+        }
+
+    items: list[CategoryForecastRead] = []
+    for idx in np.argsort(-projected, kind="stable"):
+        category = categories_by_id.get(category_ids[idx])
+        if category is None:
+            continue
+        items.append(
+            CategoryForecastRead(
+                category=CategoryRead.model_validate(category),
+                spent=to_money(spent[idx]),
+                run_rate_daily=to_money(run_rate[idx]),
+                historical_daily=to_money(historical[idx]),
+                recurring_pending=to_money(pending[idx]),
+                projected_total=to_money(projected[idx]),
+            )
+        )
+
+    result = WalletForecastRead(
+        currency=wallet.currency,
+        period_start=current.period_start_utc,
+        period_end=current.period_end_utc,
+        days_in_period=days_in_period,
+        days_elapsed=days_elapsed,
+        days_remaining=days_remaining,
+        spent=to_money(float(spent.sum())),
+        recurring_pending=to_money(float(pending.sum())),
+        projected_total=to_money(float(projected.sum())),
+        categories=items,
+    )
+    _forecast_cache.set(cache_key, result)
+    return result
@@ -6,6 +6,7 @@ from sqlmodel import col
 
 from ..helpers.wallets import ensure_wallet_member
 from ..helpers.periods import last_n_period_ranges_utc
+from ..helpers.snapshots import snapshots_for_ranges
 from ..models import Transaction, User
 from ..schemas.aggregation import LastPeriodsHistoryRead, PeriodTotalRead
 
@@ -36,9 +37,22 @@ def history_last_periods(
         periods=periods,
     )
 
+    snapshots = snapshots_for_ranges(db, wallet_id=wallet_id, periods=ranges)
+
     result_periods: list[PeriodTotalRead] = []
 
     for pr in ranges:
+        snapshot = snapshots.get((pr.period_start_utc, pr.period_end_utc))
+        if snapshot is not None:
+            result_periods.append(
+                PeriodTotalRead(
+                    period_start=pr.period_start_utc,
+                    period_end=pr.period_end_utc,
+                    total=snapshot.total,
+                )
+            )
+            continue
+
         total = (
             db.query(func.coalesce(func.sum(Transaction.amount_base), 0))
             .filter(
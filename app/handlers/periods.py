@@ -0,0 +1,106 @@
+from decimal import Decimal
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from sqlmodel import col
+
+from ..helpers.periods import last_n_period_ranges_utc
+from ..helpers.snapshots import fill_snapshot, get_snapshot, lock_wallet
+from ..helpers.users import require_user_settings
+from ..helpers.wallets import ensure_wallet_member, ensure_wallet_owner
+from ..models import PeriodSnapshot, User
+from ..schemas.period import PeriodSnapshotRead
+
+
+def list_closed_periods(
+    *,
+    wallet_id: UUID,
+    db: Session,
+    current_user: User,
+) -> list[PeriodSnapshotRead]:
+    _ = ensure_wallet_member(db, wallet_id, current_user)
+
+    snapshots = (
+        db.query(PeriodSnapshot)
+        .filter(col(PeriodSnapshot.wallet_id) == wallet_id)
+        .order_by(col(PeriodSnapshot.period_start).desc())
+        .all()
+    )
+    return [PeriodSnapshotRead.model_validate(s) for s in snapshots]
+
+
+def close_period(
+    *,
+    wallet_id: UUID,
+    db: Session,
+    current_user: User,
+    periods_ago: int = 1,
+) -> PeriodSnapshotRead:
+    membership = ensure_wallet_owner(db, wallet_id, current_user)
+    currency = membership.wallet.currency
+
+    if not 1 <= periods_ago <= 24:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="periods_ago needs to be between 1 and 24",
+        )
+
+    settings = require_user_settings(current_user)
+    period = last_n_period_ranges_utc(
+        billing_day=settings.billing_day,
+        timezone_name=settings.timezone,
+        periods=periods_ago + 1,
+    )[-1]
+
+    lock_wallet(db, wallet_id)
+
+    if get_snapshot(db, wallet_id=wallet_id, period=period) is not None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Period is already closed",
+        )
+
+    snapshot = PeriodSnapshot(
+        wallet_id=wallet_id,
+        period_start=period.period_start_utc,
+        period_end=period.period_end_utc,
+        total=Decimal("0"),
+        categories_products={},
+        by_importance={},
+        closed_by=current_user.id,
+    )
+    fill_snapshot(db, snapshot, currency=currency)
+    db.add(snapshot)
+    db.commit()
+    db.refresh(snapshot)
+
+    return PeriodSnapshotRead.model_validate(snapshot)
+
+
+def reopen_period(
+    *,
+    wallet_id: UUID,
+    snapshot_id: UUID,
+    db: Session,
+    current_user: User,
+) -> None:
+    _ = ensure_wallet_owner(db, wallet_id, current_user)
+
+    lock_wallet(db, wallet_id)
+
+    snapshot = (
+        db.query(PeriodSnapshot)
+        .filter(
+            col(PeriodSnapshot.wallet_id) == wallet_id,
+            col(PeriodSnapshot.id) == snapshot_id,
+        )
+        .first()
+    )
+    if snapshot is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Closed period not found"
+        )
+
+    db.delete(snapshot)
+    db.commit()
@@ -1,15 +1,19 @@
 from uuid import UUID
 from datetime import date
 from decimal import Decimal
+from itertools import batched
+from typing import Any
 
-from fastapi import HTTPException
+from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy import func
 from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlmodel import col
 
-from ..models import RecurringTransaction, User, Product, Transaction
-from ..schemas.product import ProductCreate, ProductRead, ProductReadSum
-from ..helpers.wallets import ensure_wallet_member
+from ..models import Category, RecurringTransaction, User, Product, Transaction
+from ..domain.enums import ProductImportance
+from ..schemas.product import ProductCreate, ProductRead, ProductReadSum, ProductTopRead
+from ..helpers.wallets import bump_recurring_version, ensure_wallet_member
 from ..helpers.periods import resolve_period_range_utc
 from ..helpers.categories import get_category_or_404
 from ..helpers.products import (
@@ -17,7 +21,16 @@ from ..helpers.products import (
     soft_delete_now,
 )
 from ..helpers.product_refs import unlink_product_references
+from ..helpers.fieldsets import narrow_columns, needs_join, nest_rows, parse_fields
+from ..helpers.read_models import PRODUCT_PATH_COLUMNS, PRODUCT_SUM_FIELDSET
+from ..helpers.serialization import NDJSON_CHUNK_SIZE, ndjson_response, validate_list
 from ..helpers.users import require_user_settings
+from ..helpers.summary import (
+    ranked_period_sums_sq,
+    resolve_user_comparison_ranges,
+    resolve_user_period_range,
+    share_of_total,
+)
 
 
 def create_product(
@@ -64,6 +77,35 @@ def list_products(
 ):
     _ = ensure_wallet_member(db, wallet_id, current_user)
 
+    query = _list_products_query(
+        db, wallet_id=wallet_id, category_id=category_id, deleted=deleted
+    )
+    return validate_list(ProductRead, query.all())
+
+
+def stream_products(
+    *,
+    wallet_id: UUID,
+    db: Session,
+    current_user: User,
+    category_id: UUID | None = None,
+    deleted: bool = False,
+) -> StreamingResponse:
+    _ = ensure_wallet_member(db, wallet_id, current_user)
+
+    query = _list_products_query(
+        db, wallet_id=wallet_id, category_id=category_id, deleted=deleted
+    )
+    chunks = (
+        validate_list(ProductRead, products)
+        for products in batched(query.yield_per(NDJSON_CHUNK_SIZE), NDJSON_CHUNK_SIZE)
+    )
+    return ndjson_response(ProductRead, chunks)
+
+
+def _list_products_query(
+    db: Session, *, wallet_id: UUID, category_id: UUID | None, deleted: bool
+):
     query = (
         db.query(Product)
         .filter(
@@ -86,9 +128,7 @@ def list_products(
         )
 
         query = query.filter(col(Product.category_id) == category_id)
-    products = query.order_by(col(Product.created_at)).all()
-
-    return [ProductRead.model_validate(p) for p in products]
+    return query.order_by(col(Product.created_at))
 
 
 def soft_delete_product(
@@ -102,6 +142,8 @@ def soft_delete_product(
 
     unlink_product_references(db, wallet_id=wallet_id, product_id=product_id)
     soft_delete_now(product)
+    # unlink czyści też product_id pozycji cyklicznych -> projekcja do odświeżenia
+    bump_recurring_version(db, wallet_id)
 
     db.commit()
 
@@ -153,8 +195,10 @@ def list_products_with_sum(
     current_period: bool = True,
     from_date: date | None = None,
     to_date: date | None = None,
-) -> list[ProductReadSum]:
+    fields: str | None = None,
+) -> list[ProductReadSum] | list[dict[str, Any]]:
     _ = ensure_wallet_member(db, wallet_id, current_user)
+    fieldset = parse_fields(fields, PRODUCT_SUM_FIELDSET)
 
     if category_id is not None:
         _ = get_category_or_404(
@@ -189,28 +233,108 @@ def list_products_with_sum(
         .subquery()
     )
 
+    period_sum_col = func.coalesce(tx_sum_sq.c.period_sum, Decimal("0")).label(
+        "period_sum"
+    )
+    columns = narrow_columns(
+        fieldset or PRODUCT_SUM_FIELDSET,
+        PRODUCT_PATH_COLUMNS | {"period_sum": period_sum_col},
+    )
     products_q = (
-        db.query(
-            Product,
-            func.coalesce(tx_sum_sq.c.period_sum, Decimal("0")).label("period_sum"),
-        )
+        db.query(*columns)
+        .select_from(Product)
         .outerjoin(tx_sum_sq, tx_sum_sq.c.product_id == Product.id)
-        .options(joinedload(Product.category))
         .filter(
             col(Product.wallet_id) == wallet_id,
             col(Product.deleted_at).is_(None),
         )
     )
+    if needs_join(fieldset, "category"):
+        products_q = products_q.join(
+            Category, col(Category.id) == col(Product.category_id)
+        )
 
     if category_id is not None:
         products_q = products_q.filter(col(Product.category_id) == category_id)
 
     rows = products_q.order_by(col(Product.name).asc()).all()
 
-    out: list[ProductReadSum] = []
-    for prod, period_sum in rows:
+    if fieldset is not None:
+        return nest_rows(rows, fieldset)
+    return validate_list(ProductReadSum, nest_rows(rows, PRODUCT_SUM_FIELDSET))
+
+
+def top_products(
+    *,
+    wallet_id: UUID,
+    db: Session,
+    current_user: User,
+    limit: int = 5,
+    importance: ProductImportance | None = None,
+    current_period: bool = True,
+    from_date: date | None = None,
+    to_date: date | None = None,
+    include_share: bool = False,
+    include_rank_change: bool = False,
+) -> list[ProductTopRead]:
+    _ = ensure_wallet_member(db, wallet_id, current_user)
+
+    if not 1 <= limit <= 100:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="limit needs to be between 1 and 100",
+        )
+
+    if include_rank_change:
+        current, previous = resolve_user_comparison_ranges(
+            user=current_user,
+            current_period=current_period,
+            from_date=from_date,
+            to_date=to_date,
+        )
+    else:
+        current = resolve_user_period_range(
+            user=current_user,
+            current_period=current_period,
+            from_date=from_date,
+            to_date=to_date,
+        )
+        previous = None
+
+    ranked = ranked_period_sums_sq(
+        key=col(Transaction.product_id),
+        wallet_id=wallet_id,
+        current=current,
+        previous=previous,
+        importance=importance,
+    )
+
+    columns = [ranked.c.current_sum, ranked.c.rank, ranked.c.total]
+    if include_rank_change:
+        columns.append(ranked.c.previous_rank)
+
+    rows = (
+        db.query(Product, *columns)
+        .join(ranked, ranked.c.key_id == Product.id)
+        .options(joinedload(Product.category))
+        .filter(ranked.c.current_sum > 0)
+        .order_by(ranked.c.current_sum.desc(), col(Product.name).asc())
+        .limit(limit)
+        .all()
+    )
+
+    out: list[ProductTopRead] = []
+    for prod, period_sum, rank, total, *rest in rows:
         base = ProductRead.model_validate(prod).model_dump()
-        base["period_sum"] = period_sum
-        out.append(ProductReadSum(**base))
+        extra = {"period_sum": period_sum, "rank": rank}
+        if include_share:
+            extra["share"] = share_of_total(period_sum, total)
+        if include_rank_change:
+            previous_rank = rest[0]
+            extra["previous_rank"] = previous_rank
+            extra["rank_change"] = (
+                previous_rank - rank if previous_rank is not None else None
+            )
+        out.append(ProductTopRead(**(base | extra)))
 
     return out
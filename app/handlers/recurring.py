@@ -1,27 +1,50 @@
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from itertools import batched
+from typing import Any
 from uuid import UUID
+from zoneinfo import ZoneInfo
 
+import numpy as np
 from fastapi import HTTPException, status
-from sqlalchemy import or_
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session, selectinload
 from sqlmodel import col
 
-from ..helpers.wallets import ensure_wallet_member
-from ..helpers.periods import resolve_period_range_utc
+from ..helpers.cache import VersionedCache
+from ..helpers.periods import next_n_period_ranges_utc
+from ..helpers.read_models import transaction_columns, transaction_read_dicts
+from ..helpers.serialization import (
+    NDJSON_CHUNK_SIZE,
+    ensure_response_shape,
+    ndjson_response,
+    validate_list,
+)
+from ..helpers.users import require_user_settings
+from ..helpers.wallets import bump_recurring_version, ensure_wallet_member
 from ..helpers.categories import get_category_or_404
 from ..helpers.products import get_product_or_404
 from ..helpers.recurring import (
+    apply_due_recurring,
     ensure_currency_matches_wallet,
+    expand_recurring,
     get_recurring_or_404,
     utcnow,
 )
-from ..models import RecurringTransaction, Transaction, User
+from ..models import RecurringTransaction, User
 from ..schemas.recurring_transactions import (
+    RecurringOccurrenceRead,
+    RecurringProjectionPeriodRead,
+    RecurringProjectionRead,
     RecurringTransactionCreate,
     RecurringTransactionRead,
 )
 from ..schemas.transaction import TransactionRead
 
+_projection_cache: VersionedCache[RecurringProjectionRead] = VersionedCache(
+    maxsize=2048
+)
+
 
 def create_recurring_transaction(
     *,
@@ -65,11 +88,15 @@ def create_recurring_transaction(
         amount_base=body.amount_base,
         currency_base=currency_base,
         description=body.description,
+        rule=body.rule,
+        rule_interval=body.rule_interval,
+        anchor_date=body.anchor_date,
         active=True,
         updated_at=utcnow(),
     )
 
     db.add(recurring)
+    bump_recurring_version(db, wallet_id)
     db.commit()
 
     recurring = (
@@ -97,6 +124,28 @@ def list_recurring_transactions(
 ) -> list[RecurringTransactionRead]:
     _ = ensure_wallet_member(db, wallet_id, current_user)
 
+    query = _list_recurring_query(db, wallet_id=wallet_id, active=active)
+    return validate_list(RecurringTransactionRead, query.all())
+
+
+def stream_recurring_transactions(
+    *,
+    wallet_id: UUID,
+    db: Session,
+    current_user: User,
+    active: bool | None = None,
+) -> StreamingResponse:
+    _ = ensure_wallet_member(db, wallet_id, current_user)
+
+    query = _list_recurring_query(db, wallet_id=wallet_id, active=active)
+    chunks = (
+        validate_list(RecurringTransactionRead, items)
+        for items in batched(query.yield_per(NDJSON_CHUNK_SIZE), NDJSON_CHUNK_SIZE)
+    )
+    return ndjson_response(RecurringTransactionRead, chunks)
+
+
+def _list_recurring_query(db: Session, *, wallet_id: UUID, active: bool | None):
     query = (
         db.query(RecurringTransaction)
         .options(
@@ -108,9 +157,7 @@ def list_recurring_transactions(
 
     if active is not None:
         query = query.filter(col(RecurringTransaction.active) == active)
-
-    recurrings = query.order_by(col(RecurringTransaction.created_at)).all()
-    return [RecurringTransactionRead.model_validate(r) for r in recurrings]
+    return query.order_by(col(RecurringTransaction.created_at))
 
 
 def apply_recurring_transactions(
@@ -118,79 +165,133 @@ def apply_recurring_transactions(
     wallet_id: UUID,
     db: Session,
     current_user: User,
-) -> list[TransactionRead]:
+    catch_up: bool = False,
+    shape: str = "rows",
+) -> list[TransactionRead] | dict[str, Any]:
     _ = ensure_wallet_member(db, wallet_id, current_user)
+    ensure_response_shape(shape)
 
     settings = current_user.user_settings
     if settings is None:
         raise HTTPException(status_code=500, detail="User settings missing")
 
-    pr = resolve_period_range_utc(
+    rows = apply_due_recurring(
+        db,
+        wallet_id=wallet_id,
+        user_id=current_user.id,
         billing_day=settings.billing_day,
         timezone_name=settings.timezone,
-        current_period=True,
+        now_utc=datetime.now(timezone.utc),
+        catch_up=catch_up,
     )
-    period_start_utc = pr.period_start_utc
+    if rows:
+        db.commit()
+    else:
+        db.rollback()
+
+    if shape == "columnar":
+        return transaction_columns(rows)
+    return validate_list(TransactionRead, transaction_read_dicts(rows))
+
+
+def recurring_projection(
+    *,
+    wallet_id: UUID,
+    db: Session,
+    current_user: User,
+    months: int = 12,
+) -> RecurringProjectionRead:
+    membership = ensure_wallet_member(db, wallet_id, current_user)
+    wallet = membership.wallet
+
+    if not 1 <= months <= 36:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="months needs to be between 1 and 36",
+        )
 
+    settings = require_user_settings(current_user)
+    local_tz = ZoneInfo(settings.timezone)
     now_utc = datetime.now(timezone.utc)
+    today = now_utc.astimezone(local_tz).date()
+
+    cache_key = (
+        wallet_id,
+        wallet.recurring_version,
+        settings.billing_day,
+        settings.timezone,
+        today,
+        months,
+    )
+    cached = _projection_cache.get(cache_key)
+    if cached is not None:
+        return cached
 
-    recurrings = (
+    periods = next_n_period_ranges_utc(
+        billing_day=settings.billing_day,
+        timezone_name=settings.timezone,
+        periods=months,
+        now_utc=now_utc,
+    )
+    period_ends = np.array(
+        [p.period_end_utc.astimezone(local_tz).date() for p in periods],
+        dtype="datetime64[D]",
+    )
+
+    items = (
         db.query(RecurringTransaction)
         .filter(
             col(RecurringTransaction.wallet_id) == wallet_id,
             col(RecurringTransaction.active).is_(True),
-            or_(
-                col(RecurringTransaction.last_applied_at).is_(None),
-                col(RecurringTransaction.last_applied_at) < period_start_utc,
-            ),
         )
         .all()
     )
-
-    if not recurrings:
-        return []
-
-    created_ids: list[UUID] = []
-
-    for r in recurrings:
-        tx = Transaction(
-            wallet_id=wallet_id,
-            user_id=current_user.id,
-            category_id=r.category_id,
-            product_id=r.product_id,
-            type="expense",
-            amount_base=r.amount_base,
-            currency_base=r.currency_base,
-            amount_original=None,
-            currency_original=None,
-            fx_rate=None,
-            occurred_at=now_utc,
-            refund_of_transaction_id=None,
+    occurrences = expand_recurring(
+        items,
+        billing_day=settings.billing_day,
+        timezone_name=settings.timezone,
+        window_start=today,
+        window_end=(period_ends[-1] - 1).astype(date),
+        skip_applied=False,
+    )
+    # koniec okresu jest wyłączny -> side="right" daje indeks okresu wystąpienia
+    period_idx = np.searchsorted(period_ends, occurrences.day, side="right")
+
+    by_period: list[list[RecurringOccurrenceRead]] = [[] for _ in periods]
+    for p_idx, i, day in zip(
+        period_idx.tolist(),
+        occurrences.schedule_idx.tolist(),
+        occurrences.day.astype(date).tolist(),
+    ):
+        r = items[i]
+        by_period[p_idx].append(
+            RecurringOccurrenceRead(
+                recurring_id=r.id,
+                category_id=r.category_id,
+                product_id=r.product_id,
+                description=r.description,
+                occurs_on=day,
+                amount_base=r.amount_base,
+            )
         )
-        db.add(tx)
-        created_ids.append(tx.id)
-
-        r.last_applied_at = now_utc
-        r.updated_at = now_utc
-
-    db.commit()
 
-    created_txs = (
-        db.query(Transaction)
-        .options(
-            selectinload(Transaction.category),
-            selectinload(Transaction.product),
-        )
-        .filter(
-            col(Transaction.wallet_id) == wallet_id,
-            col(Transaction.id).in_(created_ids),
+    projection_periods = [
+        RecurringProjectionPeriodRead(
+            period_start=p.period_start_utc,
+            period_end=p.period_end_utc,
+            total=sum((o.amount_base for o in occ), Decimal("0")),
+            occurrences=occ,
         )
-        .all()
+        for p, occ in zip(periods, by_period)
+    ]
+    result = RecurringProjectionRead(
+        currency=wallet.currency,
+        months=months,
+        total=sum((p.total for p in projection_periods), Decimal("0")),
+        periods=projection_periods,
     )
-
-    by_id = {t.id: t for t in created_txs}
-    ordered = [by_id[tid] for tid in created_ids if tid in by_id]
-    return [TransactionRead.model_validate(t) for t in ordered]
+    _projection_cache.set(cache_key, result)
+    return result
 
 
 def update_recurring_transaction(
@@ -236,8 +337,12 @@ def update_recurring_transaction(
     recurring.amount_base = body.amount_base
     recurring.currency_base = currency_base
     recurring.description = body.description
+    recurring.rule = body.rule
+    recurring.rule_interval = body.rule_interval
+    recurring.anchor_date = body.anchor_date
     recurring.updated_at = utcnow()
 
+    bump_recurring_version(db, wallet_id)
     db.commit()
 
     recurring = (
@@ -274,6 +379,7 @@ def deactivate_recurring_transaction(
 
     recurring.active = False
     recurring.updated_at = utcnow()
+    bump_recurring_version(db, wallet_id)
     db.commit()
 
 
@@ -295,4 +401,5 @@ def activate_recurring_transaction(
 
     recurring.active = True
     recurring.updated_at = utcnow()
+    bump_recurring_version(db, wallet_id)
     db.commit()
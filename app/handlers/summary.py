@@ -1,27 +1,49 @@
 from __future__ import annotations
 
-from collections import defaultdict
 from datetime import date
 from decimal import Decimal
 from typing import cast
 from uuid import UUID
 
-from sqlalchemy import func, or_
+from sqlalchemy import and_, func
 from sqlalchemy.orm import Session
 from sqlmodel import col
 
+from ..helpers.fx import fx_rate, normalize_currency, q2
 from ..helpers.summary import (
-    build_category_product_sums,
+    build_categories_products_summary,
+    build_importance_summary,
     expense_transactions_in_period_q,
+    pct_change,
+    period_sum_columns,
+    resolve_user_comparison_ranges,
     resolve_user_period_range,
 )
+from ..helpers.snapshots import get_snapshot
+from ..helpers.users import require_user_settings
 from ..helpers.wallets import ensure_wallet_member
-from ..models import Category, Product, ProductImportance, Transaction, User
+from ..models import (
+    Category,
+    Product,
+    ProductImportance,
+    Transaction,
+    User,
+    Wallet,
+    WalletUser,
+)
 from ..schemas.aggregation import (
+    AllWalletsSummaryRead,
+    CategoriesComparisonSummaryRead,
     CategoriesProductsSummaryRead,
     CategoriesWithProductsSummaryRead,
+    CategoryComparisonRead,
+    ImportanceComparisonSummaryRead,
     ImportanceSummaryRead,
+    MemberSummaryRead,
+    MembersSummaryRead,
     ProductWithSumRead,
+    SumComparisonRead,
+    WalletImportanceSummaryRead,
 )
 from ..schemas.category import CategoryRead
 from ..schemas.transaction import ProductInTransactionRead
@@ -29,6 +51,15 @@ from ..schemas.transaction import ProductInTransactionRead
 ZERO = Decimal("0")
 
 
+def _comparison(current: Decimal, previous: Decimal) -> SumComparisonRead:
+    return SumComparisonRead(
+        current=current,
+        previous=previous,
+        delta=current - previous,
+        pct_change=pct_change(current, previous),
+    )
+
+
 def summary_categories_products(
     *,
     wallet_id: UUID,
@@ -48,148 +79,239 @@ def summary_categories_products(
         from_date=from_date,
         to_date=to_date,
     )
-    period_start_utc = period.period_start_utc
-    period_end_utc = period.period_end_utc
+    if not include_empty:
+        snapshot = get_snapshot(db, wallet_id=wallet_id, period=period)
+        if snapshot is not None:
+            return CategoriesProductsSummaryRead.model_validate(
+                snapshot.categories_products
+            )
+
+    return build_categories_products_summary(
+        db,
+        wallet_id=wallet_id,
+        currency=currency,
+        period_start_utc=period.period_start_utc,
+        period_end_utc=period.period_end_utc,
+        include_empty=include_empty,
+    )
+
+
+def summary_by_importance(
+    *,
+    wallet_id: UUID,
+    db: Session,
+    current_user: User,
+    current_period: bool = True,
+    from_date: date | None = None,
+    to_date: date | None = None,
+) -> ImportanceSummaryRead:
+    membership = ensure_wallet_member(db, wallet_id, current_user)
+    currency = membership.wallet.currency
+
+    period = resolve_user_period_range(
+        user=current_user,
+        current_period=current_period,
+        from_date=from_date,
+        to_date=to_date,
+    )
+    snapshot = get_snapshot(db, wallet_id=wallet_id, period=period)
+    if snapshot is not None:
+        return ImportanceSummaryRead.model_validate(snapshot.by_importance)
+
+    return build_importance_summary(
+        db,
+        wallet_id=wallet_id,
+        currency=currency,
+        period_start_utc=period.period_start_utc,
+        period_end_utc=period.period_end_utc,
+    )
+
+
+def summary_by_member(
+    *,
+    wallet_id: UUID,
+    db: Session,
+    current_user: User,
+    current_period: bool = True,
+    from_date: date | None = None,
+    to_date: date | None = None,
+) -> MembersSummaryRead:
+    membership = ensure_wallet_member(db, wallet_id, current_user)
+    currency = membership.wallet.currency
+
+    period = resolve_user_period_range(
+        user=current_user,
+        current_period=current_period,
+        from_date=from_date,
+        to_date=to_date,
+    )
 
     base_q = expense_transactions_in_period_q(
         db,
         wallet_id=wallet_id,
-        period_start_utc=period_start_utc,
-        period_end_utc=period_end_utc,
+        period_start_utc=period.period_start_utc,
+        period_end_utc=period.period_end_utc,
     )
 
-    agg_rows_raw = (
-        base_q.with_entities(
-            col(Transaction.category_id),
-            col(Transaction.product_id),
-            func.coalesce(func.sum(col(Transaction.amount_base)), ZERO).label(
-                "sum_amount"
-            ),
+    # grupowanie po PK -> Postgres pozwala wybrać pozostałe kolumny User/Category/Product
+    rows = (
+        base_q.join(User, col(User.id) == col(Transaction.user_id))
+        .join(Category, col(Category.id) == col(Transaction.category_id))
+        .outerjoin(Product, col(Product.id) == col(Transaction.product_id))
+        .with_entities(
+            col(User.id),
+            col(User.display_name),
+            Category,
+            col(Product.id),
+            col(Product.name),
+            col(Product.importance),
+            func.sum(col(Transaction.amount_base)).label("sum_amount"),
+        )
+        .group_by(col(User.id), col(Category.id), col(Product.id))
+        .order_by(
+            col(Category.created_at),
+            col(Product.created_at).asc().nulls_first(),
         )
-        .group_by(col(Transaction.category_id), col(Transaction.product_id))
         .all()
     )
 
-    agg_rows = cast(list[tuple[UUID, UUID | None, Decimal]], agg_rows_raw)
-
-    (
-        category_sum,
-        no_product_sum,
-        product_sum,
-        used_category_ids,
-        used_product_ids,
-        total,
-    ) = build_category_product_sums(agg_rows)
-
-    used_category_ids_list = list(used_category_ids)
-    used_product_ids_list = list(used_product_ids)
-
-    if include_empty:
-        cat_q = db.query(Category).filter(col(Category.wallet_id) == wallet_id)
-        if used_category_ids_list:
-            cat_q = cat_q.filter(
-                or_(
-                    col(Category.deleted_at).is_(None),
-                    col(Category.id).in_(used_category_ids_list),
-                )
+    members: dict[UUID, MemberSummaryRead] = {}
+    member_categories: dict[tuple[UUID, UUID], CategoriesWithProductsSummaryRead] = {}
+
+    for (
+        user_id,
+        display_name,
+        category,
+        product_id,
+        product_name,
+        product_importance,
+        sum_amount,
+    ) in rows:
+        member = members.get(user_id)
+        if member is None:
+            member = MemberSummaryRead(
+                user_id=user_id,
+                display_name=display_name,
+                total=ZERO,
+                categories=[],
             )
-        else:
-            cat_q = cat_q.filter(col(Category.deleted_at).is_(None))
+            members[user_id] = member
+
+        key = (user_id, category.id)
+        item = member_categories.get(key)
+        if item is None:
+            item = CategoriesWithProductsSummaryRead(
+                category=CategoryRead.model_validate(category),
+                category_sum=ZERO,
+                no_product_sum=ZERO,
+                products=[],
+            )
+            member_categories[key] = item
+            member.categories.append(item)
 
-        categories = cat_q.order_by(col(Category.created_at)).all()
+        member.total += sum_amount
+        item.category_sum += sum_amount
 
-        prod_q = db.query(Product).filter(col(Product.wallet_id) == wallet_id)
-        if used_product_ids_list:
-            prod_q = prod_q.filter(
-                or_(
-                    col(Product.deleted_at).is_(None),
-                    col(Product.id).in_(used_product_ids_list),
+        if product_id is None:
+            item.no_product_sum += sum_amount
+        else:
+            item.products.append(
+                ProductWithSumRead(
+                    product=ProductInTransactionRead(
+                        id=product_id,
+                        name=product_name,
+                        importance=product_importance,
+                    ),
+                    product_sum=sum_amount,
                 )
             )
-        else:
-            prod_q = prod_q.filter(col(Product.deleted_at).is_(None))
 
-        products = prod_q.order_by(col(Product.created_at)).all()
+    ordered = sorted(
+        members.values(),
+        key=lambda m: (-m.total, (m.display_name or "").lower()),
+    )
 
-    else:
-        if not used_category_ids_list:
-            return CategoriesProductsSummaryRead(
-                currency=currency,
-                period_start=period_start_utc,
-                period_end=period_end_utc,
-                total=ZERO,
-                categories=[],
-            )
+    return MembersSummaryRead(
+        currency=currency,
+        period_start=period.period_start_utc,
+        period_end=period.period_end_utc,
+        total=sum((m.total for m in ordered), ZERO),
+        members=ordered,
+    )
+
+
+def summary_categories_comparison(
+    *,
+    wallet_id: UUID,
+    db: Session,
+    current_user: User,
+    current_period: bool = True,
+    from_date: date | None = None,
+    to_date: date | None = None,
+) -> CategoriesComparisonSummaryRead:
+    membership = ensure_wallet_member(db, wallet_id, current_user)
+    currency = membership.wallet.currency
+
+    current, previous = resolve_user_comparison_ranges(
+        user=current_user,
+        current_period=current_period,
+        from_date=from_date,
+        to_date=to_date,
+    )
+    current_sum, previous_sum = period_sum_columns(current, previous)
+
+    base_q = expense_transactions_in_period_q(
+        db,
+        wallet_id=wallet_id,
+        period_start_utc=previous.period_start_utc,
+        period_end_utc=current.period_end_utc,
+    )
+
+    rows_raw = (
+        base_q.with_entities(col(Transaction.category_id), current_sum, previous_sum)
+        .group_by(col(Transaction.category_id))
+        .all()
+    )
+    rows = cast(list[tuple[UUID, Decimal, Decimal]], rows_raw)
+
+    sums_by_category = {cat_id: (cur, prev) for cat_id, cur, prev in rows}
+    total_current = sum((cur for cur, _ in sums_by_category.values()), ZERO)
+    total_previous = sum((prev for _, prev in sums_by_category.values()), ZERO)
 
+    categories: list[Category] = []
+    if sums_by_category:
         categories = (
             db.query(Category)
             .filter(
                 col(Category.wallet_id) == wallet_id,
-                col(Category.id).in_(used_category_ids_list),
+                col(Category.id).in_(list(sums_by_category)),
             )
             .order_by(col(Category.created_at))
             .all()
         )
 
-        if used_product_ids_list:
-            products = (
-                db.query(Product)
-                .filter(
-                    col(Product.wallet_id) == wallet_id,
-                    col(Product.id).in_(used_product_ids_list),
-                )
-                .order_by(col(Product.created_at))
-                .all()
-            )
-        else:
-            products = []
-
-    products_by_category: defaultdict[UUID, list[Product]] = defaultdict(list)
-    for p in products:
-        products_by_category[p.category_id].append(p)
-
-    category_items: list[CategoriesWithProductsSummaryRead] = []
-
+    category_items: list[CategoryComparisonRead] = []
     for c in categories:
-        prod_items: list[ProductWithSumRead] = []
-
-        for p in sorted(products_by_category.get(c.id, []), key=lambda x: x.created_at):
-            key = (c.id, p.id)
-            if not include_empty and key not in product_sum:
-                continue
-
-            ps = product_sum.get(key, ZERO)
-
-            prod_items.append(
-                ProductWithSumRead(
-                    product=ProductInTransactionRead(
-                        id=p.id,
-                        name=p.name,
-                        importance=p.importance,
-                    ),
-                    product_sum=ps,
-                )
-            )
-
+        cur, prev = sums_by_category[c.id]
         category_items.append(
-            CategoriesWithProductsSummaryRead(
+            CategoryComparisonRead(
                 category=CategoryRead.model_validate(c),
-                category_sum=category_sum.get(c.id, ZERO),
-                no_product_sum=no_product_sum.get(c.id, ZERO),
-                products=prod_items,
+                category_sum=_comparison(cur, prev),
             )
         )
 
-    return CategoriesProductsSummaryRead(
+    return CategoriesComparisonSummaryRead(
         currency=currency,
-        period_start=period_start_utc,
-        period_end=period_end_utc,
-        total=total,
+        period_start=current.period_start_utc,
+        period_end=current.period_end_utc,
+        previous_period_start=previous.period_start_utc,
+        previous_period_end=previous.period_end_utc,
+        total=_comparison(total_current, total_previous),
         categories=category_items,
     )
 
 
-def summary_by_importance(
+def summary_by_importance_comparison(
     *,
     wallet_id: UUID,
     db: Session,
@@ -197,65 +319,166 @@ def summary_by_importance(
     current_period: bool = True,
     from_date: date | None = None,
     to_date: date | None = None,
-) -> ImportanceSummaryRead:
+) -> ImportanceComparisonSummaryRead:
     membership = ensure_wallet_member(db, wallet_id, current_user)
     currency = membership.wallet.currency
 
-    period = resolve_user_period_range(
+    current, previous = resolve_user_comparison_ranges(
         user=current_user,
         current_period=current_period,
         from_date=from_date,
         to_date=to_date,
     )
-    period_start_utc = period.period_start_utc
-    period_end_utc = period.period_end_utc
+    current_sum, previous_sum = period_sum_columns(current, previous)
 
     base_q = expense_transactions_in_period_q(
         db,
         wallet_id=wallet_id,
-        period_start_utc=period_start_utc,
-        period_end_utc=period_end_utc,
+        period_start_utc=previous.period_start_utc,
+        period_end_utc=current.period_end_utc,
     )
 
     rows_raw = (
         base_q.outerjoin(Product, col(Transaction.product_id) == col(Product.id))
-        .with_entities(
+        .with_entities(col(Product.importance), current_sum, previous_sum)
+        .group_by(col(Product.importance))
+        .all()
+    )
+    rows = cast(list[tuple[ProductImportance | None, Decimal, Decimal]], rows_raw)
+
+    sums: dict[ProductImportance | None, tuple[Decimal, Decimal]] = {
+        importance: (cur, prev) for importance, cur, prev in rows
+    }
+
+    def _for(importance: ProductImportance | None) -> SumComparisonRead:
+        cur, prev = sums.get(importance, (ZERO, ZERO))
+        return _comparison(cur, prev)
+
+    total_current = sum((cur for cur, _ in sums.values()), ZERO)
+    total_previous = sum((prev for _, prev in sums.values()), ZERO)
+
+    return ImportanceComparisonSummaryRead(
+        currency=currency,
+        period_start=current.period_start_utc,
+        period_end=current.period_end_utc,
+        previous_period_start=previous.period_start_utc,
+        previous_period_end=previous.period_end_utc,
+        total=_comparison(total_current, total_previous),
+        necessary=_for(ProductImportance.NECESSARY),
+        important=_for(ProductImportance.IMPORTANT),
+        unnecessary=_for(ProductImportance.UNNECESSARY),
+        unassigned=_for(None),
+    )
+
+
+def summary_all_wallets(
+    *,
+    db: Session,
+    current_user: User,
+    current_period: bool = True,
+    from_date: date | None = None,
+    to_date: date | None = None,
+) -> AllWalletsSummaryRead:
+    settings = require_user_settings(current_user)
+    target_currency = normalize_currency(settings.currency)
+
+    period = resolve_user_period_range(
+        user=current_user,
+        current_period=current_period,
+        from_date=from_date,
+        to_date=to_date,
+    )
+    period_start_utc = period.period_start_utc
+    period_end_utc = period.period_end_utc
+
+    rows_raw = (
+        db.query(
+            col(Wallet.id),
+            col(Wallet.name),
+            col(Wallet.currency),
             col(Product.importance),
             func.coalesce(func.sum(col(Transaction.amount_base)), ZERO).label(
                 "sum_amount"
             ),
         )
-        .group_by(col(Product.importance))
+        .select_from(WalletUser)
+        .join(Wallet, col(Wallet.id) == col(WalletUser.wallet_id))
+        .outerjoin(
+            Transaction,
+            and_(
+                col(Transaction.wallet_id) == col(WalletUser.wallet_id),
+                col(Transaction.deleted_at).is_(None),
+                col(Transaction.type) == "expense",
+                col(Transaction.occurred_at) >= period_start_utc,
+                col(Transaction.occurred_at) < period_end_utc,
+            ),
+        )
+        .outerjoin(Product, col(Transaction.product_id) == col(Product.id))
+        .filter(col(WalletUser.user_id) == current_user.id)
+        .group_by(
+            col(WalletUser.created_at),
+            col(Wallet.id),
+            col(Wallet.name),
+            col(Wallet.currency),
+            col(Product.importance),
+        )
+        .order_by(col(WalletUser.created_at))
         .all()
     )
 
-    rows = cast(list[tuple[ProductImportance | None, Decimal]], rows_raw)
-
-    necessary = ZERO
-    important = ZERO
-    unnecessary = ZERO
-    unassigned = ZERO
+    rows = cast(
+        list[tuple[UUID, str, str, ProductImportance | None, Decimal]], rows_raw
+    )
 
-    for importance, sum_amount in rows:
-        match importance:
-            case None:
-                unassigned += sum_amount
-            case ProductImportance.IMPORTANT:
-                important += sum_amount
-            case ProductImportance.NECESSARY:
-                necessary += sum_amount
-            case ProductImportance.UNNECESSARY:
-                unnecessary += sum_amount
+    wallet_order: list[UUID] = []
+    wallet_meta: dict[UUID, tuple[str, str]] = {}
+    wallet_sums: dict[UUID, dict[ProductImportance | None, Decimal]] = {}
+
+    for w_id, w_name, w_currency, importance, sum_amount in rows:
+        if w_id not in wallet_meta:
+            wallet_order.append(w_id)
+            wallet_meta[w_id] = (w_name, w_currency)
+            wallet_sums[w_id] = {}
+        sums = wallet_sums[w_id]
+        sums[importance] = sums.get(importance, ZERO) + sum_amount
+
+    combined: dict[ProductImportance | None, Decimal] = {}
+    wallet_items: list[WalletImportanceSummaryRead] = []
+
+    for w_id in wallet_order:
+        w_name, w_currency = wallet_meta[w_id]
+        sums = wallet_sums[w_id]
+        rate = q2(fx_rate(normalize_currency(w_currency), target_currency))
+
+        for importance, sum_amount in sums.items():
+            combined[importance] = combined.get(importance, ZERO) + q2(
+                sum_amount * rate
+            )
 
-    total = necessary + important + unnecessary + unassigned
+        total = sum(sums.values(), ZERO)
+        wallet_items.append(
+            WalletImportanceSummaryRead(
+                wallet_id=w_id,
+                wallet_name=w_name,
+                currency=w_currency,
+                fx_rate=rate,
+                total=total,
+                total_converted=q2(total * rate),
+                necessary=sums.get(ProductImportance.NECESSARY, ZERO),
+                important=sums.get(ProductImportance.IMPORTANT, ZERO),
+                unnecessary=sums.get(ProductImportance.UNNECESSARY, ZERO),
+                unassigned=sums.get(None, ZERO),
+            )
+        )
 
-    return ImportanceSummaryRead(
-        currency=currency,
+    return AllWalletsSummaryRead(
+        currency=target_currency,
         period_start=period_start_utc,
         period_end=period_end_utc,
-        total=total,
-        necessary=necessary,
-        important=important,
-        unnecessary=unnecessary,
-        unassigned=unassigned,
+        total=sum(combined.values(), ZERO),
+        necessary=combined.get(ProductImportance.NECESSARY, ZERO),
+        important=combined.get(ProductImportance.IMPORTANT, ZERO),
+        unnecessary=combined.get(ProductImportance.UNNECESSARY, ZERO),
+        unassigned=combined.get(None, ZERO),
+        wallets=wallet_items,
     )
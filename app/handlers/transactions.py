@@ -1,26 +1,54 @@
 import csv
 import io
 from datetime import date, datetime, timezone
+from typing import Any
 from uuid import UUID
 
 from fastapi import HTTPException, status
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session
 from sqlmodel import col
 
-from ..helpers.wallets import ensure_wallet_member
+from ..helpers.wallets import bump_wallet_version, ensure_wallet_member
+from ..helpers.budgets import apply_budget_delta, apply_budget_deltas
+from ..helpers.snapshots import closed_ranges, ensure_period_open, lock_wallet
 from ..helpers.categories import get_category_or_404
 from ..helpers.products import get_product_or_404
 from ..helpers.summary import resolve_user_period_range
 from ..helpers.fx import normalize_currency, compute_amounts
+from ..helpers.fieldsets import Fieldset, nest_rows, parse_fields
+from ..helpers.read_models import (
+    TRANSACTION_FIELDSET,
+    transaction_columns,
+    transaction_read_dicts,
+    transactions_select,
+)
+from ..helpers.serialization import (
+    NDJSON_CHUNK_SIZE,
+    ensure_response_shape,
+    ndjson_response,
+    validate_list,
+)
 from ..helpers.transactions import (
     base_transactions_q,
     ensure_deletable,
     ensure_refundable,
     get_transaction_or_404,
+    insert_refunds,
+    lock_transaction_states,
+    soft_delete_transactions,
 )
 from ..models import Transaction, User
-from ..schemas.transaction import TransactionCreate, TransactionRead
+from ..schemas.transaction import (
+    TransactionBulkItemRead,
+    TransactionBulkRead,
+    TransactionBulkRequest,
+    TransactionCreate,
+    TransactionCreateRead,
+    TransactionRead,
+)
+
+EXPORT_CHUNK_SIZE = 64 * 1024
 
 
 def create_transaction(
@@ -29,7 +57,7 @@ def create_transaction(
     body: TransactionCreate,
     db: Session,
     current_user: User,
-) -> TransactionRead:
+) -> TransactionCreateRead:
     membership = ensure_wallet_member(db, wallet_id, current_user)
     wallet_currency = normalize_currency(membership.wallet.currency)
 
@@ -67,6 +95,11 @@ def create_transaction(
                 detail="product does not belong to this category",
             )
 
+    now_utc = datetime.now(timezone.utc)
+    occurred_at = (
+        body.occurred_at if getattr(body, "occurred_at", None) is not None else now_utc
+    )
+
     (
         amount_base,
         currency_base,
@@ -77,12 +110,10 @@ def create_transaction(
         amount=amount,
         input_currency=input_currency,
         wallet_currency=wallet_currency,
+        occurred_at=occurred_at,
     )
 
-    now_utc = datetime.now(timezone.utc)
-    occurred_at = (
-        body.occurred_at if getattr(body, "occurred_at", None) is not None else now_utc
-    )
+    ensure_period_open(db, wallet_id=wallet_id, at=occurred_at)
 
     transaction = Transaction(
         wallet_id=wallet_id,
@@ -100,6 +131,14 @@ def create_transaction(
     )
 
     db.add(transaction)
+    budget_remaining = apply_budget_delta(
+        db,
+        wallet_id=wallet_id,
+        category_id=transaction.category_id,
+        occurred_at=transaction.occurred_at,
+        delta=transaction.amount_base,
+    )
+    bump_wallet_version(db, wallet_id)
     db.commit()
 
     transaction = (
@@ -108,23 +147,23 @@ def create_transaction(
         .one()
     )
 
-    return TransactionRead.model_validate(transaction)
+    base = TransactionRead.model_validate(transaction).model_dump()
+    return TransactionCreateRead(**(base | {"budget_remaining": budget_remaining}))
 
 
-def list_transactions(
+def _list_transactions_stmt(
     *,
     wallet_id: UUID,
     db: Session,
     current_user: User,
-    from_date: date | None = None,
-    to_date: date | None = None,
-    current_period: bool = False,
-    category_id: UUID | None = None,
-    product_id: UUID | None = None,
-) -> list[TransactionRead]:
-    _ = ensure_wallet_member(db, wallet_id, current_user)
-
-    query = base_transactions_q(db, wallet_id=wallet_id)
+    from_date: date | None,
+    to_date: date | None,
+    current_period: bool,
+    category_id: UUID | None,
+    product_id: UUID | None,
+    fieldset: Fieldset | None,
+):
+    stmt = transactions_select(wallet_id=wallet_id, fieldset=fieldset)
 
     if current_period or from_date is not None or to_date is not None:
         period = resolve_user_period_range(
@@ -133,7 +172,7 @@ def list_transactions(
             from_date=from_date,
             to_date=to_date,
         )
-        query = query.filter(
+        stmt = stmt.where(
             col(Transaction.occurred_at) >= period.period_start_utc,
             col(Transaction.occurred_at) < period.period_end_utc,
         )
@@ -145,7 +184,7 @@ def list_transactions(
             category_id=category_id,
             require_not_deleted=True,
         )
-        query = query.filter(col(Transaction.category_id) == category_id)
+        stmt = stmt.where(col(Transaction.category_id) == category_id)
 
     if product_id is not None:
         _ = get_product_or_404(
@@ -154,13 +193,86 @@ def list_transactions(
             product_id=product_id,
             require_not_deleted=True,
         )
-        query = query.filter(col(Transaction.product_id) == product_id)
+        stmt = stmt.where(col(Transaction.product_id) == product_id)
 
-    transactions = query.order_by(
+    return stmt.order_by(
         col(Transaction.occurred_at).desc(), col(Transaction.created_at).desc()
-    ).all()
+    )
 
-    return [TransactionRead.model_validate(t) for t in transactions]
+
+def list_transactions(
+    *,
+    wallet_id: UUID,
+    db: Session,
+    current_user: User,
+    from_date: date | None = None,
+    to_date: date | None = None,
+    current_period: bool = False,
+    category_id: UUID | None = None,
+    product_id: UUID | None = None,
+    shape: str = "rows",
+    fields: str | None = None,
+) -> list[TransactionRead] | list[dict[str, Any]] | dict[str, Any]:
+    _ = ensure_wallet_member(db, wallet_id, current_user)
+    ensure_response_shape(shape)
+    fieldset = parse_fields(fields, TRANSACTION_FIELDSET)
+
+    stmt = _list_transactions_stmt(
+        wallet_id=wallet_id,
+        db=db,
+        current_user=current_user,
+        from_date=from_date,
+        to_date=to_date,
+        current_period=current_period,
+        category_id=category_id,
+        product_id=product_id,
+        fieldset=fieldset,
+    )
+    rows = db.execute(stmt).all()
+
+    if shape == "columnar":
+        return transaction_columns(rows, fieldset)
+    if fieldset is not None:
+        return nest_rows(rows, fieldset)
+    return validate_list(TransactionRead, transaction_read_dicts(rows))
+
+
+def stream_transactions(
+    *,
+    wallet_id: UUID,
+    db: Session,
+    current_user: User,
+    from_date: date | None = None,
+    to_date: date | None = None,
+    current_period: bool = False,
+    category_id: UUID | None = None,
+    product_id: UUID | None = None,
+    fields: str | None = None,
+) -> StreamingResponse:
+    _ = ensure_wallet_member(db, wallet_id, current_user)
+    fieldset = parse_fields(fields, TRANSACTION_FIELDSET)
+
+    stmt = _list_transactions_stmt(
+        wallet_id=wallet_id,
+        db=db,
+        current_user=current_user,
+        from_date=from_date,
+        to_date=to_date,
+        current_period=current_period,
+        category_id=category_id,
+        product_id=product_id,
+        fieldset=fieldset,
+    )
+    result = db.execute(stmt.execution_options(yield_per=NDJSON_CHUNK_SIZE))
+
+    if fieldset is not None:
+        chunks = (nest_rows(rows, fieldset) for rows in result.partitions())
+    else:
+        chunks = (
+            validate_list(TransactionRead, transaction_read_dicts(rows))
+            for rows in result.partitions()
+        )
+    return ndjson_response(TransactionRead, chunks)
 
 
 def refund_transaction(
@@ -188,6 +300,9 @@ def refund_transaction(
         refund_currency_original = None
         refund_fx_rate = None
 
+    now_utc = datetime.now(timezone.utc)
+    ensure_period_open(db, wallet_id=wallet_id, at=now_utc)
+
     refund = Transaction(
         wallet_id=wallet_id,
         user_id=current_user.id,
@@ -199,11 +314,19 @@ def refund_transaction(
         amount_original=refund_amount_original,
         currency_original=refund_currency_original,
         fx_rate=refund_fx_rate,
-        occurred_at=datetime.now(timezone.utc),
+        occurred_at=now_utc,
         refund_of_transaction_id=original.id,
     )
 
     db.add(refund)
+    _ = apply_budget_delta(
+        db,
+        wallet_id=wallet_id,
+        category_id=refund.category_id,
+        occurred_at=refund.occurred_at,
+        delta=refund.amount_base,
+    )
+    bump_wallet_version(db, wallet_id)
     db.commit()
 
     refund = (
@@ -226,10 +349,168 @@ def soft_delete_transaction(
 
     tx = get_transaction_or_404(db, wallet_id=wallet_id, transaction_id=transaction_id)
     ensure_deletable(tx)
+    ensure_period_open(db, wallet_id=wallet_id, at=tx.occurred_at)
 
     tx.deleted_at = datetime.now(timezone.utc)
+    _ = apply_budget_delta(
+        db,
+        wallet_id=wallet_id,
+        category_id=tx.category_id,
+        occurred_at=tx.occurred_at,
+        delta=-tx.amount_base,
+    )
+    bump_wallet_version(db, wallet_id)
+    db.commit()
+
+
+def bulk_soft_delete_transactions(
+    *,
+    wallet_id: UUID,
+    body: TransactionBulkRequest,
+    db: Session,
+    current_user: User,
+) -> TransactionBulkRead:
+    """Soft delete many transactions at once; each id gets its own outcome.
+
+    Same rules as `soft_delete_transaction`, checked for all ids with two
+    queries and applied with one UPDATE and one budget-counter pass.
+    """
+    _ = ensure_wallet_member(db, wallet_id, current_user)
+    transaction_ids = list(dict.fromkeys(body.transaction_ids))
+
+    lock_wallet(db, wallet_id)
+    states = lock_transaction_states(
+        db, wallet_id=wallet_id, transaction_ids=transaction_ids
+    )
+    closed = (
+        closed_ranges(
+            db, wallet_id=wallet_id, since=min(s.occurred_at for s in states.values())
+        )
+        if states
+        else []
+    )
+    in_closed = {
+        tx_id
+        for tx_id, state in states.items()
+        if any(start <= state.occurred_at < end for start, end in closed)
+    }
+
+    deleted = soft_delete_transactions(
+        db,
+        wallet_id=wallet_id,
+        transaction_ids=[
+            tx_id
+            for tx_id, state in states.items()
+            if not state.has_refunds and tx_id not in in_closed
+        ],
+        now_utc=datetime.now(timezone.utc),
+    )
+    if deleted:
+        apply_budget_deltas(
+            db,
+            [
+                (r.wallet_id, r.category_id, r.occurred_at, -r.amount_base)
+                for r in deleted
+            ],
+        )
+        bump_wallet_version(db, wallet_id)
+    db.commit()
+
+    deleted_ids = {r.id for r in deleted}
+    results: list[TransactionBulkItemRead] = []
+    for tx_id in transaction_ids:
+        if tx_id in deleted_ids:
+            item = TransactionBulkItemRead(transaction_id=tx_id, status=204)
+        elif tx_id not in states:
+            item = TransactionBulkItemRead(
+                transaction_id=tx_id, status=404, detail="transaction not found"
+            )
+        elif tx_id in in_closed:
+            item = TransactionBulkItemRead(
+                transaction_id=tx_id, status=409, detail="Period is closed"
+            )
+        else:
+            item = TransactionBulkItemRead(
+                transaction_id=tx_id,
+                status=409,
+                detail="Cannot delete transaction with refunds",
+            )
+        results.append(item)
+
+    return TransactionBulkRead(succeeded=len(deleted_ids), results=results)
+
+
+def bulk_refund_transactions(
+    *,
+    wallet_id: UUID,
+    body: TransactionBulkRequest,
+    db: Session,
+    current_user: User,
+) -> TransactionBulkRead:
+    """Refund many transactions at once; each id gets its own outcome.
+
+    Same rules as `refund_transaction`: refunds are dated now, so a closed
+    current period rejects the whole request with 409.
+    """
+    _ = ensure_wallet_member(db, wallet_id, current_user)
+    transaction_ids = list(dict.fromkeys(body.transaction_ids))
+
+    now_utc = datetime.now(timezone.utc)
+    ensure_period_open(db, wallet_id=wallet_id, at=now_utc)
+    states = lock_transaction_states(
+        db, wallet_id=wallet_id, transaction_ids=transaction_ids
+    )
+
+    refunds = insert_refunds(
+        db,
+        wallet_id=wallet_id,
+        user_id=current_user.id,
+        transaction_ids=[
+            tx_id
+            for tx_id, state in states.items()
+            if state.refund_of_transaction_id is None and not state.has_refunds
+        ],
+        now_utc=now_utc,
+    )
+    if refunds:
+        apply_budget_deltas(
+            db,
+            [
+                (r.wallet_id, r.category_id, r.occurred_at, r.amount_base)
+                for r in refunds
+            ],
+        )
+        bump_wallet_version(db, wallet_id)
     db.commit()
 
+    refund_ids = {r.refund_of_transaction_id: r.id for r in refunds}
+    results: list[TransactionBulkItemRead] = []
+    for tx_id in transaction_ids:
+        state = states.get(tx_id)
+        if tx_id in refund_ids:
+            item = TransactionBulkItemRead(
+                transaction_id=tx_id,
+                status=201,
+                refund_transaction_id=refund_ids[tx_id],
+            )
+        elif state is None:
+            item = TransactionBulkItemRead(
+                transaction_id=tx_id, status=404, detail="transaction not found"
+            )
+        elif state.refund_of_transaction_id is not None:
+            item = TransactionBulkItemRead(
+                transaction_id=tx_id,
+                status=400,
+                detail="Cannot refund a refund transaction",
+            )
+        else:
+            item = TransactionBulkItemRead(
+                transaction_id=tx_id, status=400, detail="Transaction already refunded"
+            )
+        results.append(item)
+
+    return TransactionBulkRead(succeeded=len(refund_ids), results=results)
+
 
 def export_transactions(
     *,
@@ -257,19 +538,10 @@ def export_transactions(
         to_date=to_date,
     )
 
-    query = (
-        db.query(Transaction)
-        .options(
-            joinedload(Transaction.category),
-            joinedload(Transaction.product),
-        )
-        .filter(
-            col(Transaction.wallet_id) == wallet_id,
-            col(Transaction.deleted_at).is_(None),
-            col(Transaction.type) == "expense",
-            col(Transaction.occurred_at) >= period.period_start_utc,
-            col(Transaction.occurred_at) < period.period_end_utc,
-        )
+    stmt = transactions_select(wallet_id=wallet_id).where(
+        col(Transaction.type) == "expense",
+        col(Transaction.occurred_at) >= period.period_start_utc,
+        col(Transaction.occurred_at) < period.period_end_utc,
     )
 
     if category_id is not None:
@@ -279,7 +551,7 @@ def export_transactions(
             category_id=category_id,
             require_not_deleted=True,
         )
-        query = query.filter(col(Transaction.category_id) == category_id)
+        stmt = stmt.where(col(Transaction.category_id) == category_id)
 
     if product_id is not None:
         _ = get_product_or_404(
@@ -288,11 +560,11 @@ def export_transactions(
             product_id=product_id,
             require_not_deleted=True,
         )
-        query = query.filter(col(Transaction.product_id) == product_id)
+        stmt = stmt.where(col(Transaction.product_id) == product_id)
 
-    query = query.order_by(
+    stmt = stmt.order_by(
         col(Transaction.occurred_at).desc(), col(Transaction.created_at).desc()
-    )
+    ).execution_options(yield_per=1000)
 
     def iter_csv():
         # BOM dla Excela
@@ -322,7 +594,7 @@ def export_transactions(
         _ = buf.seek(0)
         _ = buf.truncate(0)
 
-        for t in query.yield_per(1000):
+        for t in db.execute(stmt):
             writer.writerow(
                 [
                     str(t.id),
@@ -330,9 +602,9 @@ def export_transactions(
                     str(t.amount_base),
                     t.currency_base,
                     str(t.category_id),
-                    t.category.name if t.category else "",
+                    t.category_name,
                     str(t.product_id) if t.product_id else "",
-                    t.product.name if t.product else "",
+                    t.product_name or "",
                     str(t.amount_original) if t.amount_original is not None else "",
                     t.currency_original or "",
                     str(t.fx_rate) if t.fx_rate is not None else "",
@@ -344,9 +616,14 @@ def export_transactions(
                     t.created_at.isoformat(),
                 ]
             )
+            # paczki zamiast wiersz po wierszu -> mniej komunikatów ASGI i ramek gzip
+            if buf.tell() >= EXPORT_CHUNK_SIZE:
+                yield buf.getvalue()
+                _ = buf.seek(0)
+                _ = buf.truncate(0)
+
+        if buf.tell():
             yield buf.getvalue()
-            _ = buf.seek(0)
-            _ = buf.truncate(0)
 
     filename = f"transactions_{wallet_id}.csv"
     headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
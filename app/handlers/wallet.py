@@ -7,6 +7,8 @@ from sqlalchemy.orm import Session, selectinload
 from sqlmodel import col
 
 from ..helpers.fx import normalize_currency
+from ..helpers.read_models import members_select
+from ..helpers.serialization import validate_list
 from ..helpers.users import require_user_settings
 from ..helpers.wallets import ensure_wallet_member, ensure_wallet_owner
 from ..models import User, Wallet, WalletUser
@@ -154,23 +156,5 @@ def list_wallet_members(
 ) -> list[MemberRead]:
     _ = ensure_wallet_member(db, wallet_id, current_user)
 
-    memberships = (
-        db.query(WalletUser)
-        .options(selectinload(WalletUser.user))
-        .filter(col(WalletUser.wallet_id) == wallet_id)
-        .order_by(col(WalletUser.created_at))
-        .all()
-    )
-
-    out: list[MemberRead] = []
-    for m in memberships:
-        u = m.user
-        out.append(
-            MemberRead(
-                user_id=u.id,
-                email=u.email,
-                display_name=u.display_name,
-                role=m.role,
-            )
-        )
-    return out
+    rows = db.execute(members_select(wallet_id=wallet_id)).all()
+    return validate_list(MemberRead, rows)
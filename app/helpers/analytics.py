@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import UUID
+
+import numpy as np
+import numpy.typing as npt
+from sqlalchemy import Float, Integer, String, cast, func, select
+from sqlalchemy.orm import Session
+from sqlmodel import col
+
+from ..models import Transaction
+
+EPOCH_DAY = np.datetime64("1970-01-01", "D")
+
+
+@dataclass(frozen=True)
+class DailyCategorySums:
+    """Flat per-(day, category) sums as returned by a single grouped query.
+
+    `day` is the local calendar day as days since 1970-01-01, `category_idx`
+    points into `category_ids`.
+    """
+
+    day: npt.NDArray[np.int64]
+    category_idx: npt.NDArray[np.int64]
+    amount: npt.NDArray[np.float64]
+    category_ids: list[UUID]
+
+
+@dataclass(frozen=True)
+class CategoryStats:
+    total: npt.NDArray[np.float64]
+    mean: npt.NDArray[np.float64]
+    median: npt.NDArray[np.float64]
+    std: npt.NDArray[np.float64]
+    rolling_mean: npt.NDArray[np.float64]
+    latest_zscore: npt.NDArray[np.float64]
+    anomalies: npt.NDArray[np.bool_]
+
+
+def local_day_number(value: date) -> int:
+    return int((np.datetime64(value, "D") - EPOCH_DAY).astype(np.int64))
+
+
+def day_from_number(day: int) -> date:
+    return (EPOCH_DAY + np.timedelta64(int(day), "D")).astype(date)
+
+
+def to_money(value: float) -> Decimal:
+    return Decimal(f"{value:.2f}")
+
+
+def fetch_daily_category_sums(
+    db: Session,
+    *,
+    wallet_id: UUID,
+    timezone_name: str,
+    start_utc: datetime,
+    end_utc: datetime,
+) -> DailyCategorySums:
+    local_ts = func.timezone(timezone_name, col(Transaction.occurred_at))
+    day_col = cast(func.floor(func.extract("epoch", local_ts) / 86400), Integer)
+
+    grouped = (
+        select(
+            day_col.label("day"),
+            col(Transaction.category_id).label("category_id"),
+            func.dense_rank()
+            .over(order_by=col(Transaction.category_id))
+            .label("category_rank"),
+            cast(func.sum(col(Transaction.amount_base)), Float).label("amount"),
+        )
+        .where(
+            col(Transaction.wallet_id) == wallet_id,
+            col(Transaction.deleted_at).is_(None),
+            col(Transaction.type) == "expense",
+            col(Transaction.occurred_at) >= start_utc,
+            col(Transaction.occurred_at) < end_utc,
+        )
+        .group_by(day_col, col(Transaction.category_id))
+        .subquery()
+    )
+
+    # jeden wiersz z kolumnami jako tablice -> bez hydracji ORM i bez Row per dzień
+    stmt = select(
+        func.array_agg(grouped.c.day),
+        func.array_agg(grouped.c.category_rank),
+        func.array_agg(grouped.c.amount),
+        func.array_agg(cast(grouped.c.category_id, String)),
+    )
+    days, ranks, amounts, category_ids = db.execute(stmt).one()
+
+    if not days:
+        return DailyCategorySums(
+            day=np.empty(0, dtype=np.int64),
+            category_idx=np.empty(0, dtype=np.int64),
+            amount=np.empty(0, dtype=np.float64),
+            category_ids=[],
+        )
+
+    category_idx = np.asarray(ranks, dtype=np.int64) - 1
+    ids_by_idx = np.empty(int(category_idx.max()) + 1, dtype=object)
+    ids_by_idx[category_idx] = category_ids
+
+    return DailyCategorySums(
+        day=np.asarray(days, dtype=np.int64),
+        category_idx=category_idx,
+        amount=np.asarray(amounts, dtype=np.float64),
+        category_ids=[UUID(str(c)) for c in ids_by_idx],
+    )
+
+
+def build_daily_matrix(
+    sums: DailyCategorySums, *, first_day: int, n_days: int
+) -> npt.NDArray[np.float64]:
+    matrix = np.zeros((n_days, len(sums.category_ids)), dtype=np.float64)
+    if sums.day.size:
+        np.add.at(matrix, (sums.day - first_day, sums.category_idx), sums.amount)
+    return matrix
+
+
+def rolling_mean(
+    matrix: npt.NDArray[np.float64], window: int
+) -> npt.NDArray[np.float64]:
+    """Trailing mean over `window` days for each column (row i covers days i-window+1..i)."""
+    n_days = matrix.shape[0]
+    window = max(1, min(window, n_days))
+
+    csum = np.cumsum(matrix, axis=0)
+    out = np.empty_like(csum)
+    out[:window] = csum[:window] / np.arange(1, window + 1)[:, None]
+    out[window:] = (csum[window:] - csum[:-window]) / window
+    return out
+
+
+def compute_category_stats(
+    matrix: npt.NDArray[np.float64],
+    *,
+    window: int,
+    z_threshold: float,
+) -> CategoryStats:
+    n_days = matrix.shape[0]
+
+    mean = matrix.mean(axis=0)
+    std = matrix.std(axis=0, ddof=1) if n_days > 1 else np.zeros(matrix.shape[1])
+    median = np.median(matrix, axis=0)
+
+    safe_std = np.where(std > 0, std, 1.0)
+    zscores = np.where(std > 0, (matrix - mean) / safe_std, 0.0)
+
+    return CategoryStats(
+        total=matrix.sum(axis=0),
+        mean=mean,
+        median=median,
+        std=std,
+        rolling_mean=rolling_mean(matrix, window)[-1],
+        latest_zscore=zscores[-1],
+        anomalies=(zscores > z_threshold) & (matrix > 0),
+    )
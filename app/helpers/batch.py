@@ -0,0 +1,164 @@
+"""In-process dispatch of `POST /batch` sub-requests.
+
+Each sub-request goes straight to the application router (no HTTP round-trip,
+no middleware) with the parent's DB session and authenticated user in its
+request state; `get_db` and `get_current_user` pick them up from there.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+from urllib.parse import urlencode, urlsplit
+
+import orjson
+from fastapi import Request, status
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.exceptions import HTTPException
+from starlette.types import Message
+
+from ..logging_setup import setup_logger
+from ..models import User
+from ..schemas.batch import BatchItem, BatchItemRead
+from .serialization import accept_ctx, orjson_dumps
+
+logger = setup_logger()
+
+BATCH_PATH = "/batch"
+
+
+def _error(status_code: int, detail: str) -> BatchItemRead:
+    return BatchItemRead(status=status_code, body={"detail": detail})
+
+
+def _scope(
+    request: Request,
+    item: BatchItem,
+    *,
+    path: str,
+    query_string: str,
+    db: Session,
+    user: User,
+) -> dict[str, Any]:
+    parent = request.scope
+    root_path = parent.get("root_path", "")
+    headers = [(b"accept", b"application/json")]
+    if item.body is not None:
+        headers.append((b"content-type", b"application/json"))
+    authorization = request.headers.get("authorization")
+    if authorization:
+        headers.append((b"authorization", authorization.encode("latin-1")))
+    if item.idempotency_key is not None:
+        headers.append((b"idempotency-key", item.idempotency_key.encode()))
+
+    return {
+        "type": "http",
+        # 2.4: odpowiedzi strumieniowe nie nasłuchują rozłączenia na receive
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": parent.get("http_version", "1.1"),
+        "method": item.method,
+        "scheme": parent.get("scheme", "http"),
+        "server": parent.get("server"),
+        "client": parent.get("client"),
+        "root_path": root_path,
+        "path": root_path + path,
+        "raw_path": (root_path + path).encode(),
+        "query_string": query_string.encode(),
+        "headers": headers,
+        "app": parent.get("app"),
+        "starlette.exception_handlers": parent.get("starlette.exception_handlers"),
+        # zasoby zależności sub-żądań zamykane razem z żądaniem nadrzędnym
+        "fastapi_middleware_astack": parent.get("fastapi_middleware_astack"),
+        "state": {
+            **parent.get("state", {}),
+            "batch_db": db,
+            "batch_user": user,
+        },
+    }
+
+
+def _body(content_type: str, raw: bytes) -> Any:
+    if not raw:
+        return None
+    if content_type.startswith("application/json"):
+        return orjson.loads(raw)
+    return raw.decode("utf-8", errors="replace")
+
+
+async def dispatch(
+    request: Request, item: BatchItem, *, db: Session, current_user: User
+) -> BatchItemRead:
+    """Run one sub-request through the router and capture its status and body."""
+    parts = urlsplit(item.path)
+    path = parts.path
+    if not path.startswith("/") or parts.scheme or parts.netloc:
+        return _error(status.HTTP_400_BAD_REQUEST, "path must be an absolute API path")
+    if path.rstrip("/") == BATCH_PATH:
+        return _error(
+            status.HTTP_400_BAD_REQUEST, "Nested batch requests are not allowed"
+        )
+
+    query = [parts.query] if parts.query else []
+    if item.query:
+        query.append(urlencode(item.query, doseq=True))
+
+    body = orjson_dumps(item.body) if item.body is not None else b""
+    body_sent = False
+
+    async def receive() -> Message:
+        nonlocal body_sent
+        if body_sent:
+            return {"type": "http.disconnect"}
+        body_sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+    content_type = ""
+    chunks: list[bytes] = []
+
+    async def send(message: Message) -> None:
+        nonlocal status_code, content_type
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+            for key, value in message.get("headers", []):
+                if key.lower() == b"content-type":
+                    content_type = value.decode("latin-1")
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    scope = _scope(
+        request,
+        item,
+        path=path,
+        query_string="&".join(query),
+        db=db,
+        user=current_user,
+    )
+    # sub-odpowiedzi zawsze jako JSON, niezależnie od Accept paczki
+    accept_token = accept_ctx.set(None)
+    try:
+        await request.app.router(scope, receive, send)
+    except HTTPException as exc:
+        # 404 / 405 z routera (brak trasy), poza obsługą wyjątków endpointów
+        return _error(exc.status_code, exc.detail)
+    except Exception:
+        await run_in_threadpool(db.rollback)
+        logger.error(
+            "batch item failed",
+            extra={
+                "event_type": "batch_item_failed",
+                "user_id": str(current_user.id),
+                "method": item.method,
+                "path": path,
+            },
+            exc_info=True,
+        )
+        return _error(status.HTTP_500_INTERNAL_SERVER_ERROR, "Internal Server Error")
+    finally:
+        accept_ctx.reset(accept_token)
+
+    if status_code >= 400:
+        # nieudany zapis nie może zostawić zmian w sesji dla kolejnych pozycji
+        await run_in_threadpool(db.rollback)
+
+    return BatchItemRead(status=status_code, body=_body(content_type, b"".join(chunks)))
@@ -0,0 +1,196 @@
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import datetime
+from decimal import Decimal
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import DateTime, func, literal, select, tuple_, update
+from sqlalchemy.dialects.postgresql import UUID as PGUUID, insert
+from sqlalchemy.orm import Session
+from sqlmodel import col
+
+from ..models import CategoryBudget, CategoryBudgetSpend, Transaction
+from .periods import PeriodRangeUTC, resolve_period_range_utc
+
+
+def get_budget(
+    db: Session, *, wallet_id: UUID, category_id: UUID
+) -> CategoryBudget | None:
+    return (
+        db.query(CategoryBudget)
+        .filter(
+            col(CategoryBudget.wallet_id) == wallet_id,
+            col(CategoryBudget.category_id) == category_id,
+        )
+        .first()
+    )
+
+
+def get_budget_or_404(
+    db: Session, *, wallet_id: UUID, category_id: UUID
+) -> CategoryBudget:
+    budget = get_budget(db, wallet_id=wallet_id, category_id=category_id)
+    if budget is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Budget not found"
+        )
+    return budget
+
+
+def budget_period(budget: CategoryBudget, at: datetime) -> PeriodRangeUTC:
+    return resolve_period_range_utc(
+        billing_day=budget.billing_day,
+        timezone_name=budget.timezone,
+        current_period=True,
+        now_utc=at,
+    )
+
+
+def upsert_budget_spend(
+    db: Session,
+    *,
+    budget: CategoryBudget,
+    period: PeriodRangeUTC,
+    delta: Decimal,
+) -> Decimal:
+    """Add `delta` to the (budget, period) counter and return the new value.
+
+    An existing counter is bumped with a plain UPDATE. Only a missing row is
+    seeded from the raw transactions of that period, which already include
+    the caller's flushed changes, so the delta is only applied when the row
+    existed before (or was seeded concurrently in the meantime).
+    """
+    spend = CategoryBudgetSpend.__table__
+    spent = db.execute(
+        update(spend)
+        .where(
+            spend.c.budget_id == budget.id,
+            spend.c.period_start == period.period_start_utc,
+        )
+        .values(spent=spend.c.spent + delta, updated_at=func.now())
+        .returning(spend.c.spent)
+    ).scalar_one_or_none()
+    if spent is not None:
+        return spent
+
+    # SUM tylko przy pierwszym zapisie w okresie
+    db.flush()
+    seed = select(
+        literal(budget.id, PGUUID(as_uuid=True)),
+        literal(period.period_start_utc, DateTime(timezone=True)),
+        literal(period.period_end_utc, DateTime(timezone=True)),
+        func.coalesce(func.sum(col(Transaction.amount_base)), Decimal("0")),
+        func.now(),
+    ).where(
+        col(Transaction.wallet_id) == budget.wallet_id,
+        col(Transaction.category_id) == budget.category_id,
+        col(Transaction.deleted_at).is_(None),
+        col(Transaction.type) == "expense",
+        col(Transaction.occurred_at) >= period.period_start_utc,
+        col(Transaction.occurred_at) < period.period_end_utc,
+    )
+
+    stmt = (
+        insert(spend)
+        .from_select(
+            ["budget_id", "period_start", "period_end", "spent", "updated_at"], seed
+        )
+        .on_conflict_do_update(
+            index_elements=[spend.c.budget_id, spend.c.period_start],
+            set_={"spent": spend.c.spent + delta, "updated_at": func.now()},
+        )
+        .returning(spend.c.spent)
+    )
+    return db.execute(stmt).scalar_one()
+
+
+def apply_budget_delta(
+    db: Session,
+    *,
+    wallet_id: UUID,
+    category_id: UUID,
+    occurred_at: datetime,
+    delta: Decimal,
+) -> Decimal | None:
+    budget = get_budget(db, wallet_id=wallet_id, category_id=category_id)
+    if budget is None:
+        return None
+
+    spent = upsert_budget_spend(
+        db, budget=budget, period=budget_period(budget, occurred_at), delta=delta
+    )
+    return budget.amount - spent
+
+
+def apply_budget_deltas(
+    db: Session,
+    rows: Iterable[tuple[UUID, UUID, datetime, Decimal]],
+) -> None:
+    """Apply (wallet_id, category_id, occurred_at, amount) deltas in bulk.
+
+    Deltas are summed per (budget, period) first: a seeded counter already
+    contains every flushed row of its period, so each counter is upserted once.
+    """
+    rows = list(rows)
+    if not rows:
+        return
+
+    budget_keys = {(wallet_id, category_id) for wallet_id, category_id, _, _ in rows}
+    budgets = {
+        (b.wallet_id, b.category_id): b
+        for b in db.query(CategoryBudget)
+        .filter(
+            tuple_(col(CategoryBudget.wallet_id), col(CategoryBudget.category_id)).in_(
+                budget_keys
+            )
+        )
+        .all()
+    }
+    if not budgets:
+        return
+
+    deltas: defaultdict[tuple[UUID, datetime], Decimal] = defaultdict(Decimal)
+    periods: dict[tuple[UUID, datetime], PeriodRangeUTC] = {}
+    by_id: dict[UUID, CategoryBudget] = {}
+    for wallet_id, category_id, occurred_at, amount in rows:
+        budget = budgets.get((wallet_id, category_id))
+        if budget is None:
+            continue
+        period = budget_period(budget, occurred_at)
+        key = (budget.id, period.period_start_utc)
+        deltas[key] += amount
+        periods[key] = period
+        by_id[budget.id] = budget
+
+    # stała kolejność upsertów -> równoległe workery blokują liczniki w tej samej kolejności
+    for key in sorted(deltas, key=lambda k: (str(k[0]), k[1])):
+        _ = upsert_budget_spend(
+            db, budget=by_id[key[0]], period=periods[key], delta=deltas[key]
+        )
+
+
+def current_spend_by_budget(
+    db: Session, budgets: list[CategoryBudget], at: datetime
+) -> dict[UUID, tuple[PeriodRangeUTC, Decimal]]:
+    periods = {b.id: budget_period(b, at) for b in budgets}
+    if not periods:
+        return {}
+
+    keys = [(budget_id, p.period_start_utc) for budget_id, p in periods.items()]
+    rows = (
+        db.query(col(CategoryBudgetSpend.budget_id), col(CategoryBudgetSpend.spent))
+        .filter(
+            tuple_(
+                col(CategoryBudgetSpend.budget_id),
+                col(CategoryBudgetSpend.period_start),
+            ).in_(keys)
+        )
+        .all()
+    )
+    spent_by_id: dict[UUID, Decimal] = {budget_id: spent for budget_id, spent in rows}
+
+    return {
+        budget_id: (period, spent_by_id.get(budget_id, Decimal("0")))
+        for budget_id, period in periods.items()
+    }
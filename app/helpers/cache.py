@@ -0,0 +1,27 @@
+from collections.abc import Hashable
+from threading import Lock
+from typing import Generic, TypeVar
+
+from cachetools import LRUCache
+
+V = TypeVar("V")
+
+
+class VersionedCache(Generic[V]):
+    """In-process LRU cache; keys carry a version so stale entries are never hit."""
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self._cache: LRUCache[Hashable, V] = LRUCache(maxsize=maxsize)
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> V | None:
+        with self._lock:
+            return self._cache.get(key)
+
+    def set(self, key: Hashable, value: V) -> None:
+        with self._lock:
+            self._cache[key] = value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
@@ -0,0 +1,117 @@
+"""Sparse fieldsets (`?fields=id,amount_base,category.id`) for list endpoints.
+
+A parsed fieldset maps each requested top-level field to `None` (scalar) or
+to the tuple of requested subfields of a nested object. Query columns are
+labelled by path with dots replaced by underscores (`category.name` ->
+`category_name`), which is what `nest_row` reads back.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from fastapi import HTTPException, status
+from sqlalchemy import Row
+from sqlalchemy.sql.elements import ColumnElement
+
+Fieldset = dict[str, tuple[str, ...] | None]
+
+
+def parse_fields(
+    fields: str | None, allowed: Mapping[str, tuple[str, ...] | None]
+) -> Fieldset | None:
+    """Parse a comma-separated field list; `None` means all fields.
+
+    `allowed` has the same shape as the result: a bare nested name
+    (`category`) selects all of its subfields.
+    """
+    if fields is None or not fields.strip():
+        return None
+
+    selected: Fieldset = {}
+    unknown: list[str] = []
+    for raw in fields.split(","):
+        path = raw.strip()
+        if not path:
+            continue
+        name, _, sub = path.partition(".")
+        if name not in allowed:
+            unknown.append(path)
+            continue
+
+        subfields = allowed[name]
+        if subfields is None:
+            if sub:
+                unknown.append(path)
+            else:
+                selected[name] = None
+            continue
+
+        if not sub:
+            selected[name] = subfields
+        elif sub in subfields:
+            current = selected.get(name) or ()
+            if sub not in current:
+                selected[name] = current + (sub,)
+        else:
+            unknown.append(path)
+
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}",
+        )
+    if not selected:
+        return None
+    # kolejność pól jak w modelu, niezależnie od kolejności w zapytaniu
+    return {
+        name: (
+            None
+            if selected[name] is None
+            else tuple(s for s in allowed[name] or () if s in selected[name])
+        )
+        for name in allowed
+        if name in selected
+    }
+
+
+def column_paths(fieldset: Fieldset) -> list[str]:
+    """Column paths to select; nested objects always bring their `id` along."""
+    paths: list[str] = []
+    for name, subfields in fieldset.items():
+        if subfields is None:
+            paths.append(name)
+            continue
+        paths.append(f"{name}.id")
+        paths.extend(f"{name}.{s}" for s in subfields if s != "id")
+    return paths
+
+
+def narrow_columns(
+    fieldset: Fieldset, columns: Mapping[str, ColumnElement[Any]]
+) -> list[ColumnElement[Any]]:
+    return [columns[path] for path in column_paths(fieldset)]
+
+
+def needs_join(fieldset: Fieldset | None, name: str) -> bool:
+    """True when subfields of `name` other than its id are requested."""
+    if fieldset is None:
+        return True
+    return any(s != "id" for s in fieldset.get(name) or ())
+
+
+def nest_row(row: Row[Any], fieldset: Fieldset) -> dict[str, Any]:
+    out: dict[str, Any] = {}
+    for name, subfields in fieldset.items():
+        if subfields is None:
+            out[name] = getattr(row, name)
+        elif getattr(row, f"{name}_id") is None:
+            out[name] = None
+        else:
+            out[name] = {s: getattr(row, f"{name}_{s}") for s in subfields}
+    return out
+
+
+def nest_rows(rows: Iterable[Row[Any]], fieldset: Fieldset) -> list[dict[str, Any]]:
+    return [nest_row(row, fieldset) for row in rows]
@@ -1,7 +1,20 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
 from decimal import Decimal, ROUND_HALF_UP
+
+import numpy as np
+import numpy.typing as npt
 from fastapi import HTTPException, status
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from sqlmodel import col
+
+from ..models import FxRate
 
 TWOPLACES = Decimal("0.01")
+SIXPLACES = Decimal("0.000001")
 
 FX_TO_PLN: dict[str, Decimal] = {
     "PLN": Decimal("1"),
@@ -14,6 +27,122 @@ def q2(x: Decimal) -> Decimal:
     return x.quantize(TWOPLACES, rounding=ROUND_HALF_UP)
 
 
+def q6(x: Decimal) -> Decimal:
+    return x.quantize(SIXPLACES, rounding=ROUND_HALF_UP)
+
+
+@dataclass(frozen=True)
+class FxRates:
+    """Daily rates on a common date grid, in ECB convention (units per 1 EUR).
+
+    `per_eur[i, j]` is the rate of currency j on `dates[i]`, carried forward
+    over days the currency was not quoted (NaN before its first quote).
+    `latest_cross[a, b]` is how many units of b one unit of a buys on the
+    last date. Instances are immutable and swapped as a whole on reload.
+    """
+
+    dates: npt.NDArray[np.datetime64]
+    currencies: dict[str, int]
+    per_eur: npt.NDArray[np.float64]
+    latest_cross: npt.NDArray[np.float64]
+    signature: tuple[int, datetime | None]
+
+    @classmethod
+    def build(
+        cls,
+        rows: list[tuple[str, date, Decimal]],
+        signature: tuple[int, datetime | None],
+    ) -> FxRates:
+        codes = sorted({cur for cur, _, _ in rows} | {"EUR"})
+        currencies = {cur: i for i, cur in enumerate(codes)}
+
+        days = np.array([d for _, d, _ in rows], dtype="datetime64[D]")
+        dates, date_idx = np.unique(days, return_inverse=True)
+        cur_idx = np.array([currencies[cur] for cur, _, _ in rows], dtype=np.int64)
+
+        raw = np.full((dates.size, len(codes)), np.nan)
+        raw[date_idx, cur_idx] = np.array([float(r) for _, _, r in rows])
+        raw[:, currencies["EUR"]] = 1.0
+
+        # forward fill: dla każdej komórki indeks ostatniego notowanego dnia
+        filled_at = np.where(np.isnan(raw), 0, np.arange(dates.size)[:, None])
+        np.maximum.accumulate(filled_at, axis=0, out=filled_at)
+        per_eur = raw[filled_at, np.arange(len(codes))]
+
+        latest = per_eur[-1] if dates.size else np.ones(len(codes))
+        return cls(
+            dates=dates,
+            currencies=currencies,
+            per_eur=per_eur,
+            latest_cross=latest[None, :] / latest[:, None],
+            signature=signature,
+        )
+
+    def rate(self, from_cur: str, to_cur: str, on: date | None = None) -> float | None:
+        a = self.currencies.get(from_cur)
+        b = self.currencies.get(to_cur)
+        if a is None or b is None or self.dates.size == 0:
+            return None
+
+        i = self.dates.size - 1
+        if on is not None:
+            i = int(np.searchsorted(self.dates, np.datetime64(on, "D"), side="right"))
+            # przed pierwszym notowaniem bierzemy najstarszy kurs
+            i = min(max(i - 1, 0), self.dates.size - 1)
+
+        if i == self.dates.size - 1:
+            value = self.latest_cross[a, b]
+        else:
+            value = self.per_eur[i, b] / self.per_eur[i, a]
+        return None if np.isnan(value) else float(value)
+
+    def rates_at(
+        self,
+        from_idx: npt.NDArray[np.int64],
+        to_idx: npt.NDArray[np.int64],
+        days: npt.NDArray[np.datetime64],
+    ) -> npt.NDArray[np.float64]:
+        """Vectorized `rate` for index/day arrays (same float ops, same results)."""
+        i = np.searchsorted(self.dates, days.astype("datetime64[D]"), side="right")
+        i = np.clip(i - 1, 0, self.dates.size - 1)
+        return self.per_eur[i, to_idx] / self.per_eur[i, from_idx]
+
+
+def q6_from_float(value: float) -> Decimal:
+    return q6(Decimal(repr(value)))
+
+
+_fx_rates: FxRates | None = None
+
+
+def fx_rates_signature(db: Session) -> tuple[int, datetime | None]:
+    count, last_loaded = db.execute(
+        select(func.count(), func.max(col(FxRate.loaded_at)))
+    ).one()
+    return count, last_loaded
+
+
+def reload_fx_rates(db: Session) -> bool:
+    """Rebuild the in-memory rates if the table changed; returns True on swap."""
+    global _fx_rates
+
+    signature = fx_rates_signature(db)
+    current = _fx_rates
+    if current is not None and current.signature == signature:
+        return False
+
+    rows = db.execute(
+        select(col(FxRate.currency), col(FxRate.rate_date), col(FxRate.rate))
+    ).all()
+    # jedno przypisanie -> czytelnicy widzą stary albo nowy komplet kursów
+    _fx_rates = FxRates.build([tuple(r) for r in rows], signature)
+    return True
+
+
+def get_fx_rates() -> FxRates | None:
+    return _fx_rates
+
+
 def normalize_currency(v: str) -> str:
     cur = (v or "").strip().upper()
     if len(cur) != 3:
@@ -36,9 +165,21 @@ def _get_rate_to_pln(cur: str) -> Decimal:
     return rate
 
 
-def fx_rate(from_cur: str, to_cur: str) -> Decimal:
+def fx_rate(from_cur: str, to_cur: str, on: date | None = None) -> Decimal:
+    """Units of `to_cur` per unit of `from_cur` on `on` (latest when None).
+
+    Served from the loaded ECB rates; currencies missing there fall back to
+    FX_TO_PLN.
+    """
     if from_cur == to_cur:
         return Decimal("1")
+
+    rates = _fx_rates
+    if rates is not None:
+        value = rates.rate(from_cur, to_cur, on)
+        if value is not None:
+            return q6_from_float(value)
+
     return _get_rate_to_pln(from_cur) / _get_rate_to_pln(to_cur)
 
 
@@ -47,12 +188,14 @@ def compute_amounts(
     amount: Decimal,
     input_currency: str,
     wallet_currency: str,
+    occurred_at: datetime | None = None,
 ) -> tuple[Decimal, str, Decimal | None, str | None, Decimal | None]:
     if input_currency == wallet_currency:
         amount_base = q2(amount)
         return amount_base, wallet_currency, None, None, None
 
-    rate = q2(fx_rate(input_currency, wallet_currency))
+    on = occurred_at.astimezone(timezone.utc).date() if occurred_at else None
+    rate = q6(fx_rate(input_currency, wallet_currency, on))
     amount_original = q2(amount)
     amount_base = q2(amount_original * rate)
     return amount_base, wallet_currency, amount_original, input_currency, rate
@@ -0,0 +1,225 @@
+"""`Idempotency-Key` support for write endpoints retried by clients.
+
+The first request with a key runs normally and its response is stored for
+IDEMPOTENCY_TTL_HOURS; a retry with the same key gets the stored response
+back (with `Idempotent-Replayed: true`) without running the handler again.
+Requests with the same key are serialized on a Postgres advisory lock held
+for the whole first execution, so a concurrent duplicate waits for it and
+then replays its response instead of racing it. Waiting requests poll the
+lock without keeping a pooled connection, so a retry burst cannot starve the
+first request of connections; after IDEMPOTENCY_WAIT_SECONDS they get 409.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import Header, HTTPException, Request, status
+from fastapi.responses import Response
+from pydantic import BaseModel
+from sqlalchemy import Connection, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from ..database import engine
+from ..logging_setup import setup_logger
+from ..models import IdempotencyKey
+from .serialization import MSGPACK_MEDIA_TYPE, accept_ctx, prefers_msgpack
+
+logger = setup_logger()
+
+IDEMPOTENCY_TTL_HOURS = int(os.getenv("IDEMPOTENCY_TTL_HOURS", "24"))
+# jak długo duplikat czeka na zakończenie pierwszego żądania
+IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "10"))
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+IdempotencyKeyHeader = Annotated[
+    str | None, Header(alias="Idempotency-Key", min_length=1, max_length=255)
+]
+
+
+def request_hash(request: Request, body: BaseModel | None = None) -> bytes:
+    """Fingerprint of method, path, query, body and response format.
+
+    A reused key must match it. The stored body is replayed byte for byte, so
+    the media type `NegotiatedResponse` will pick (JSON or MessagePack) is part
+    of the request: a retry asking for the other format is a different request.
+    """
+    media_type = (
+        MSGPACK_MEDIA_TYPE if prefers_msgpack(accept_ctx.get()) else "application/json"
+    )
+    digest = hashlib.sha256()
+    for part in (
+        request.method.encode(),
+        media_type.encode(),
+        request.url.path.encode(),
+        request.scope.get("query_string", b""),
+        body.model_dump_json().encode() if body is not None else b"",
+    ):
+        digest.update(part)
+        digest.update(b"\0")
+    return digest.digest()
+
+
+def _lock_id(user_id: UUID, key: str) -> int:
+    # 64-bitowy klucz pg_advisory_lock z (user_id, key)
+    digest = hashlib.blake2b(f"{user_id}:{key}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def _acquire_lock(lock_id: int, db: Session) -> Connection:
+    """Connection holding the session-level advisory lock `lock_id`.
+
+    `pg_try_advisory_lock` is polled with backoff and the connection goes back
+    to the pool between attempts, so only the holder keeps one checked out.
+    Before waiting, the request session (which has only read the current user
+    so far) releases its connection as well.
+    """
+    deadline = time.monotonic() + IDEMPOTENCY_WAIT_SECONDS
+    delay = 0.05
+    while True:
+        conn = engine.connect()
+        try:
+            locked = conn.execute(select(func.pg_try_advisory_lock(lock_id))).scalar()
+            conn.commit()
+        except Exception:
+            conn.close()
+            raise
+        if locked:
+            return conn
+        conn.close()
+        db.rollback()
+
+        if time.monotonic() >= deadline:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A request with this Idempotency-Key is still in progress",
+            )
+        time.sleep(delay)
+        delay = min(delay * 2, 0.5)
+
+
+class IdempotentCall:
+    """State of one keyed request: `replay` is set when a response is stored."""
+
+    def __init__(
+        self,
+        conn: Connection | None,
+        *,
+        user_id: UUID,
+        key: str | None,
+        request_hash: bytes,
+    ) -> None:
+        self.conn = conn
+        self.user_id = user_id
+        self.key = key
+        self.request_hash = request_hash
+        self.replay: Response | None = None
+
+    def load(self) -> None:
+        if self.conn is None:
+            return
+        table = IdempotencyKey.__table__
+        row = self.conn.execute(
+            select(table).where(
+                table.c.user_id == self.user_id,
+                table.c.key == self.key,
+                table.c.expires_at > datetime.now(timezone.utc),
+            )
+        ).first()
+        self.conn.commit()
+        if row is None:
+            return
+
+        if row.request_hash != self.request_hash:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used for a different request",
+            )
+        self.replay = Response(
+            content=row.body,
+            status_code=row.status_code,
+            media_type=row.media_type,
+            headers={REPLAYED_HEADER: "true", "Vary": "Accept"},
+        )
+        logger.info(
+            "idempotent request replayed",
+            extra={
+                "event_type": "idempotent_request_replayed",
+                "user_id": str(self.user_id),
+                "status": row.status_code,
+            },
+        )
+
+    def save(self, response: Response) -> Response:
+        """Store a successful response for retries; returns it unchanged."""
+        if self.conn is None:
+            return response
+
+        now = datetime.now(timezone.utc)
+        values = {
+            "user_id": self.user_id,
+            "key": self.key,
+            "request_hash": self.request_hash,
+            "status_code": response.status_code,
+            "media_type": response.media_type or "application/json",
+            "body": bytes(response.body),
+            "created_at": now,
+            "expires_at": now + timedelta(hours=IDEMPOTENCY_TTL_HOURS),
+        }
+        stmt = insert(IdempotencyKey.__table__).values(**values)
+        # wygasły wpis o tym samym kluczu jest nadpisywany
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "key"], set_=values
+        )
+        try:
+            _ = self.conn.execute(stmt)
+            self.conn.commit()
+        except Exception:
+            # zmiany są już zapisane, więc odpowiedź i tak wraca do klienta
+            self.conn.rollback()
+            logger.exception(
+                "idempotency key save failed",
+                extra={
+                    "event_type": "idempotency_key_save_failed",
+                    "user_id": str(self.user_id),
+                },
+            )
+        return response
+
+
+@contextmanager
+def idempotent(
+    request: Request,
+    *,
+    db: Session,
+    user_id: UUID,
+    key: str | None,
+    body: BaseModel | None = None,
+) -> Iterator[IdempotentCall]:
+    """Hold the (user, key) lock around a write; no-op when `key` is None."""
+    fingerprint = request_hash(request, body)
+    if key is None:
+        yield IdempotentCall(None, user_id=user_id, key=None, request_hash=fingerprint)
+        return
+
+    lock_id = _lock_id(user_id, key)
+    # osobne połączenie: blokada sesyjna przetrwa commit sesji handlera
+    with _acquire_lock(lock_id, db) as conn:
+        try:
+            call = IdempotentCall(
+                conn, user_id=user_id, key=key, request_hash=fingerprint
+            )
+            call.load()
+            yield call
+        finally:
+            conn.rollback()
+            _ = conn.execute(select(func.pg_advisory_unlock(lock_id)))
+            conn.commit()
@@ -92,3 +92,28 @@ def last_n_period_ranges_utc(
         cursor = pr.period_start_utc - timedelta(microseconds=1)
 
     return out
+
+
+def next_n_period_ranges_utc(
+    *,
+    billing_day: int,
+    timezone_name: str,
+    periods: int,
+    now_utc: datetime | None = None,
+) -> list[PeriodRangeUTC]:
+    """The current period followed by the next `periods - 1` ones."""
+    cursor = now_utc or datetime.now(timezone.utc)
+    out: list[PeriodRangeUTC] = []
+
+    for _ in range(periods):
+        pr = resolve_period_range_utc(
+            billing_day=billing_day,
+            timezone_name=timezone_name,
+            current_period=True,
+            now_utc=cursor,
+        )
+        out.append(pr)
+
+        cursor = pr.period_end_utc
+
+    return out
@@ -1,6 +1,8 @@
+from sqlalchemy import and_, exists
 from sqlalchemy.orm import Session
 from uuid import UUID
-from ..models import Transaction, RecurringTransaction
+from ..models import PeriodSnapshot, Transaction, RecurringTransaction
+from .snapshots import lock_wallet
 from sqlmodel import col
 
 
@@ -10,12 +12,27 @@ def unlink_product_references(
     wallet_id: UUID,
     product_id: UUID,
 ) -> None:
+    """Clear `product_id` on recurring items and open-period transactions.
 
+    Transactions inside closed periods keep the reference, so their frozen
+    snapshots still match the rows. The wallet row is locked first, like in
+    `ensure_period_open`, so a concurrent close cannot slip in between.
+    """
+    lock_wallet(db, wallet_id)
+
+    in_closed_period = exists().where(
+        and_(
+            col(PeriodSnapshot.wallet_id) == col(Transaction.wallet_id),
+            col(PeriodSnapshot.period_start) <= col(Transaction.occurred_at),
+            col(PeriodSnapshot.period_end) > col(Transaction.occurred_at),
+        )
+    )
     _ = (
         db.query(Transaction)
         .filter(
             col(Transaction.wallet_id) == wallet_id,
             col(Transaction.product_id) == product_id,
+            ~in_closed_period,
         )
         .update({col(Transaction.product_id): None}, synchronize_session=False)
     )
@@ -0,0 +1,276 @@
+"""Core `select()` read models for list and export endpoints.
+
+Rows come back as plain `Row` tuples with only the columns a response needs;
+category and product fields are joined in, so there is no ORM hydration,
+identity-map bookkeeping or relationship loading round-trip per request.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import Row, Select, select
+from sqlalchemy.sql.elements import ColumnElement
+from sqlmodel import col
+
+from ..models import Category, Product, Transaction, User, Wallet, WalletUser
+from .fieldsets import Fieldset, narrow_columns, needs_join
+
+TRANSACTION_COLUMNS = (
+    col(Transaction.id),
+    col(Transaction.wallet_id),
+    col(Transaction.user_id),
+    col(Transaction.refund_of_transaction_id),
+    col(Transaction.type),
+    col(Transaction.occurred_at),
+    col(Transaction.created_at),
+    col(Transaction.amount_base),
+    col(Transaction.currency_base),
+    col(Transaction.amount_original),
+    col(Transaction.currency_original),
+    col(Transaction.fx_rate),
+    col(Transaction.category_id),
+    col(Transaction.product_id),
+)
+
+CATEGORY_COLUMNS = (
+    col(Category.name).label("category_name"),
+    col(Category.color).label("category_color"),
+    col(Category.icon).label("category_icon"),
+    col(Category.created_at).label("category_created_at"),
+)
+
+PRODUCT_COLUMNS = (
+    col(Product.name).label("product_name"),
+    col(Product.importance).label("product_importance"),
+)
+
+# skalarne pola TransactionRead, w kolejności modelu
+TRANSACTION_FIELDS = (
+    "id",
+    "wallet_id",
+    "user_id",
+    "refund_of_transaction_id",
+    "type",
+    "occurred_at",
+    "created_at",
+    "amount_base",
+    "currency_base",
+    "amount_original",
+    "currency_original",
+    "fx_rate",
+)
+
+
+TRANSACTION_FIELDSET: Fieldset = {name: None for name in TRANSACTION_FIELDS} | {
+    "category": ("id", "name", "color", "icon", "created_at"),
+    "product": ("id", "name", "importance"),
+}
+
+TRANSACTION_PATH_COLUMNS: dict[str, ColumnElement[Any]] = {
+    **{name: col(getattr(Transaction, name)) for name in TRANSACTION_FIELDS},
+    "category.id": col(Transaction.category_id),
+    "product.id": col(Transaction.product_id),
+    **{c.name.replace("_", ".", 1): c for c in CATEGORY_COLUMNS + PRODUCT_COLUMNS},
+}
+
+
+CATEGORY_FIELDSET: Fieldset = {
+    "id": None,
+    "name": None,
+    "color": None,
+    "icon": None,
+    "created_at": None,
+}
+
+CATEGORY_SUM_FIELDSET: Fieldset = CATEGORY_FIELDSET | {"period_sum": None}
+
+CATEGORY_PATH_COLUMNS: dict[str, ColumnElement[Any]] = {
+    name: col(getattr(Category, name))
+    for name in ("id", "name", "color", "icon", "created_at")
+}
+
+PRODUCT_FIELDSET: Fieldset = {
+    "id": None,
+    "name": None,
+    "importance": None,
+    "created_at": None,
+    "category": ("id", "name", "color", "icon", "created_at"),
+}
+
+PRODUCT_SUM_FIELDSET: Fieldset = PRODUCT_FIELDSET | {"period_sum": None}
+
+PRODUCT_PATH_COLUMNS: dict[str, ColumnElement[Any]] = {
+    **{
+        name: col(getattr(Product, name))
+        for name in ("id", "name", "importance", "created_at")
+    },
+    "category.id": col(Product.category_id),
+    **{c.name.replace("_", ".", 1): c for c in CATEGORY_COLUMNS},
+}
+
+
+def transactions_select(
+    *, wallet_id: UUID, fieldset: Fieldset | None = None
+) -> Select[Any]:
+    """Live transactions of a wallet with their category and product fields.
+
+    With a `fieldset` only the requested columns are selected, and category /
+    product are only joined when more than their id is requested.
+    """
+    if fieldset is None:
+        columns = [*TRANSACTION_COLUMNS, *CATEGORY_COLUMNS, *PRODUCT_COLUMNS]
+    else:
+        columns = narrow_columns(fieldset, TRANSACTION_PATH_COLUMNS)
+
+    stmt = select(*columns).select_from(Transaction)
+    if needs_join(fieldset, "category"):
+        stmt = stmt.join(Category, col(Category.id) == col(Transaction.category_id))
+    if needs_join(fieldset, "product"):
+        stmt = stmt.outerjoin(Product, col(Product.id) == col(Transaction.product_id))
+    return stmt.where(
+        col(Transaction.wallet_id) == wallet_id,
+        col(Transaction.deleted_at).is_(None),
+    )
+
+
+def transaction_read_dict(row: Row[Any]) -> dict[str, Any]:
+    """Nest a flat `transactions_select` row into the TransactionRead shape."""
+    return {
+        "id": row.id,
+        "wallet_id": row.wallet_id,
+        "user_id": row.user_id,
+        "refund_of_transaction_id": row.refund_of_transaction_id,
+        "type": row.type,
+        "occurred_at": row.occurred_at,
+        "created_at": row.created_at,
+        "amount_base": row.amount_base,
+        "currency_base": row.currency_base,
+        "amount_original": row.amount_original,
+        "currency_original": row.currency_original,
+        "fx_rate": row.fx_rate,
+        "category": {
+            "id": row.category_id,
+            "name": row.category_name,
+            "color": row.category_color,
+            "icon": row.category_icon,
+            "created_at": row.category_created_at,
+        },
+        "product": (
+            {
+                "id": row.product_id,
+                "name": row.product_name,
+                "importance": row.product_importance,
+            }
+            if row.product_id is not None
+            else None
+        ),
+    }
+
+
+def transaction_read_dicts(rows: Iterable[Row[Any]]) -> list[dict[str, Any]]:
+    return [transaction_read_dict(row) for row in rows]
+
+
+def _lookup_column(
+    rows: Sequence[Row[Any]], name: str, subfields: tuple[str, ...]
+) -> tuple[list[int | None], list[dict[str, Any]]]:
+    # indeks do tabeli słownikowej per wiersz, każdy obiekt raz w tabeli
+    positions: dict[UUID, int] = {}
+    table: list[dict[str, Any]] = []
+    index: list[int | None] = []
+    for row in rows:
+        key = getattr(row, f"{name}_id")
+        if key is None:
+            index.append(None)
+            continue
+        pos = positions.get(key)
+        if pos is None:
+            pos = positions[key] = len(table)
+            table.append({s: getattr(row, f"{name}_{s}") for s in subfields})
+        index.append(pos)
+    return index, table
+
+
+def transaction_columns(
+    rows: Sequence[Row[Any]], fieldset: Fieldset | None = None
+) -> dict[str, Any]:
+    """Columnar TransactionRead list built straight from `transactions_select` rows.
+
+    Every scalar field becomes one array; `category` and `product` hold
+    indexes into the `categories` / `products` lookup tables, which list each
+    distinct entry once.
+    """
+    fieldset = fieldset or TRANSACTION_FIELDSET
+    columns: dict[str, list[Any]] = {}
+    lookups: dict[str, list[dict[str, Any]]] = {"category": [], "product": []}
+    for name, subfields in fieldset.items():
+        if subfields is None:
+            columns[name] = [getattr(row, name) for row in rows]
+        else:
+            columns[name], lookups[name] = _lookup_column(rows, name, subfields)
+
+    return {
+        "count": len(rows),
+        "columns": columns,
+        "categories": lookups["category"],
+        "products": lookups["product"],
+    }
+
+
+def wallets_select(*, user_id: UUID) -> Select[Any]:
+    """Wallets of a user with the user's role, in joining order (WalletRead rows)."""
+    return (
+        select(
+            col(Wallet.id),
+            col(Wallet.name),
+            col(Wallet.currency),
+            col(Wallet.created_at),
+            col(WalletUser.role),
+        )
+        .join(WalletUser, col(WalletUser.wallet_id) == col(Wallet.id))
+        .where(col(WalletUser.user_id) == user_id)
+        .order_by(col(WalletUser.created_at))
+    )
+
+
+def categories_select(*, wallet_id: UUID) -> Select[Any]:
+    """Live categories of a wallet (CategoryRead rows)."""
+    return (
+        select(*narrow_columns(CATEGORY_FIELDSET, CATEGORY_PATH_COLUMNS))
+        .where(
+            col(Category.wallet_id) == wallet_id,
+            col(Category.deleted_at).is_(None),
+        )
+        .order_by(col(Category.created_at))
+    )
+
+
+def products_select(*, wallet_id: UUID) -> Select[Any]:
+    """Live products of a wallet with their category, flat (nest with PRODUCT_FIELDSET)."""
+    return (
+        select(*narrow_columns(PRODUCT_FIELDSET, PRODUCT_PATH_COLUMNS))
+        .join(Category, col(Category.id) == col(Product.category_id))
+        .where(
+            col(Product.wallet_id) == wallet_id,
+            col(Product.deleted_at).is_(None),
+        )
+        .order_by(col(Product.created_at))
+    )
+
+
+def members_select(*, wallet_id: UUID) -> Select[Any]:
+    """Wallet members as (user_id, email, display_name, role) rows."""
+    return (
+        select(
+            col(WalletUser.user_id),
+            col(User.email),
+            col(User.display_name),
+            col(WalletUser.role),
+        )
+        .join(User, col(User.id) == col(WalletUser.user_id))
+        .where(col(WalletUser.wallet_id) == wallet_id)
+        .order_by(col(WalletUser.created_at))
+    )
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import date, datetime, time, timezone
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import numpy.typing as npt
+
+from ..domain.enums import RecurrenceRule
+
+# (jednostka kroku, mnożnik) -> reguły dzienne liczone w dniach, miesięczne w miesiącach
+RULE_STEPS: dict[RecurrenceRule, tuple[str, int]] = {
+    RecurrenceRule.BILLING_PERIOD: ("M", 1),
+    RecurrenceRule.DAILY: ("D", 1),
+    RecurrenceRule.WEEKLY: ("D", 7),
+    RecurrenceRule.MONTHLY: ("M", 1),
+    RecurrenceRule.QUARTERLY: ("M", 3),
+    RecurrenceRule.YEARLY: ("M", 12),
+}
+
+
+@dataclass(frozen=True)
+class RecurrenceSchedules:
+    """Schedules as parallel arrays, one entry per rule.
+
+    Occurrences are `anchor + k * step` for k >= 0, in days or in months. Month
+    steps keep the anchor's day of month, clamped to the month's last day.
+    `first` and `last` bound the expansion (inclusive local dates).
+    """
+
+    step: npt.NDArray[np.int64]
+    monthly: npt.NDArray[np.bool_]
+    anchor: npt.NDArray[np.datetime64]
+    first: npt.NDArray[np.datetime64]
+    last: npt.NDArray[np.datetime64]
+
+
+@dataclass(frozen=True)
+class Occurrences:
+    """Flat (schedule, day) pairs sorted by day, then schedule position."""
+
+    schedule_idx: npt.NDArray[np.int64]
+    day: npt.NDArray[np.datetime64]
+
+
+def build_schedules(
+    rules: Sequence[tuple[RecurrenceRule, int, date, date, date]],
+) -> RecurrenceSchedules:
+    """Pack (rule, interval, anchor, first, last) tuples into arrays."""
+    n = len(rules)
+    step = np.empty(n, dtype=np.int64)
+    monthly = np.empty(n, dtype=np.bool_)
+    for i, (rule, interval, _, _, _) in enumerate(rules):
+        unit, multiplier = RULE_STEPS[rule]
+        step[i] = max(interval, 1) * multiplier
+        monthly[i] = unit == "M"
+
+    return RecurrenceSchedules(
+        step=step,
+        monthly=monthly,
+        anchor=np.array([r[2] for r in rules], dtype="datetime64[D]"),
+        first=np.array([r[3] for r in rules], dtype="datetime64[D]"),
+        last=np.array([r[4] for r in rules], dtype="datetime64[D]"),
+    )
+
+
+def _repeat_ranges(
+    k_first: npt.NDArray[np.int64], counts: npt.NDArray[np.int64]
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    # [k_first[i], k_first[i] + counts[i]) dla każdego i, bez pętli po wierszach
+    idx = np.repeat(np.arange(counts.size), counts)
+    offsets = np.arange(idx.size) - np.repeat(np.cumsum(counts) - counts, counts)
+    return idx, k_first[idx] + offsets
+
+
+def _ceil_div(a: npt.NDArray[np.int64], b: npt.NDArray[np.int64]):
+    return -(-a // b)
+
+
+def _expand_days(
+    s: RecurrenceSchedules, rows: npt.NDArray[np.int64]
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.datetime64]]:
+    step = s.step[rows]
+    anchor = s.anchor[rows]
+    from_anchor_first = (s.first[rows] - anchor).astype(np.int64)
+    from_anchor_last = (s.last[rows] - anchor).astype(np.int64)
+
+    k_first = np.maximum(_ceil_div(from_anchor_first, step), 0)
+    k_last = from_anchor_last // step
+    counts = np.maximum(k_last - k_first + 1, 0)
+
+    idx, k = _repeat_ranges(k_first, counts)
+    days = anchor[idx] + (k * step[idx]).astype("timedelta64[D]")
+    return rows[idx], days
+
+
+def _expand_months(
+    s: RecurrenceSchedules, rows: npt.NDArray[np.int64]
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.datetime64]]:
+    step = s.step[rows]
+    anchor = s.anchor[rows]
+    first = s.first[rows]
+    last = s.last[rows]
+
+    anchor_month = anchor.astype("datetime64[M]")
+    day_offset = (anchor - anchor_month.astype("datetime64[D]")).astype(np.int64)
+    from_anchor_first = (first.astype("datetime64[M]") - anchor_month).astype(np.int64)
+    from_anchor_last = (last.astype("datetime64[M]") - anchor_month).astype(np.int64)
+
+    k_first = np.maximum(_ceil_div(from_anchor_first, step), 0)
+    k_last = from_anchor_last // step
+    counts = np.maximum(k_last - k_first + 1, 0)
+
+    idx, k = _repeat_ranges(k_first, counts)
+    month = anchor_month[idx] + (k * step[idx]).astype("timedelta64[M]")
+    month_start = month.astype("datetime64[D]")
+    month_len = ((month + 1).astype("datetime64[D]") - month_start).astype(np.int64)
+    days = month_start + np.minimum(day_offset[idx], month_len - 1).astype(
+        "timedelta64[D]"
+    )
+
+    # pierwszy/ostatni miesiąc może wypaść częściowo poza zakresem
+    keep = (days >= first[idx]) & (days <= last[idx])
+    return rows[idx][keep], days[keep]
+
+
+def expand_occurrences(s: RecurrenceSchedules) -> Occurrences:
+    rows = np.arange(s.step.size)
+    day_idx, day_days = _expand_days(s, rows[~s.monthly])
+    month_idx, month_days = _expand_months(s, rows[s.monthly])
+
+    schedule_idx = np.concatenate([day_idx, month_idx])
+    day = np.concatenate([day_days, month_days])
+    order = np.lexsort((schedule_idx, day))
+    return Occurrences(schedule_idx=schedule_idx[order], day=day[order])
+
+
+def local_midnights_utc(
+    days: npt.NDArray[np.datetime64], timezone_name: str
+) -> list[datetime]:
+    """Start of each local day in UTC; zone offsets are resolved once per distinct day."""
+    if days.size == 0:
+        return []
+
+    local_tz = ZoneInfo(timezone_name)
+    unique, inverse = np.unique(days, return_inverse=True)
+    starts = [
+        datetime.combine(d, time.min, tzinfo=local_tz).astimezone(timezone.utc)
+        for d in unique.astype(date)
+    ]
+    return [starts[i] for i in inverse.ravel()]
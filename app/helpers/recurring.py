@@ -1,11 +1,27 @@
-from datetime import datetime, timezone
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any
 from uuid import UUID
+from zoneinfo import ZoneInfo
 
 from fastapi import HTTPException, status
+from sqlalchemy import DateTime, Row, func, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PGUUID, insert
 from sqlalchemy.orm import Session
 from sqlmodel import col
 
-from ..models import RecurringTransaction
+from ..domain.enums import RecurrenceRule
+from ..models import Category, Product, RecurringTransaction, Transaction
+from .budgets import apply_budget_deltas
+from .periods import last_n_period_ranges_utc, resolve_period_range_utc
+from .read_models import CATEGORY_COLUMNS, PRODUCT_COLUMNS
+from .recurrence import (
+    Occurrences,
+    build_schedules,
+    expand_occurrences,
+    local_midnights_utc,
+)
+from .snapshots import closed_ranges, ensure_period_open, lock_wallet
+from .wallets import bump_wallet_version
 
 
 def normalize_currency(code: str) -> str:
@@ -55,3 +71,260 @@ def get_recurring_or_404(
 
 def utcnow() -> datetime:
     return datetime.now(timezone.utc)
+
+
+MAX_CATCH_UP_PERIODS = 24
+
+
+def local_day_start_utc(now_utc: datetime, timezone_name: str) -> datetime:
+    local_tz = ZoneInfo(timezone_name)
+    today = now_utc.astimezone(local_tz).date()
+    return datetime.combine(today, time.min, tzinfo=local_tz).astimezone(timezone.utc)
+
+
+def lock_due_recurring(
+    db: Session, *, wallet_id: UUID, due_before: datetime
+) -> list[RecurringTransaction]:
+    """Active items not applied since `due_before`, claimed with FOR UPDATE SKIP LOCKED."""
+    return (
+        db.query(RecurringTransaction)
+        .filter(
+            col(RecurringTransaction.wallet_id) == wallet_id,
+            col(RecurringTransaction.active).is_(True),
+            or_(
+                col(RecurringTransaction.last_applied_at).is_(None),
+                col(RecurringTransaction.last_applied_at) < due_before,
+            ),
+        )
+        .order_by(col(RecurringTransaction.id))
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+
+
+def expand_recurring(
+    items: list[RecurringTransaction],
+    *,
+    billing_day: int,
+    timezone_name: str,
+    window_start: date,
+    window_end: date,
+    skip_applied: bool = True,
+) -> Occurrences:
+    """Occurrences of `items` between `window_start` and `window_end` (local, inclusive).
+
+    An item never applied starts at its anchor (for billing-period items: the
+    period it was created in). With `skip_applied` an item applied before only
+    gets the occurrences after the day of its `last_applied_at`.
+    """
+    local_tz = ZoneInfo(timezone_name)
+    schedules: list[tuple[RecurrenceRule, int, date, date, date]] = []
+
+    for r in items:
+        created_local = r.created_at.astimezone(local_tz).date()
+        if r.rule == RecurrenceRule.BILLING_PERIOD:
+            anchor = date(2000, 1, billing_day)
+            lower = (
+                resolve_period_range_utc(
+                    billing_day=billing_day,
+                    timezone_name=timezone_name,
+                    current_period=True,
+                    now_utc=r.created_at,
+                )
+                .period_start_utc.astimezone(local_tz)
+                .date()
+            )
+        else:
+            anchor = r.anchor_date or created_local
+            lower = anchor
+
+        if skip_applied and r.last_applied_at is not None:
+            lower = r.last_applied_at.astimezone(local_tz).date() + timedelta(days=1)
+
+        schedules.append(
+            (r.rule, r.rule_interval, anchor, max(lower, window_start), window_end)
+        )
+
+    return expand_occurrences(build_schedules(schedules))
+
+
+def due_occurrences(
+    items: list[RecurringTransaction],
+    *,
+    billing_day: int,
+    timezone_name: str,
+    window_start: date,
+    today: date,
+) -> list[tuple[RecurringTransaction, datetime]]:
+    """Not yet applied occurrences up to `today`, dated at the start of their local day."""
+    occurrences = expand_recurring(
+        items,
+        billing_day=billing_day,
+        timezone_name=timezone_name,
+        window_start=window_start,
+        window_end=today,
+    )
+    starts = local_midnights_utc(occurrences.day, timezone_name)
+    return [(items[i], at) for i, at in zip(occurrences.schedule_idx.tolist(), starts)]
+
+
+def insert_recurring_occurrences(
+    db: Session,
+    *,
+    wallet_id: UUID,
+    user_id: UUID,
+    occurrences: list[tuple[UUID, datetime]],
+    now_utc: datetime,
+) -> list[Row[Any]]:
+    """Insert a transaction per (recurring_id, occurred_at) pair in one statement.
+
+    The items must already be locked by the caller. Their `last_applied_at` is
+    stamped with `now_utc` in the same statement. Returns the created
+    transactions joined with their category and product, ordered by
+    `occurred_at`; the caller commits.
+    """
+    if not occurrences:
+        return []
+
+    rt = RecurringTransaction.__table__
+    tx = Transaction.__table__
+
+    pairs = select(
+        func.unnest(
+            literal([rid for rid, _ in occurrences], ARRAY(PGUUID(as_uuid=True)))
+        ).label("recurring_id"),
+        func.unnest(
+            literal([at for _, at in occurrences], ARRAY(DateTime(timezone=True)))
+        ).label("occurred_at"),
+    ).cte("occurrences")
+
+    inserted = (
+        insert(tx)
+        .from_select(
+            [
+                "id",
+                "wallet_id",
+                "user_id",
+                "category_id",
+                "product_id",
+                "type",
+                "amount_base",
+                "currency_base",
+                "occurred_at",
+                "created_at",
+            ],
+            select(
+                func.gen_random_uuid(),
+                rt.c.wallet_id,
+                literal(user_id, tx.c.user_id.type),
+                rt.c.category_id,
+                rt.c.product_id,
+                literal("expense"),
+                rt.c.amount_base,
+                rt.c.currency_base,
+                pairs.c.occurred_at,
+                literal(now_utc, tx.c.created_at.type),
+            )
+            .join_from(pairs, rt, rt.c.id == pairs.c.recurring_id)
+            .where(rt.c.wallet_id == wallet_id),
+        )
+        .returning(*tx.c)
+        .cte("inserted")
+    )
+
+    stamped = (
+        update(rt)
+        .where(
+            rt.c.wallet_id == wallet_id,
+            rt.c.id.in_(select(pairs.c.recurring_id)),
+        )
+        .values(last_applied_at=now_utc, updated_at=now_utc)
+        .cte("stamped")
+    )
+
+    stmt = (
+        select(inserted, *CATEGORY_COLUMNS, *PRODUCT_COLUMNS)
+        .join(Category, col(Category.id) == inserted.c.category_id)
+        .outerjoin(Product, col(Product.id) == inserted.c.product_id)
+        .order_by(inserted.c.occurred_at, inserted.c.category_id, inserted.c.id)
+        .add_cte(stamped)
+    )
+    return list(db.execute(stmt).all())
+
+
+def apply_due_recurring(
+    db: Session,
+    *,
+    wallet_id: UUID,
+    user_id: UUID,
+    billing_day: int,
+    timezone_name: str,
+    now_utc: datetime,
+    catch_up: bool = False,
+) -> list[Row[Any]]:
+    """Create the due occurrences of a wallet's recurring items; the caller commits.
+
+    Without `catch_up` only the current billing period is filled and
+    billing-period items keep being dated `now_utc`. With `catch_up` up to
+    MAX_CATCH_UP_PERIODS periods are backfilled, every occurrence is dated to
+    its own day and occurrences inside closed periods are skipped.
+    """
+    local_tz = ZoneInfo(timezone_name)
+    today = now_utc.astimezone(local_tz).date()
+
+    periods = last_n_period_ranges_utc(
+        billing_day=billing_day,
+        timezone_name=timezone_name,
+        periods=MAX_CATCH_UP_PERIODS if catch_up else 1,
+        now_utc=now_utc,
+    )
+    window_start = periods[-1].period_start_utc.astimezone(local_tz).date()
+
+    # zastosowane dziś nie mogą mieć kolejnego wystąpienia przed jutrem
+    items = lock_due_recurring(
+        db,
+        wallet_id=wallet_id,
+        due_before=local_day_start_utc(now_utc, timezone_name),
+    )
+    occurrences = due_occurrences(
+        items,
+        billing_day=billing_day,
+        timezone_name=timezone_name,
+        window_start=window_start,
+        today=today,
+    )
+    if not occurrences:
+        return []
+
+    if catch_up:
+        # zamknięte okresy są zamrożone -> pomijamy je zamiast dopisywać wstecz
+        lock_wallet(db, wallet_id)
+        closed = closed_ranges(
+            db, wallet_id=wallet_id, since=periods[-1].period_start_utc
+        )
+        pairs = [
+            (r.id, at)
+            for r, at in occurrences
+            if not any(start <= at < end for start, end in closed)
+        ]
+    else:
+        ensure_period_open(db, wallet_id=wallet_id, at=now_utc)
+        pairs = [
+            (r.id, now_utc if r.rule == RecurrenceRule.BILLING_PERIOD else at)
+            for r, at in occurrences
+        ]
+
+    rows = insert_recurring_occurrences(
+        db,
+        wallet_id=wallet_id,
+        user_id=user_id,
+        occurrences=pairs,
+        now_utc=now_utc,
+    )
+    if rows:
+        apply_budget_deltas(
+            db,
+            [(r.wallet_id, r.category_id, r.occurred_at, r.amount_base) for r in rows],
+        )
+        bump_wallet_version(db, wallet_id)
+    return rows
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from collections.abc import Iterable, Iterator
+from contextvars import ContextVar
+from datetime import date
+from decimal import Decimal
+from functools import cache
+from typing import Any, TypeVar
+from uuid import UUID
+
+import msgpack
+import orjson
+from fastapi import HTTPException, Request, status
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, TypeAdapter
+
+M = TypeVar("M", bound=BaseModel)
+
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+# "string" (domyślnie) albo "scaled": Decimal jako [liczba całkowita, skala]
+MSGPACK_DECIMAL_SCALED = os.getenv("MSGPACK_DECIMAL", "string").lower() == "scaled"
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+NDJSON_MEDIA_TYPES = (NDJSON_MEDIA_TYPE, "application/jsonlines")
+# wiersze na partię kursora serwerowego i na jeden zapis do strumienia
+NDJSON_CHUNK_SIZE = 500
+
+# nagłówek Accept bieżącego żądania, ustawiany w middleware w main.py
+accept_ctx: ContextVar[str | None] = ContextVar("accept", default=None)
+
+
+def _orjson_default(value: Any) -> Any:
+    # Decimal jako string, tak jak serializuje go pydantic
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError
+
+
+RESPONSE_SHAPES = ("rows", "columnar")
+
+
+def ensure_response_shape(shape: str) -> None:
+    if shape not in RESPONSE_SHAPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="shape must be one of: rows, columnar",
+        )
+
+
+def orjson_dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_orjson_default, option=ORJSON_OPTIONS)
+
+
+def _msgpack_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        if MSGPACK_DECIMAL_SCALED:
+            exponent = int(value.as_tuple().exponent)
+            return [int(value.scaleb(-exponent)), -exponent]
+        return str(value)
+    if isinstance(value, UUID):
+        return value.bytes
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__} to msgpack")
+
+
+def msgpack_dumps(content: Any) -> bytes:
+    # aware datetime -> rozszerzenie Timestamp (-1), czyli sekundy od epoki
+    return msgpack.packb(
+        content, default=_msgpack_default, datetime=True, use_bin_type=True
+    )
+
+
+def prefers_media_type(accept: str | None, media_types: tuple[str, ...]) -> bool:
+    """True when Accept ranks one of `media_types` at least as high as JSON."""
+    if not accept or not any(m in accept for m in media_types):
+        return False
+
+    wanted_q = json_q = 0.0
+    for part in accept.split(","):
+        media_type, *params = [p.strip() for p in part.split(";")]
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        media_type = media_type.lower()
+        if media_type in media_types:
+            wanted_q = max(wanted_q, q)
+        elif media_type == "application/json":
+            json_q = max(json_q, q)
+    return wanted_q > 0 and wanted_q >= json_q
+
+
+def prefers_msgpack(accept: str | None) -> bool:
+    return prefers_media_type(accept, MSGPACK_MEDIA_TYPES)
+
+
+def prefers_ndjson(accept: str | None) -> bool:
+    return prefers_media_type(accept, NDJSON_MEDIA_TYPES)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered by orjson; UUID, datetime and Decimal are encoded natively."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson_dumps(content)
+
+
+class NegotiatedResponse(ORJSONResponse):
+    """JSON by default, MessagePack when the request's Accept header prefers it."""
+
+    def __init__(self, content: Any, *args: Any, **kwargs: Any) -> None:
+        super().__init__(content, *args, **kwargs)
+        self.headers.add_vary_header("Accept")
+
+    def render(self, content: Any) -> bytes:
+        if prefers_msgpack(accept_ctx.get()):
+            self.media_type = MSGPACK_MEDIA_TYPE
+            return msgpack_dumps(content)
+        return orjson_dumps(content)
+
+
+@cache
+def list_adapter(model: type[M]) -> TypeAdapter[list[M]]:
+    return TypeAdapter(list[model])
+
+
+def validate_list(model: type[M], rows: Iterable[Any]) -> list[M]:
+    """Validate ORM rows (or dicts) into `model` in one pydantic-core call."""
+    return list_adapter(model).validate_python(list(rows), from_attributes=True)
+
+
+def _plain(model: type[M], items: Any) -> Any:
+    if isinstance(items, list) and items and isinstance(items[0], BaseModel):
+        return list_adapter(model).dump_python(items)
+    return items
+
+
+def list_response(
+    model: type[M],
+    items: list[M] | list[dict[str, Any]] | dict[str, Any],
+    *,
+    status_code: int = 200,
+) -> NegotiatedResponse:
+    """Serialize already validated items, skipping FastAPI's response_model pass.
+
+    Plain content (sparse fieldsets, columnar shape) is encoded as is.
+    """
+    return NegotiatedResponse(_plain(model, items), status_code=status_code)
+
+
+def ndjson_response(
+    model: type[M], chunks: Iterable[list[M] | list[dict[str, Any]]]
+) -> StreamingResponse:
+    """Stream chunks of validated items (or plain dicts) as one JSON object per line.
+
+    `chunks` should be lazy (server-side cursor partitions), so memory stays
+    bounded by the chunk size and the first line goes out after the first chunk.
+    """
+
+    def lines() -> Iterator[bytes]:
+        for chunk in chunks:
+            yield b"".join(orjson_dumps(item) + b"\n" for item in _plain(model, chunk))
+
+    # wybór formatu zależy od Accept -> cache nie może mieszać wariantów
+    return StreamingResponse(
+        lines(), media_type=NDJSON_MEDIA_TYPE, headers={"Vary": "Accept"}
+    )
+
+
+def conditional_response(request: Request, response: Response) -> Response:
+    """Tag `response` with a weak ETag of its body; 304 when If-None-Match matches.
+
+    The body is still built, but unchanged payloads are not sent again.
+    """
+    etag = f'W/"{hashlib.blake2b(response.body, digest_size=16).hexdigest()}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "private, no-cache",
+        "Vary": response.headers.get("vary", "Accept"),
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+        if "*" in tags or etag.removeprefix("W/") in tags:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return response
+
+
+def model_response(item: BaseModel, *, status_code: int = 200) -> NegotiatedResponse:
+    """Serialize one validated model; values stay native for msgpack."""
+    return NegotiatedResponse(item.model_dump(), status_code=status_code)
@@ -0,0 +1,114 @@
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+from sqlmodel import col
+
+from ..models import PeriodSnapshot, Wallet
+from .periods import PeriodRangeUTC
+from .summary import build_categories_products_summary, build_importance_summary
+
+
+def lock_wallet(db: Session, wallet_id: UUID) -> None:
+    # ten sam poziom blokady co UPDATE wallets przy bump_wallet_version
+    _ = (
+        db.query(col(Wallet.id))
+        .filter(col(Wallet.id) == wallet_id)
+        .with_for_update(key_share=True)
+        .one()
+    )
+
+
+def get_snapshot(
+    db: Session, *, wallet_id: UUID, period: PeriodRangeUTC
+) -> PeriodSnapshot | None:
+    return (
+        db.query(PeriodSnapshot)
+        .filter(
+            col(PeriodSnapshot.wallet_id) == wallet_id,
+            col(PeriodSnapshot.period_start) == period.period_start_utc,
+            col(PeriodSnapshot.period_end) == period.period_end_utc,
+        )
+        .first()
+    )
+
+
+def fill_snapshot(db: Session, snapshot: PeriodSnapshot, *, currency: str) -> None:
+    """(Re)compute the frozen summaries of `snapshot` from raw transactions."""
+    categories_products = build_categories_products_summary(
+        db,
+        wallet_id=snapshot.wallet_id,
+        currency=currency,
+        period_start_utc=snapshot.period_start,
+        period_end_utc=snapshot.period_end,
+    )
+    by_importance = build_importance_summary(
+        db,
+        wallet_id=snapshot.wallet_id,
+        currency=currency,
+        period_start_utc=snapshot.period_start,
+        period_end_utc=snapshot.period_end,
+    )
+
+    snapshot.total = categories_products.total
+    snapshot.categories_products = categories_products.model_dump(mode="json")
+    snapshot.by_importance = by_importance.model_dump(mode="json")
+
+
+def snapshots_for_ranges(
+    db: Session, *, wallet_id: UUID, periods: list[PeriodRangeUTC]
+) -> dict[tuple[datetime, datetime], PeriodSnapshot]:
+    if not periods:
+        return {}
+
+    keys = [(p.period_start_utc, p.period_end_utc) for p in periods]
+    rows = (
+        db.query(PeriodSnapshot)
+        .filter(
+            col(PeriodSnapshot.wallet_id) == wallet_id,
+            tuple_(
+                col(PeriodSnapshot.period_start), col(PeriodSnapshot.period_end)
+            ).in_(keys),
+        )
+        .all()
+    )
+    return {(s.period_start, s.period_end): s for s in rows}
+
+
+def closed_ranges(
+    db: Session, *, wallet_id: UUID, since: datetime
+) -> list[tuple[datetime, datetime]]:
+    rows = (
+        db.query(col(PeriodSnapshot.period_start), col(PeriodSnapshot.period_end))
+        .filter(
+            col(PeriodSnapshot.wallet_id) == wallet_id,
+            col(PeriodSnapshot.period_end) > since,
+        )
+        .all()
+    )
+    return [(start, end) for start, end in rows]
+
+
+def ensure_period_open(db: Session, *, wallet_id: UUID, at: datetime) -> None:
+    """Reject writes dated inside a closed period.
+
+    Locks the wallet row first so the check cannot race with a concurrent close.
+    """
+    lock_wallet(db, wallet_id)
+
+    closed = (
+        db.query(col(PeriodSnapshot.id))
+        .filter(
+            col(PeriodSnapshot.wallet_id) == wallet_id,
+            col(PeriodSnapshot.period_start) <= at,
+            col(PeriodSnapshot.period_end) > at,
+        )
+        .first()
+    )
+    if closed is not None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Period is closed",
+        )
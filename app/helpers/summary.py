@@ -6,18 +6,36 @@ from uuid import UUID
 from collections import defaultdict
 from decimal import Decimal
 
+from fastapi import HTTPException, status
+from sqlalchemy import and_, case, func, or_, select
 from sqlalchemy.orm import Session
 from sqlmodel import col
 
-from ..models import Transaction
+from ..domain.enums import ProductImportance
+from ..models import Category, Product, Transaction
 from ..models import User
-from ..helpers.periods import resolve_period_range_utc
+from ..helpers.fx import q2
+from ..helpers.periods import (
+    PeriodRangeUTC,
+    last_n_period_ranges_utc,
+    resolve_period_range_utc,
+)
 from ..helpers.users import require_user_settings
+from ..schemas.aggregation import (
+    CategoriesProductsSummaryRead,
+    CategoriesWithProductsSummaryRead,
+    ImportanceSummaryRead,
+    ProductWithSumRead,
+)
+from ..schemas.category import CategoryRead
+from ..schemas.transaction import ProductInTransactionRead
 
 
-from typing import TypeAlias
+from typing import TypeAlias, cast
 from collections.abc import Iterable
 
+ZERO = Decimal("0")
+
 AggRow: TypeAlias = tuple[UUID, UUID | None, Decimal]
 
 SumsResult: TypeAlias = tuple[
@@ -51,6 +69,44 @@ def resolve_user_period_range(
     )
 
 
+def resolve_user_comparison_ranges(
+    *,
+    user: User,
+    current_period: bool,
+    from_date: date | None,
+    to_date: date | None,
+) -> tuple[PeriodRangeUTC, PeriodRangeUTC]:
+    settings = require_user_settings(user)
+
+    if current_period:
+        current, previous = last_n_period_ranges_utc(
+            billing_day=settings.billing_day,
+            timezone_name=settings.timezone,
+            periods=2,
+        )
+        return current, previous
+
+    if from_date is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="from_date is required when comparing a custom range",
+        )
+
+    current = resolve_period_range_utc(
+        billing_day=settings.billing_day,
+        timezone_name=settings.timezone,
+        current_period=False,
+        from_date=from_date,
+        to_date=to_date,
+    )
+    length = current.period_end_utc - current.period_start_utc
+    previous = PeriodRangeUTC(
+        period_start_utc=current.period_start_utc - length,
+        period_end_utc=current.period_start_utc,
+    )
+    return current, previous
+
+
 def expense_transactions_in_period_q(
     db: Session,
     *,
@@ -94,3 +150,312 @@ def build_category_product_sums(agg_rows: Iterable[AggRow]) -> SumsResult:
         used_product_ids,
         total,
     )
+
+
+def period_sum_columns(current: PeriodRangeUTC, previous: PeriodRangeUTC):
+    amount = col(Transaction.amount_base)
+    occurred_at = col(Transaction.occurred_at)
+
+    current_sum = func.coalesce(
+        func.sum(amount).filter(
+            and_(
+                occurred_at >= current.period_start_utc,
+                occurred_at < current.period_end_utc,
+            )
+        ),
+        _zero(),
+    )
+    previous_sum = func.coalesce(
+        func.sum(amount).filter(
+            and_(
+                occurred_at >= previous.period_start_utc,
+                occurred_at < previous.period_end_utc,
+            )
+        ),
+        _zero(),
+    )
+    return current_sum.label("current_sum"), previous_sum.label("previous_sum")
+
+
+def pct_change(current: Decimal, previous: Decimal) -> Decimal | None:
+    if previous == 0:
+        return None
+    return q2((current - previous) / abs(previous) * 100)
+
+
+def ranked_period_sums_sq(
+    *,
+    key,
+    wallet_id: UUID,
+    current: PeriodRangeUTC,
+    previous: PeriodRangeUTC | None = None,
+    importance: ProductImportance | None = None,
+):
+    """Expense sums per `key` with rank, total and (optionally) previous-period rank.
+
+    All window functions run over the grouped sums, so the caller can join the
+    result, filter `current_sum > 0` and apply `ORDER BY ... LIMIT` in one statement.
+    """
+    amount = col(Transaction.amount_base)
+    occurred_at = col(Transaction.occurred_at)
+
+    if previous is None:
+        sum_cols = [func.sum(amount).label("current_sum")]
+        range_start = current.period_start_utc
+    else:
+        sum_cols = list(period_sum_columns(current, previous))
+        range_start = previous.period_start_utc
+
+    sums_q = (
+        select(key.label("key_id"), *sum_cols)
+        .where(
+            col(Transaction.wallet_id) == wallet_id,
+            col(Transaction.deleted_at).is_(None),
+            col(Transaction.type) == "expense",
+            key.isnot(None),
+            occurred_at >= range_start,
+            occurred_at < current.period_end_utc,
+        )
+        .group_by(key)
+    )
+    if importance is not None:
+        sums_q = sums_q.join(
+            Product, col(Product.id) == col(Transaction.product_id)
+        ).where(col(Product.importance) == importance)
+
+    sums = sums_q.cte("period_sums")
+
+    ranked_cols = [
+        sums.c.key_id,
+        sums.c.current_sum,
+        func.rank().over(order_by=sums.c.current_sum.desc()).label("rank"),
+        func.sum(sums.c.current_sum).over().label("total"),
+    ]
+    if previous is not None:
+        has_previous = sums.c.previous_sum > 0
+        ranked_cols.append(
+            case(
+                (
+                    has_previous,
+                    func.rank().over(
+                        partition_by=has_previous,
+                        order_by=sums.c.previous_sum.desc(),
+                    ),
+                ),
+                else_=None,
+            ).label("previous_rank")
+        )
+
+    return select(*ranked_cols).subquery("ranked")
+
+
+def share_of_total(value: Decimal, total: Decimal) -> Decimal | None:
+    if total <= 0:
+        return None
+    return q2(value / total * 100)
+
+
+def build_categories_products_summary(
+    db: Session,
+    *,
+    wallet_id: UUID,
+    currency: str,
+    period_start_utc: datetime,
+    period_end_utc: datetime,
+    include_empty: bool = False,
+) -> CategoriesProductsSummaryRead:
+    base_q = expense_transactions_in_period_q(
+        db,
+        wallet_id=wallet_id,
+        period_start_utc=period_start_utc,
+        period_end_utc=period_end_utc,
+    )
+
+    agg_rows_raw = (
+        base_q.with_entities(
+            col(Transaction.category_id),
+            col(Transaction.product_id),
+            func.coalesce(func.sum(col(Transaction.amount_base)), ZERO).label(
+                "sum_amount"
+            ),
+        )
+        .group_by(col(Transaction.category_id), col(Transaction.product_id))
+        .all()
+    )
+
+    agg_rows = cast(list[tuple[UUID, UUID | None, Decimal]], agg_rows_raw)
+
+    (
+        category_sum,
+        no_product_sum,
+        product_sum,
+        used_category_ids,
+        used_product_ids,
+        total,
+    ) = build_category_product_sums(agg_rows)
+
+    used_category_ids_list = list(used_category_ids)
+    used_product_ids_list = list(used_product_ids)
+
+    if include_empty:
+        cat_q = db.query(Category).filter(col(Category.wallet_id) == wallet_id)
+        if used_category_ids_list:
+            cat_q = cat_q.filter(
+                or_(
+                    col(Category.deleted_at).is_(None),
+                    col(Category.id).in_(used_category_ids_list),
+                )
+            )
+        else:
+            cat_q = cat_q.filter(col(Category.deleted_at).is_(None))
+
+        categories = cat_q.order_by(col(Category.created_at)).all()
+
+        prod_q = db.query(Product).filter(col(Product.wallet_id) == wallet_id)
+        if used_product_ids_list:
+            prod_q = prod_q.filter(
+                or_(
+                    col(Product.deleted_at).is_(None),
+                    col(Product.id).in_(used_product_ids_list),
+                )
+            )
+        else:
+            prod_q = prod_q.filter(col(Product.deleted_at).is_(None))
+
+        products = prod_q.order_by(col(Product.created_at)).all()
+
+    else:
+        if not used_category_ids_list:
+            return CategoriesProductsSummaryRead(
+                currency=currency,
+                period_start=period_start_utc,
+                period_end=period_end_utc,
+                total=ZERO,
+                categories=[],
+            )
+
+        categories = (
+            db.query(Category)
+            .filter(
+                col(Category.wallet_id) == wallet_id,
+                col(Category.id).in_(used_category_ids_list),
+            )
+            .order_by(col(Category.created_at))
+            .all()
+        )
+
+        if used_product_ids_list:
+            products = (
+                db.query(Product)
+                .filter(
+                    col(Product.wallet_id) == wallet_id,
+                    col(Product.id).in_(used_product_ids_list),
+                )
+                .order_by(col(Product.created_at))
+                .all()
+            )
+        else:
+            products = []
+
+    products_by_category: defaultdict[UUID, list[Product]] = defaultdict(list)
+    for p in products:
+        products_by_category[p.category_id].append(p)
+
+    category_items: list[CategoriesWithProductsSummaryRead] = []
+
+    for c in categories:
+        prod_items: list[ProductWithSumRead] = []
+
+        for p in sorted(products_by_category.get(c.id, []), key=lambda x: x.created_at):
+            key = (c.id, p.id)
+            if not include_empty and key not in product_sum:
+                continue
+
+            ps = product_sum.get(key, ZERO)
+
+            prod_items.append(
+                ProductWithSumRead(
+                    product=ProductInTransactionRead(
+                        id=p.id,
+                        name=p.name,
+                        importance=p.importance,
+                    ),
+                    product_sum=ps,
+                )
+            )
+
+        category_items.append(
+            CategoriesWithProductsSummaryRead(
+                category=CategoryRead.model_validate(c),
+                category_sum=category_sum.get(c.id, ZERO),
+                no_product_sum=no_product_sum.get(c.id, ZERO),
+                products=prod_items,
+            )
+        )
+
+    return CategoriesProductsSummaryRead(
+        currency=currency,
+        period_start=period_start_utc,
+        period_end=period_end_utc,
+        total=total,
+        categories=category_items,
+    )
+
+
+def build_importance_summary(
+    db: Session,
+    *,
+    wallet_id: UUID,
+    currency: str,
+    period_start_utc: datetime,
+    period_end_utc: datetime,
+) -> ImportanceSummaryRead:
+    base_q = expense_transactions_in_period_q(
+        db,
+        wallet_id=wallet_id,
+        period_start_utc=period_start_utc,
+        period_end_utc=period_end_utc,
+    )
+
+    rows_raw = (
+        base_q.outerjoin(Product, col(Transaction.product_id) == col(Product.id))
+        .with_entities(
+            col(Product.importance),
+            func.coalesce(func.sum(col(Transaction.amount_base)), ZERO).label(
+                "sum_amount"
+            ),
+        )
+        .group_by(col(Product.importance))
+        .all()
+    )
+
+    rows = cast(list[tuple[ProductImportance | None, Decimal]], rows_raw)
+
+    necessary = ZERO
+    important = ZERO
+    unnecessary = ZERO
+    unassigned = ZERO
+
+    for importance, sum_amount in rows:
+        match importance:
+            case None:
+                unassigned += sum_amount
+            case ProductImportance.IMPORTANT:
+                important += sum_amount
+            case ProductImportance.NECESSARY:
+                necessary += sum_amount
+            case ProductImportance.UNNECESSARY:
+                unnecessary += sum_amount
+
+    total = necessary + important + unnecessary + unassigned
+
+    return ImportanceSummaryRead(
+        currency=currency,
+        period_start=period_start_utc,
+        period_end=period_end_utc,
+        total=total,
+        necessary=necessary,
+        important=important,
+        unnecessary=unnecessary,
+        unassigned=unassigned,
+    )
@@ -1,6 +1,10 @@
+from collections.abc import Collection
+from datetime import datetime
+from typing import Any
 from uuid import UUID
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import Row, exists, func, insert, literal, select, update
+from sqlalchemy.orm import Session, aliased, selectinload
 from sqlmodel import col
 
 from ..models import Transaction
@@ -58,3 +62,144 @@ def base_transactions_q(db: Session, *, wallet_id: UUID):
             col(Transaction.deleted_at).is_(None),
         )
     )
+
+
+def _has_refunds():
+    refund = aliased(Transaction)
+    return exists().where(col(refund.refund_of_transaction_id) == col(Transaction.id))
+
+
+def lock_transaction_states(
+    db: Session, *, wallet_id: UUID, transaction_ids: Collection[UUID]
+) -> dict[UUID, Row[Any]]:
+    """Lock the live transactions among `transaction_ids` (FOR UPDATE).
+
+    Rows carry `refund_of_transaction_id`, `occurred_at` and a `has_refunds`
+    flag (any refund, also a deleted one, like `tx.refunds`).
+    """
+    rows = db.execute(
+        select(
+            col(Transaction.id),
+            col(Transaction.refund_of_transaction_id),
+            col(Transaction.occurred_at),
+            _has_refunds().label("has_refunds"),
+        )
+        .where(
+            col(Transaction.wallet_id) == wallet_id,
+            col(Transaction.id).in_(transaction_ids),
+            col(Transaction.deleted_at).is_(None),
+        )
+        .with_for_update(of=Transaction)
+    ).all()
+    return {row.id: row for row in rows}
+
+
+def soft_delete_transactions(
+    db: Session,
+    *,
+    wallet_id: UUID,
+    transaction_ids: Collection[UUID],
+    now_utc: datetime,
+) -> list[Row[Any]]:
+    """Soft delete live, unrefunded transactions in one UPDATE; the caller commits.
+
+    Returns (id, wallet_id, category_id, occurred_at, amount_base) of the
+    deleted rows.
+    """
+    if not transaction_ids:
+        return []
+
+    stmt = (
+        update(Transaction)
+        .where(
+            col(Transaction.wallet_id) == wallet_id,
+            col(Transaction.id).in_(transaction_ids),
+            col(Transaction.deleted_at).is_(None),
+            ~_has_refunds(),
+        )
+        .values(deleted_at=now_utc)
+        .returning(
+            col(Transaction.id),
+            col(Transaction.wallet_id),
+            col(Transaction.category_id),
+            col(Transaction.occurred_at),
+            col(Transaction.amount_base),
+        )
+        .execution_options(synchronize_session="fetch")
+    )
+    return list(db.execute(stmt).all())
+
+
+def insert_refunds(
+    db: Session,
+    *,
+    wallet_id: UUID,
+    user_id: UUID,
+    transaction_ids: Collection[UUID],
+    now_utc: datetime,
+) -> list[Row[Any]]:
+    """Insert refunds of refundable transactions in one INSERT ... SELECT.
+
+    Each refund negates the amounts of its original, keeps its category,
+    product, type and FX rate and is dated `now_utc`. Returns
+    (id, wallet_id, category_id, occurred_at, amount_base,
+    refund_of_transaction_id) of the created rows; the caller commits.
+    """
+    if not transaction_ids:
+        return []
+
+    tx = Transaction.__table__
+    refund = tx.alias("refund")
+
+    stmt = (
+        insert(tx)
+        .from_select(
+            [
+                "id",
+                "wallet_id",
+                "user_id",
+                "category_id",
+                "product_id",
+                "type",
+                "amount_base",
+                "currency_base",
+                "amount_original",
+                "currency_original",
+                "fx_rate",
+                "occurred_at",
+                "created_at",
+                "refund_of_transaction_id",
+            ],
+            select(
+                func.gen_random_uuid(),
+                tx.c.wallet_id,
+                literal(user_id, tx.c.user_id.type),
+                tx.c.category_id,
+                tx.c.product_id,
+                tx.c.type,
+                -tx.c.amount_base,
+                tx.c.currency_base,
+                -tx.c.amount_original,
+                tx.c.currency_original,
+                tx.c.fx_rate,
+                literal(now_utc, tx.c.occurred_at.type),
+                literal(now_utc, tx.c.created_at.type),
+                tx.c.id,
+            ).where(
+                tx.c.wallet_id == wallet_id,
+                tx.c.id.in_(transaction_ids),
+                tx.c.deleted_at.is_(None),
+                tx.c.refund_of_transaction_id.is_(None),
+                ~exists().where(refund.c.refund_of_transaction_id == tx.c.id),
+            ),
+        )
+        .returning(
+            tx.c.id,
+            tx.c.wallet_id,
+            tx.c.category_id,
+            tx.c.occurred_at,
+            tx.c.amount_base,
+            tx.c.refund_of_transaction_id,
+        )
+    )
+    return list(db.execute(stmt).all())
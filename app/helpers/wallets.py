@@ -1,7 +1,9 @@
+from collections.abc import Collection
 from uuid import UUID
 from fastapi import HTTPException
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
-from ..models import WalletUser, User
+from ..models import Wallet, WalletUser, User
 from sqlmodel import col
 
 
@@ -31,3 +33,47 @@ def ensure_wallet_owner(db: Session, wallet_id: UUID, current_user: User) -> Wal
         )
 
     return membership
+
+
+def bump_wallet_version(db: Session, wallet_id: UUID) -> None:
+    _ = (
+        db.query(Wallet)
+        .filter(col(Wallet.id) == wallet_id)
+        .update(
+            {col(Wallet.version): col(Wallet.version) + 1}, synchronize_session=False
+        )
+    )
+
+
+def bump_recurring_version(db: Session, wallet_id: UUID) -> None:
+    """Bump both the wallet version and the recurring-set version."""
+    _ = (
+        db.query(Wallet)
+        .filter(col(Wallet.id) == wallet_id)
+        .update(
+            {
+                col(Wallet.version): col(Wallet.version) + 1,
+                col(Wallet.recurring_version): col(Wallet.recurring_version) + 1,
+            },
+            synchronize_session=False,
+        )
+    )
+
+
+def bump_wallet_versions(db: Session, wallet_ids: Collection[UUID]) -> None:
+    if not wallet_ids:
+        return
+
+    # blokady wierszy w kolejności id, żeby równoległe batche się nie zakleszczyły
+    locked = (
+        select(col(Wallet.id))
+        .where(col(Wallet.id).in_(list(wallet_ids)))
+        .order_by(col(Wallet.id))
+        .with_for_update(key_share=True)
+        .scalar_subquery()
+    )
+    _ = db.execute(
+        update(Wallet)
+        .where(col(Wallet.id).in_(locked))
+        .values(version=col(Wallet.version) + 1)
+    )
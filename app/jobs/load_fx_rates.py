@@ -0,0 +1,112 @@
+"""Load daily FX rates from an ECB-style CSV file into fx_rates.
+
+The file has a `Date` column followed by one column per currency with the
+number of units per 1 EUR, e.g. the ECB `eurofxref-hist.csv`:
+
+    python -m app.jobs.load_fx_rates eurofxref-hist.csv
+
+Missing quotes (`N/A` or empty cells) are skipped; existing rows are updated.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+from collections.abc import Iterator
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from ..database import SessionLocal
+from ..helpers.fx import reload_fx_rates
+from ..logging_setup import setup_logger
+from ..models import FxRate
+
+logger = setup_logger()
+
+CHUNK_SIZE = 5000
+
+
+def read_ecb_csv(path: Path) -> Iterator[tuple[str, date, Decimal]]:
+    with path.open(newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        currencies = [h.strip().upper() for h in header[1:]]
+
+        for row in reader:
+            if not row or not row[0].strip():
+                continue
+            rate_date = date.fromisoformat(row[0].strip())
+            for currency, raw in zip(currencies, row[1:]):
+                raw = raw.strip()
+                if len(currency) != 3 or not raw or raw == "N/A":
+                    continue
+                try:
+                    rate = Decimal(raw)
+                except InvalidOperation:
+                    continue
+                if rate > 0:
+                    yield currency, rate_date, rate
+
+
+def upsert_fx_rates(db: Session, rows: Iterator[tuple[str, date, Decimal]]) -> int:
+    table = FxRate.__table__
+    loaded = 0
+    chunk: list[dict[str, object]] = []
+
+    def flush() -> None:
+        stmt = insert(table).values(chunk)
+        _ = db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[table.c.currency, table.c.rate_date],
+                set_={"rate": stmt.excluded.rate, "loaded_at": func.now()},
+                where=table.c.rate != stmt.excluded.rate,
+            )
+        )
+
+    for currency, rate_date, rate in rows:
+        chunk.append(
+            {
+                "currency": currency,
+                "rate_date": rate_date,
+                "rate": rate,
+                "loaded_at": func.now(),
+            }
+        )
+        if len(chunk) >= CHUNK_SIZE:
+            flush()
+            loaded += len(chunk)
+            chunk = []
+
+    if chunk:
+        flush()
+        loaded += len(chunk)
+
+    return loaded
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    _ = parser.add_argument("path", type=Path)
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        loaded = upsert_fx_rates(db, read_ecb_csv(args.path))
+        db.commit()
+        _ = reload_fx_rates(db)
+
+    logger.info(
+        "fx rates loaded",
+        extra={
+            "event_type": "fx_rates_loaded",
+            "data": {"rows": loaded, "path": str(args.path)},
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Delete expired idempotency keys.
+
+Run periodically, e.g. from cron:
+
+    python -m app.jobs.purge_idempotency_keys
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+from sqlmodel import col
+
+from ..database import SessionLocal
+from ..logging_setup import setup_logger
+from ..models import IdempotencyKey
+
+logger = setup_logger()
+
+
+def purge_idempotency_keys(db: Session, *, now_utc: datetime | None = None) -> int:
+    now_utc = now_utc or datetime.now(timezone.utc)
+    result = db.execute(
+        delete(IdempotencyKey).where(col(IdempotencyKey.expires_at) <= now_utc)
+    )
+    return result.rowcount
+
+
+def main() -> None:
+    with SessionLocal() as db:
+        purged = purge_idempotency_keys(db)
+        db.commit()
+
+    logger.info(
+        "idempotency keys purged",
+        extra={
+            "event_type": "idempotency_keys_purged",
+            "data": {"rows_deleted": purged},
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Recompute budget spend counters from raw transactions.
+
+Run periodically, e.g. from cron:
+
+    python -m app.jobs.reconcile_budgets
+"""
+
+from __future__ import annotations
+
+from decimal import Decimal
+from uuid import UUID
+
+from sqlalchemy import and_, func, select, update
+from sqlalchemy.orm import Session
+from sqlmodel import col
+
+from ..database import SessionLocal
+from ..logging_setup import setup_logger
+from ..models import CategoryBudget, CategoryBudgetSpend, Transaction, Wallet
+
+logger = setup_logger()
+
+
+def lock_budget_wallets(db: Session, *, wallet_id: UUID | None = None) -> None:
+    """Lock wallets with budgets the way transaction writes do, in id order.
+
+    Every write that bumps a spend counter holds its wallet row lock until
+    commit, so once these locks are taken the SUM in `reconcile_budgets` sees all committed
+    deltas and no concurrent bump can land between the SUM and the UPDATE.
+    """
+    wallets = (
+        select(col(Wallet.id))
+        .where(col(Wallet.id).in_(select(col(CategoryBudget.wallet_id)).distinct()))
+        .order_by(col(Wallet.id))
+        .with_for_update(key_share=True)
+    )
+    if wallet_id is not None:
+        wallets = wallets.where(col(Wallet.id) == wallet_id)
+    _ = db.execute(wallets).all()
+
+
+def reconcile_budgets(db: Session, *, wallet_id: UUID | None = None) -> int:
+    spend = CategoryBudgetSpend.__table__
+    # osobne zapytanie: w READ COMMITTED UPDATE dostaje snapshot po blokadach
+    lock_budget_wallets(db, wallet_id=wallet_id)
+
+    actual_q = (
+        select(
+            spend.c.budget_id,
+            spend.c.period_start,
+            func.coalesce(func.sum(col(Transaction.amount_base)), Decimal("0")).label(
+                "actual"
+            ),
+        )
+        .select_from(spend)
+        .join(CategoryBudget, col(CategoryBudget.id) == spend.c.budget_id)
+        .outerjoin(
+            Transaction,
+            and_(
+                col(Transaction.wallet_id) == col(CategoryBudget.wallet_id),
+                col(Transaction.category_id) == col(CategoryBudget.category_id),
+                col(Transaction.deleted_at).is_(None),
+                col(Transaction.type) == "expense",
+                col(Transaction.occurred_at) >= spend.c.period_start,
+                col(Transaction.occurred_at) < spend.c.period_end,
+            ),
+        )
+        .group_by(spend.c.budget_id, spend.c.period_start)
+    )
+    if wallet_id is not None:
+        actual_q = actual_q.where(col(CategoryBudget.wallet_id) == wallet_id)
+
+    actual = actual_q.subquery()
+
+    stmt = (
+        update(spend)
+        .where(
+            spend.c.budget_id == actual.c.budget_id,
+            spend.c.period_start == actual.c.period_start,
+            spend.c.spent != actual.c.actual,
+        )
+        .values(spent=actual.c.actual, updated_at=func.now())
+        .returning(spend.c.budget_id)
+    )
+    return len(db.execute(stmt).all())
+
+
+def main() -> None:
+    fixed = 0
+    with SessionLocal() as db:
+        wallet_ids = (
+            db.execute(
+                select(col(CategoryBudget.wallet_id))
+                .distinct()
+                .order_by(col(CategoryBudget.wallet_id))
+            )
+            .scalars()
+            .all()
+        )
+        # portfel po portfelu, żeby nie blokować zapisów na czas całego joba
+        for wallet_id in wallet_ids:
+            fixed += reconcile_budgets(db, wallet_id=wallet_id)
+            db.commit()
+
+    logger.info(
+        "budget spend reconciled",
+        extra={
+            "event_type": "budget_spend_reconciled",
+            "data": {"rows_fixed": fixed},
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
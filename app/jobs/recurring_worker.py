@@ -0,0 +1,331 @@
+"""Apply due recurring transactions across all wallets.
+
+Each billing period is taken from the wallet owner's settings and the
+transactions are created on behalf of the owner. Run as a standalone worker:
+
+    python -m app.jobs.recurring_worker            # loop every 5 minutes
+    python -m app.jobs.recurring_worker --once
+
+or in-process by setting RECURRING_SCHEDULER_INTERVAL (seconds) for the API.
+Several workers can run in parallel: due rows are claimed with
+FOR UPDATE SKIP LOCKED, so each item is applied by exactly one of them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import func, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from sqlmodel import col
+
+from ..database import SessionLocal
+from ..domain.enums import RecurrenceRule
+from ..helpers.budgets import apply_budget_deltas
+from ..helpers.periods import resolve_period_range_utc
+from ..helpers.recurring import apply_due_recurring, local_day_start_utc
+from ..helpers.wallets import bump_wallet_versions
+from ..logging_setup import setup_logger
+from ..models import RecurringTransaction, Transaction, UserSettings, Wallet
+
+logger = setup_logger()
+
+BATCH_SIZE = 500
+DEFAULT_INTERVAL_SECONDS = 300
+
+
+def due_period_starts(
+    db: Session, now_utc: datetime
+) -> list[tuple[int, str, datetime]]:
+    combos = db.execute(
+        select(col(UserSettings.billing_day), col(UserSettings.timezone))
+        .join(Wallet, col(Wallet.owner_id) == col(UserSettings.id))
+        .distinct()
+    ).all()
+
+    return [
+        (
+            billing_day,
+            timezone_name,
+            resolve_period_range_utc(
+                billing_day=billing_day,
+                timezone_name=timezone_name,
+                current_period=True,
+                now_utc=now_utc,
+            ).period_start_utc,
+        )
+        for billing_day, timezone_name in combos
+    ]
+
+
+def apply_due_batch(
+    db: Session,
+    *,
+    billing_day: int,
+    timezone_name: str,
+    period_start_utc: datetime,
+    now_utc: datetime,
+    batch_size: int = BATCH_SIZE,
+) -> list[tuple[UUID, UUID, datetime, Decimal]]:
+    """Claim up to `batch_size` due items and apply them in one statement.
+
+    Returns (wallet_id, category_id, occurred_at, amount_base) of the created
+    transactions; the caller commits.
+    """
+    rt = RecurringTransaction.__table__
+    tx = Transaction.__table__
+
+    claimed = (
+        select(
+            rt.c.id,
+            rt.c.wallet_id,
+            col(Wallet.owner_id).label("owner_id"),
+            rt.c.category_id,
+            rt.c.product_id,
+            rt.c.amount_base,
+            rt.c.currency_base,
+        )
+        .join(Wallet, col(Wallet.id) == rt.c.wallet_id)
+        .join(UserSettings, col(UserSettings.id) == col(Wallet.owner_id))
+        .where(
+            rt.c.active.is_(True),
+            rt.c.rule == RecurrenceRule.BILLING_PERIOD,
+            or_(
+                rt.c.last_applied_at.is_(None),
+                rt.c.last_applied_at < period_start_utc,
+            ),
+            col(UserSettings.billing_day) == billing_day,
+            col(UserSettings.timezone) == timezone_name,
+        )
+        .order_by(rt.c.wallet_id, rt.c.id)
+        .limit(batch_size)
+        .with_for_update(of=rt, skip_locked=True)
+        .cte("claimed")
+    )
+
+    inserted = (
+        insert(tx)
+        .from_select(
+            [
+                "id",
+                "wallet_id",
+                "user_id",
+                "category_id",
+                "product_id",
+                "type",
+                "amount_base",
+                "currency_base",
+                "occurred_at",
+                "created_at",
+            ],
+            select(
+                func.gen_random_uuid(),
+                claimed.c.wallet_id,
+                claimed.c.owner_id,
+                claimed.c.category_id,
+                claimed.c.product_id,
+                literal("expense"),
+                claimed.c.amount_base,
+                claimed.c.currency_base,
+                literal(now_utc, tx.c.occurred_at.type),
+                literal(now_utc, tx.c.created_at.type),
+            ),
+        )
+        .returning(tx.c.wallet_id, tx.c.category_id, tx.c.occurred_at, tx.c.amount_base)
+        .cte("inserted")
+    )
+
+    stamped = (
+        update(rt)
+        .where(rt.c.id == claimed.c.id)
+        .values(last_applied_at=now_utc, updated_at=now_utc)
+        .cte("stamped")
+    )
+
+    stmt = select(
+        inserted.c.wallet_id,
+        inserted.c.category_id,
+        inserted.c.occurred_at,
+        inserted.c.amount_base,
+    ).add_cte(stamped)
+    rows = [tuple(r) for r in db.execute(stmt).all()]
+
+    if rows:
+        bump_wallet_versions(db, {wallet_id for wallet_id, _, _, _ in rows})
+        apply_budget_deltas(db, rows)
+
+    return rows
+
+
+def wallets_with_due_rules(
+    db: Session,
+    *,
+    billing_day: int,
+    timezone_name: str,
+    due_before: datetime,
+) -> list[tuple[UUID, UUID]]:
+    """(wallet_id, owner_id) of wallets with custom-rule items not applied since `due_before`."""
+    rows = db.execute(
+        select(col(RecurringTransaction.wallet_id), col(Wallet.owner_id))
+        .join(Wallet, col(Wallet.id) == col(RecurringTransaction.wallet_id))
+        .join(UserSettings, col(UserSettings.id) == col(Wallet.owner_id))
+        .where(
+            col(RecurringTransaction.active).is_(True),
+            col(RecurringTransaction.rule) != RecurrenceRule.BILLING_PERIOD,
+            or_(
+                col(RecurringTransaction.last_applied_at).is_(None),
+                col(RecurringTransaction.last_applied_at) < due_before,
+            ),
+            col(UserSettings.billing_day) == billing_day,
+            col(UserSettings.timezone) == timezone_name,
+        )
+        .distinct()
+        .order_by(col(RecurringTransaction.wallet_id))
+    ).all()
+    return [(wallet_id, owner_id) for wallet_id, owner_id in rows]
+
+
+def apply_due_rules(
+    db: Session, *, billing_day: int, timezone_name: str, now_utc: datetime
+) -> int:
+    """Apply weekly/monthly/... items wallet by wallet through the occurrence engine."""
+    wallets = wallets_with_due_rules(
+        db,
+        billing_day=billing_day,
+        timezone_name=timezone_name,
+        due_before=local_day_start_utc(now_utc, timezone_name),
+    )
+    db.rollback()
+
+    applied = 0
+    for wallet_id, owner_id in wallets:
+        try:
+            rows = apply_due_recurring(
+                db,
+                wallet_id=wallet_id,
+                user_id=owner_id,
+                billing_day=billing_day,
+                timezone_name=timezone_name,
+                now_utc=now_utc,
+            )
+        except HTTPException:
+            # bieżący okres zamknięty -> nic do zrobienia w tym portfelu
+            db.rollback()
+            continue
+        db.commit()
+        applied += len(rows)
+
+    return applied
+
+
+def run_once(*, batch_size: int = BATCH_SIZE, now_utc: datetime | None = None) -> int:
+    now_utc = now_utc or datetime.now(timezone.utc)
+    applied = 0
+
+    with SessionLocal() as db:
+        combos = due_period_starts(db, now_utc)
+        db.rollback()
+
+        for billing_day, timezone_name, period_start_utc in combos:
+            while True:
+                start = time.perf_counter()
+                rows = apply_due_batch(
+                    db,
+                    billing_day=billing_day,
+                    timezone_name=timezone_name,
+                    period_start_utc=period_start_utc,
+                    now_utc=now_utc,
+                    batch_size=batch_size,
+                )
+                db.commit()
+
+                if not rows:
+                    break
+
+                applied += len(rows)
+                logger.info(
+                    "recurring applied",
+                    extra={
+                        "event_type": "audit_recurring_applied",
+                        "latency_ms": round((time.perf_counter() - start) * 1000, 2),
+                        "data": {
+                            "source": "worker",
+                            "transactions": len(rows),
+                            "wallets": len({r[0] for r in rows}),
+                            "period_start": period_start_utc.isoformat(),
+                        },
+                    },
+                )
+
+                if len(rows) < batch_size:
+                    break
+
+            start = time.perf_counter()
+            rule_rows = apply_due_rules(
+                db,
+                billing_day=billing_day,
+                timezone_name=timezone_name,
+                now_utc=now_utc,
+            )
+            if rule_rows:
+                applied += rule_rows
+                logger.info(
+                    "recurring applied",
+                    extra={
+                        "event_type": "audit_recurring_applied",
+                        "latency_ms": round((time.perf_counter() - start) * 1000, 2),
+                        "data": {
+                            "source": "worker",
+                            "transactions": rule_rows,
+                            "rules": True,
+                            "period_start": period_start_utc.isoformat(),
+                        },
+                    },
+                )
+
+    return applied
+
+
+async def run_periodically(interval_seconds: int) -> None:
+    while True:
+        try:
+            _ = await asyncio.to_thread(run_once)
+        except Exception:
+            logger.exception(
+                "recurring worker failed",
+                extra={"event_type": "recurring_worker_failed"},
+            )
+        await asyncio.sleep(interval_seconds)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    _ = parser.add_argument("--once", action="store_true")
+    _ = parser.add_argument("--interval", type=int, default=DEFAULT_INTERVAL_SECONDS)
+    _ = parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+
+    if args.once:
+        _ = run_once(batch_size=args.batch_size)
+        return
+
+    while True:
+        try:
+            _ = run_once(batch_size=args.batch_size)
+        except Exception:
+            logger.exception(
+                "recurring worker failed",
+                extra={"event_type": "recurring_worker_failed"},
+            )
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+"""Recompute amount_base and fx_rate of foreign-currency transactions.
+
+Run after corrected rates were loaded into fx_rates:
+
+    python -m app.jobs.revalue_fx --currency USD --from-date 2026-01-01
+    python -m app.jobs.revalue_fx --dry-run
+
+Refunds are revalued with the rate of the transaction they refund, so they
+keep cancelling it out. Budget counters, wallet versions (forecast and
+analytics caches) and closed-period snapshots of affected wallets are
+refreshed afterwards.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections import Counter, defaultdict
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import (
+    Date,
+    Numeric,
+    and_,
+    cast,
+    column,
+    func,
+    or_,
+    select,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.orm import Session, aliased
+from sqlmodel import col
+
+from ..database import SessionLocal
+from ..helpers.fx import FxRates, get_fx_rates, q6_from_float, reload_fx_rates
+from ..helpers.snapshots import fill_snapshot
+from ..helpers.wallets import bump_wallet_versions
+from ..logging_setup import setup_logger
+from ..models import PeriodSnapshot, Transaction, Wallet
+from .reconcile_budgets import reconcile_budgets
+
+logger = setup_logger()
+
+CHUNK_SIZE = 2000
+
+
+def _select_chunk(
+    db: Session,
+    *,
+    after_id: UUID | None,
+    currencies: list[str] | None,
+    from_date: date | None,
+    to_date: date | None,
+    chunk_size: int,
+):
+    original = aliased(Transaction)
+    rate_day = cast(
+        func.timezone(
+            "UTC",
+            func.coalesce(col(original.occurred_at), col(Transaction.occurred_at)),
+        ),
+        Date,
+    ).label("rate_day")
+
+    q = (
+        select(
+            col(Transaction.id),
+            col(Transaction.wallet_id),
+            col(Transaction.occurred_at),
+            col(Transaction.currency_original),
+            col(Transaction.currency_base),
+            col(Transaction.amount_original),
+            col(Transaction.amount_base),
+            col(Transaction.fx_rate),
+            rate_day,
+        )
+        .outerjoin(
+            original, col(original.id) == col(Transaction.refund_of_transaction_id)
+        )
+        .where(
+            col(Transaction.currency_original).is_not(None),
+            col(Transaction.amount_original).is_not(None),
+        )
+        .order_by(col(Transaction.id))
+        .limit(chunk_size)
+    )
+    if after_id is not None:
+        q = q.where(col(Transaction.id) > after_id)
+    if currencies:
+        q = q.where(col(Transaction.currency_original).in_(currencies))
+    if from_date is not None:
+        q = q.where(rate_day >= from_date)
+    if to_date is not None:
+        q = q.where(rate_day <= to_date)
+
+    return db.execute(q).all()
+
+
+def revalue_rows(
+    rows, rates: FxRates
+) -> tuple[list[tuple[UUID, Decimal, Decimal]], int]:
+    """Return (id, amount_base, fx_rate) of rows whose stored values differ.
+
+    Money is handled as integers (cents x micro-units) so rounding matches
+    q2(amount_original * q6(rate)) from compute_amounts exactly. Rows without
+    a usable rate (NaN before a currency's first quote) are left as they are;
+    their number is returned alongside the changes.
+    """
+    known = [
+        r
+        for r in rows
+        if r.currency_original in rates.currencies
+        and r.currency_base in rates.currencies
+    ]
+    if not known:
+        return [], 0
+
+    from_idx = np.array([rates.currencies[r.currency_original] for r in known])
+    to_idx = np.array([rates.currencies[r.currency_base] for r in known])
+    days = np.array([r.rate_day for r in known], dtype="datetime64[D]")
+
+    raw = rates.rates_at(from_idx, to_idx, days)
+    # brak notowania waluty w tym dniu -> NaN, tak jak None z FxRates.rate()
+    finite = np.isfinite(raw)
+    skipped = int((~finite).sum())
+    if skipped:
+        known = [r for r, ok in zip(known, finite.tolist()) if ok]
+        raw = raw[finite]
+        if not known:
+            return [], skipped
+
+    # q6 po Decimal tylko dla unikalnych kursów (kilka na dzień), nie per wiersz
+    unique, inverse = np.unique(raw, return_inverse=True)
+    micro_unique = np.array(
+        [int(q6_from_float(float(v)).scaleb(6)) for v in unique], dtype=np.int64
+    )
+    rate_micro = micro_unique[inverse.ravel()]
+
+    cents = np.array([int(r.amount_original.scaleb(2)) for r in known], dtype=np.int64)
+    product = cents * rate_micro
+    # ROUND_HALF_UP (od zera) z 1e-8 do groszy
+    new_cents = np.sign(product) * ((np.abs(product) + 500_000) // 1_000_000)
+
+    old_cents = np.array([int(r.amount_base.scaleb(2)) for r in known], dtype=np.int64)
+    old_micro = np.array(
+        [int(r.fx_rate.scaleb(6)) if r.fx_rate is not None else -1 for r in known],
+        dtype=np.int64,
+    )
+    changed = np.nonzero((new_cents != old_cents) | (rate_micro != old_micro))[0]
+
+    changes = [
+        (
+            known[i].id,
+            Decimal(int(new_cents[i])).scaleb(-2),
+            Decimal(int(rate_micro[i])).scaleb(-6),
+        )
+        for i in changed.tolist()
+    ]
+    return changes, skipped
+
+
+def write_back(db: Session, changes: list[tuple[UUID, Decimal, Decimal]]) -> None:
+    new_values = values(
+        column("id", PGUUID(as_uuid=True)),
+        column("amount_base", Numeric(12, 2)),
+        column("fx_rate", Numeric(18, 6)),
+        name="new_values",
+    ).data(changes)
+
+    _ = db.execute(
+        update(Transaction)
+        .where(col(Transaction.id) == new_values.c.id)
+        .values(amount_base=new_values.c.amount_base, fx_rate=new_values.c.fx_rate)
+    )
+
+
+def refresh_aggregates(db: Session, touched: dict[UUID, list[datetime]]) -> int:
+    """Reconcile budgets, bump versions and refresh snapshots covering `touched`."""
+    for wallet_id in sorted(touched, key=str):
+        _ = reconcile_budgets(db, wallet_id=wallet_id)
+    bump_wallet_versions(db, set(touched))
+
+    if not touched:
+        return 0
+
+    currencies = dict(
+        db.execute(
+            select(col(Wallet.id), col(Wallet.currency)).where(
+                col(Wallet.id).in_(list(touched))
+            )
+        ).all()
+    )
+    snapshots = (
+        db.query(PeriodSnapshot)
+        .filter(
+            or_(
+                *(
+                    and_(
+                        col(PeriodSnapshot.wallet_id) == wallet_id,
+                        col(PeriodSnapshot.period_start) <= max(days),
+                        col(PeriodSnapshot.period_end) > min(days),
+                    )
+                    for wallet_id, days in touched.items()
+                )
+            )
+        )
+        .all()
+    )
+
+    refreshed = 0
+    for snapshot in snapshots:
+        days = touched[snapshot.wallet_id]
+        if any(snapshot.period_start <= d < snapshot.period_end for d in days):
+            fill_snapshot(db, snapshot, currency=currencies[snapshot.wallet_id])
+            refreshed += 1
+    return refreshed
+
+
+def revalue_fx(
+    db: Session,
+    *,
+    currencies: list[str] | None = None,
+    from_date: date | None = None,
+    to_date: date | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> tuple[Counter[UUID], int, int]:
+    """Revalue matching transactions.
+
+    Returns rows changed per wallet, snapshots refreshed and rows skipped for
+    lack of a rate.
+
+    The caller commits (or rolls back for a dry run).
+    """
+    _ = reload_fx_rates(db)
+    rates = get_fx_rates()
+    if rates is None or rates.dates.size == 0:
+        return Counter(), 0, 0
+
+    changed_per_wallet: Counter[UUID] = Counter()
+    touched: defaultdict[UUID, list[datetime]] = defaultdict(list)
+    after_id: UUID | None = None
+    skipped = 0
+
+    while True:
+        rows = _select_chunk(
+            db,
+            after_id=after_id,
+            currencies=currencies,
+            from_date=from_date,
+            to_date=to_date,
+            chunk_size=chunk_size,
+        )
+        if not rows:
+            break
+        after_id = rows[-1].id
+
+        changes, chunk_skipped = revalue_rows(rows, rates)
+        skipped += chunk_skipped
+        if changes:
+            write_back(db, changes)
+            changed_ids = {tx_id for tx_id, _, _ in changes}
+            for r in rows:
+                if r.id in changed_ids:
+                    changed_per_wallet[r.wallet_id] += 1
+                    touched[r.wallet_id].append(r.occurred_at)
+
+        if len(rows) < chunk_size:
+            break
+
+    refreshed = refresh_aggregates(db, touched)
+    return changed_per_wallet, refreshed, skipped
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    _ = parser.add_argument("--currency", action="append", type=str.upper)
+    _ = parser.add_argument("--from-date", type=date.fromisoformat)
+    _ = parser.add_argument("--to-date", type=date.fromisoformat)
+    _ = parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    _ = parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        changed, refreshed, skipped = revalue_fx(
+            db,
+            currencies=args.currency,
+            from_date=args.from_date,
+            to_date=args.to_date,
+            chunk_size=args.chunk_size,
+        )
+        if args.dry_run:
+            db.rollback()
+        else:
+            db.commit()
+
+    for wallet_id, count in changed.most_common():
+        print(f"{wallet_id}\t{count}")
+
+    logger.info(
+        "fx revaluation finished",
+        extra={
+            "event_type": "fx_revaluation_finished",
+            "data": {
+                "dry_run": args.dry_run,
+                "rows_changed": sum(changed.values()),
+                "wallets": {str(w): n for w, n in changed.items()},
+                "snapshots_refreshed": refreshed,
+                "rows_skipped_no_rate": skipped,
+            },
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
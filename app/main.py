@@ -1,19 +1,27 @@
 from __future__ import annotations
 
+import asyncio
 import time
 from .logging_setup import setup_logger, request_id_ctx, new_request_id
 import os
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from typing import Annotated
 
 from fastapi import Depends, FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from sqlalchemy import text
 from sqlalchemy.orm import Session, configure_mappers
 
+from .database import SessionLocal
 from .deps import get_db
+from .helpers.fx import reload_fx_rates
+from .helpers.serialization import NegotiatedResponse, accept_ctx
+from .jobs import recurring_worker
 from .routers import (
     auth,
+    batch,
+    bootstrap,
     users,
     wallet,
     categories,
@@ -23,6 +31,10 @@ from .routers import (
     settings,
     summary,
     history,
+    analytics,
+    forecast,
+    budgets,
+    periods,
 )
 
 ROOT_PATH = os.getenv("ROOT_PATH", "").rstrip("/")
@@ -30,27 +42,92 @@ ROOT_PATH = os.getenv("ROOT_PATH", "").rstrip("/")
 CORS_ORIGINS_RAW = os.getenv("CORS_ORIGINS", "")
 CORS_ORIGINS = [o.strip() for o in CORS_ORIGINS_RAW.split(",") if o.strip()]
 
+# 0 = wyłączone; w produkcji zwykle osobny worker (python -m app.jobs.recurring_worker)
+RECURRING_SCHEDULER_INTERVAL = int(os.getenv("RECURRING_SCHEDULER_INTERVAL", "0"))
+
+# co ile sekund sprawdzać, czy loader dopisał nowe kursy (0 = tylko przy starcie)
+FX_RELOAD_INTERVAL = int(os.getenv("FX_RELOAD_INTERVAL", "3600"))
+
+# kompresja odpowiedzi; poziom 0 = wyłączona (np. gdy proxy kompresuje samo)
+GZIP_MINIMUM_SIZE = int(os.getenv("GZIP_MINIMUM_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+
+
+def _reload_fx_rates() -> bool:
+    with SessionLocal() as db:
+        return reload_fx_rates(db)
+
+
+async def _reload_fx_rates_periodically(interval_seconds: int) -> None:
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            _ = await asyncio.to_thread(_reload_fx_rates)
+        except Exception:
+            logger.exception(
+                "fx rates reload failed",
+                extra={"event_type": "fx_rates_reload_failed"},
+            )
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     from app import models
 
     configure_mappers()
+
+    try:
+        _ = await asyncio.to_thread(_reload_fx_rates)
+    except Exception:
+        # bez kursów z bazy compute_amounts używa FX_TO_PLN
+        logger.exception(
+            "fx rates reload failed",
+            extra={"event_type": "fx_rates_reload_failed"},
+        )
+
+    tasks: list[asyncio.Task[None]] = []
+    if RECURRING_SCHEDULER_INTERVAL > 0:
+        tasks.append(
+            asyncio.create_task(
+                recurring_worker.run_periodically(RECURRING_SCHEDULER_INTERVAL)
+            )
+        )
+    if FX_RELOAD_INTERVAL > 0:
+        tasks.append(
+            asyncio.create_task(_reload_fx_rates_periodically(FX_RELOAD_INTERVAL))
+        )
+
     yield
 
+    for task in tasks:
+        _ = task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
 
 app = FastAPI(
     lifespan=lifespan,
     root_path=ROOT_PATH,
+    default_response_class=NegotiatedResponse,
 )
 
 logger = setup_logger()
 
+# dodany jako pierwszy -> najbliżej aplikacji, widzi odpowiedź przed
+# middleware logującym (który przepisuje każdą odpowiedź na strumień)
+if GZIP_LEVEL > 0:
+    app.add_middleware(
+        GZipMiddleware,
+        minimum_size=GZIP_MINIMUM_SIZE,
+        compresslevel=min(GZIP_LEVEL, 9),
+    )
+
 
 @app.middleware("http")
 async def request_logging_middleware(request: Request, call_next):
     rid = request.headers.get("x-request-id") or new_request_id()
     token = request_id_ctx.set(rid)
+    accept_token = accept_ctx.set(request.headers.get("accept"))
 
     start = time.perf_counter()
     response = None
@@ -99,6 +176,7 @@ async def request_logging_middleware(request: Request, call_next):
             response.headers["X-Request-ID"] = rid
 
         request_id_ctx.reset(token)
+        accept_ctx.reset(accept_token)
 
 
 if CORS_ORIGINS:
@@ -114,6 +192,8 @@ if CORS_ORIGINS:
 DbSession = Annotated[Session, Depends(get_db)]
 
 app.include_router(auth.router)
+app.include_router(batch.router)
+app.include_router(bootstrap.router)
 app.include_router(users.router)
 app.include_router(wallet.router)
 app.include_router(categories.router)
@@ -122,7 +202,12 @@ app.include_router(transactions.router)
 app.include_router(recurring.router)
 app.include_router(settings.router)
 app.include_router(summary.router)
+app.include_router(summary.all_wallets_router)
 app.include_router(history.router)
+app.include_router(analytics.router)
+app.include_router(forecast.router)
+app.include_router(budgets.router)
+app.include_router(periods.router)
 
 
 @app.get("/health", include_in_schema=False)
@@ -9,6 +9,11 @@ from .db.tables import (
     Product,
     Transaction,
     RecurringTransaction,
+    CategoryBudget,
+    CategoryBudgetSpend,
+    PeriodSnapshot,
+    FxRate,
+    IdempotencyKey,
 )
 
 __all__ = [
@@ -22,4 +27,9 @@ __all__ = [
     "Product",
     "Transaction",
     "RecurringTransaction",
+    "CategoryBudget",
+    "CategoryBudgetSpend",
+    "PeriodSnapshot",
+    "FxRate",
+    "IdempotencyKey",
 ]
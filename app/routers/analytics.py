@@ -0,0 +1,37 @@
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from ..deps import get_current_user, get_db
+from ..models import User
+from ..schemas.analytics import WalletAnalyticsRead
+from ..handlers import analytics as analytics_handler
+
+router = APIRouter(
+    prefix="/wallets/{wallet_id}/analytics",
+    tags=["analytics"],
+)
+
+DB = Annotated[Session, Depends(get_db)]
+CurrentUser = Annotated[User, Depends(get_current_user)]
+
+
+@router.get("", response_model=WalletAnalyticsRead)
+def wallet_analytics(
+    wallet_id: UUID,
+    db: DB,
+    current_user: CurrentUser,
+    days: int = 365,
+    window: int = 7,
+    z_threshold: float = 3.0,
+):
+    return analytics_handler.wallet_analytics(
+        wallet_id=wallet_id,
+        db=db,
+        current_user=current_user,
+        days=days,
+        window=window,
+        z_threshold=z_threshold,
+    )
@@ -0,0 +1,29 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.orm import Session
+
+from ..deps import get_current_user, get_db
+from ..helpers.batch import dispatch
+from ..models import User
+from ..schemas.batch import BatchRead, BatchRequest
+
+router = APIRouter(prefix="/batch", tags=["batch"])
+
+DB = Annotated[Session, Depends(get_db)]
+CurrentUser = Annotated[User, Depends(get_current_user)]
+
+
+@router.post("", response_model=BatchRead)
+async def batch(
+    body: BatchRequest,
+    db: DB,
+    current_user: CurrentUser,
+    request: Request,
+) -> BatchRead:
+    # po kolei: jedna sesja SQLAlchemy nie może być używana z kilku wątków naraz
+    responses = [
+        await dispatch(request, item, db=db, current_user=current_user)
+        for item in body.requests
+    ]
+    return BatchRead(responses=responses)
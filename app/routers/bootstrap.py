@@ -0,0 +1,30 @@
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import Response
+from sqlalchemy.orm import Session
+
+from ..deps import get_current_user, get_db
+from ..handlers import bootstrap as bootstrap_handler
+from ..helpers.serialization import conditional_response, model_response
+from ..models import User
+from ..schemas.bootstrap import BootstrapRead
+
+router = APIRouter(prefix="/bootstrap", tags=["bootstrap"])
+
+DB = Annotated[Session, Depends(get_db)]
+CurrentUser = Annotated[User, Depends(get_current_user)]
+
+
+@router.get("", response_model=BootstrapRead)
+def bootstrap(
+    db: DB,
+    current_user: CurrentUser,
+    request: Request,
+    wallet_id: UUID | None = None,
+) -> Response:
+    result = bootstrap_handler.bootstrap(
+        db=db, current_user=current_user, wallet_id=wallet_id
+    )
+    return conditional_response(request, model_response(result))
@@ -0,0 +1,137 @@
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Request, HTTPException
+from sqlalchemy.orm import Session
+
+from ..deps import get_db, get_current_user
+from ..models import User
+from ..schemas.budget import CategoryBudgetSet, CategoryBudgetStatusRead
+from ..handlers import budgets as budgets_handler
+from ..logging_setup import setup_logger
+
+router = APIRouter(
+    prefix="/wallets/{wallet_id}/budgets",
+    tags=["budgets"],
+)
+
+logger = setup_logger()
+
+DB = Annotated[Session, Depends(get_db)]
+CurrentUser = Annotated[User, Depends(get_current_user)]
+
+
+@router.get("", response_model=list[CategoryBudgetStatusRead])
+def list_budgets(
+    wallet_id: UUID,
+    db: DB,
+    current_user: CurrentUser,
+):
+    return budgets_handler.list_budgets(
+        wallet_id=wallet_id, db=db, current_user=current_user
+    )
+
+
+@router.put("/{category_id}", response_model=CategoryBudgetStatusRead)
+def set_budget(
+    wallet_id: UUID,
+    category_id: UUID,
+    body: CategoryBudgetSet,
+    db: DB,
+    current_user: CurrentUser,
+    request: Request,
+):
+    try:
+        budget = budgets_handler.set_budget(
+            wallet_id=wallet_id,
+            category_id=category_id,
+            body=body,
+            db=db,
+            current_user=current_user,
+        )
+
+    except HTTPException as exc:
+        if exc.status_code == 403:
+            logger.warning(
+                "permission denied",
+                extra={
+                    "event_type": "permission_denied",
+                    "user_id": str(current_user.id),
+                    "src_ip": request.client.host if request.client else None,
+                    "user_agent": (request.headers.get("user-agent") or "")[:256],
+                    "status": exc.status_code,
+                    "data": {
+                        "wallet_id": str(wallet_id),
+                        "category_id": str(category_id),
+                        "action": "budget_set",
+                    },
+                },
+            )
+        raise
+
+    logger.info(
+        "budget set",
+        extra={
+            "event_type": "audit_budget_set",
+            "user_id": str(current_user.id),
+            "src_ip": request.client.host if request.client else None,
+            "user_agent": (request.headers.get("user-agent") or "")[:256],
+            "data": {
+                "wallet_id": str(wallet_id),
+                "category_id": str(category_id),
+                "amount": str(body.amount),
+            },
+        },
+    )
+    return budget
+
+
+@router.delete("/{category_id}", status_code=204)
+def delete_budget(
+    wallet_id: UUID,
+    category_id: UUID,
+    db: DB,
+    current_user: CurrentUser,
+    request: Request,
+):
+    try:
+        budgets_handler.delete_budget(
+            wallet_id=wallet_id,
+            category_id=category_id,
+            db=db,
+            current_user=current_user,
+        )
+
+    except HTTPException as exc:
+        if exc.status_code == 403:
+            logger.warning(
+                "permission denied",
+                extra={
+                    "event_type": "permission_denied",
+                    "user_id": str(current_user.id),
+                    "src_ip": request.client.host if request.client else None,
+                    "user_agent": (request.headers.get("user-agent") or "")[:256],
+                    "status": exc.status_code,
+                    "data": {
+                        "wallet_id": str(wallet_id),
+                        "category_id": str(category_id),
+                        "action": "budget_delete",
+                    },
+                },
+            )
+        raise
+
+    logger.info(
+        "budget deleted",
+        extra={
+            "event_type": "audit_budget_deleted",
+            "user_id": str(current_user.id),
+            "src_ip": request.client.host if request.client else None,
+            "user_agent": (request.headers.get("user-agent") or "")[:256],
+            "data": {
+                "wallet_id": str(wallet_id),
+                "category_id": str(category_id),
+            },
+        },
+    )
+    return None
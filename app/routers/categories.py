@@ -3,12 +3,20 @@ from uuid import UUID
 from datetime import date
 
 from fastapi import APIRouter, Depends, Request, HTTPException
+from fastapi.responses import Response
 from sqlalchemy.orm import Session
 
 from ..deps import get_db, get_current_user
+from ..domain.enums import ProductImportance
 from ..models import User
-from ..schemas.category import CategoryCreate, CategoryRead, CategoryReadSum
+from ..schemas.category import (
+    CategoryCreate,
+    CategoryRead,
+    CategoryReadSum,
+    CategoryTopRead,
+)
 from ..handlers import categories as categories_handler
+from ..helpers.serialization import list_response
 from ..logging_setup import setup_logger
 
 router = APIRouter(
@@ -192,8 +200,9 @@ def list_categories_with_sum(
     from_date: date | None = None,
     to_date: date | None = None,
     include_empty: bool = True,
-) -> list[CategoryReadSum]:
-    return categories_handler.list_categories_with_sum(
+    fields: str | None = None,
+) -> Response:
+    items = categories_handler.list_categories_with_sum(
         wallet_id=wallet_id,
         db=db,
         current_user=current_user,
@@ -201,4 +210,33 @@ def list_categories_with_sum(
         from_date=from_date,
         to_date=to_date,
         include_empty=include_empty,
+        fields=fields,
+    )
+    return list_response(CategoryReadSum, items)
+
+
+@router.get("/top", response_model=list[CategoryTopRead], status_code=200)
+def top_categories(
+    wallet_id: UUID,
+    db: DB,
+    current_user: CurrentUser,
+    limit: int = 5,
+    importance: ProductImportance | None = None,
+    current_period: bool = True,
+    from_date: date | None = None,
+    to_date: date | None = None,
+    include_share: bool = False,
+    include_rank_change: bool = False,
+) -> list[CategoryTopRead]:
+    return categories_handler.top_categories(
+        wallet_id=wallet_id,
+        db=db,
+        current_user=current_user,
+        limit=limit,
+        importance=importance,
+        current_period=current_period,
+        from_date=from_date,
+        to_date=to_date,
+        include_share=include_share,
+        include_rank_change=include_rank_change,
     )
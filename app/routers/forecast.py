@@ -0,0 +1,33 @@
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from ..deps import get_current_user, get_db
+from ..models import User
+from ..schemas.forecast import WalletForecastRead
+from ..handlers import forecast as forecast_handler
+
+router = APIRouter(
+    prefix="/wallets/{wallet_id}/forecast",
+    tags=["forecast"],
+)
+
+DB = Annotated[Session, Depends(get_db)]
+CurrentUser = Annotated[User, Depends(get_current_user)]
+
+
+@router.get("", response_model=WalletForecastRead)
+def wallet_forecast(
+    wallet_id: UUID,
+    db: DB,
+    current_user: CurrentUser,
+    history_periods: int = 3,
+):
+    return forecast_handler.wallet_forecast(
+        wallet_id=wallet_id,
+        db=db,
+        current_user=current_user,
+        history_periods=history_periods,
+    )
@@ -8,6 +8,7 @@ from ..deps import get_current_user, get_db
 from ..models import User
 from ..schemas.aggregation import LastPeriodsHistoryRead
 from ..handlers import history as history_handler
+from ..helpers.serialization import model_response
 
 router = APIRouter(
     prefix="/wallets/{wallet_id}/history",
@@ -26,6 +27,7 @@ def history_last_periods(
     current_user: Annotated[User, Depends(get_current_user)],
     periods: int = 6,
 ):
-    return history_handler.history_last_periods(
+    history = history_handler.history_last_periods(
         wallet_id=wallet_id, db=db, current_user=current_user, periods=periods
     )
+    return model_response(history)
@@ -0,0 +1,136 @@
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Request, HTTPException
+from sqlalchemy.orm import Session
+
+from ..deps import get_db, get_current_user
+from ..models import User
+from ..schemas.period import PeriodSnapshotRead
+from ..handlers import periods as periods_handler
+from ..logging_setup import setup_logger
+
+router = APIRouter(
+    prefix="/wallets/{wallet_id}/periods",
+    tags=["periods"],
+)
+
+logger = setup_logger()
+
+DB = Annotated[Session, Depends(get_db)]
+CurrentUser = Annotated[User, Depends(get_current_user)]
+
+
+@router.get("/closed", response_model=list[PeriodSnapshotRead])
+def list_closed_periods(
+    wallet_id: UUID,
+    db: DB,
+    current_user: CurrentUser,
+):
+    return periods_handler.list_closed_periods(
+        wallet_id=wallet_id, db=db, current_user=current_user
+    )
+
+
+@router.post("/close", response_model=PeriodSnapshotRead, status_code=201)
+def close_period(
+    wallet_id: UUID,
+    db: DB,
+    current_user: CurrentUser,
+    request: Request,
+    periods_ago: int = 1,
+):
+    try:
+        snapshot = periods_handler.close_period(
+            wallet_id=wallet_id,
+            db=db,
+            current_user=current_user,
+            periods_ago=periods_ago,
+        )
+
+    except HTTPException as exc:
+        if exc.status_code == 403:
+            logger.warning(
+                "permission denied",
+                extra={
+                    "event_type": "permission_denied",
+                    "user_id": str(current_user.id),
+                    "src_ip": request.client.host if request.client else None,
+                    "user_agent": (request.headers.get("user-agent") or "")[:256],
+                    "status": exc.status_code,
+                    "data": {
+                        "wallet_id": str(wallet_id),
+                        "action": "period_close",
+                        "periods_ago": periods_ago,
+                    },
+                },
+            )
+        raise
+
+    logger.info(
+        "period closed",
+        extra={
+            "event_type": "audit_period_closed",
+            "user_id": str(current_user.id),
+            "src_ip": request.client.host if request.client else None,
+            "user_agent": (request.headers.get("user-agent") or "")[:256],
+            "data": {
+                "wallet_id": str(wallet_id),
+                "snapshot_id": str(snapshot.id),
+                "period_start": snapshot.period_start.isoformat(),
+                "period_end": snapshot.period_end.isoformat(),
+            },
+        },
+    )
+    return snapshot
+
+
+@router.delete("/closed/{snapshot_id}", status_code=204)
+def reopen_period(
+    wallet_id: UUID,
+    snapshot_id: UUID,
+    db: DB,
+    current_user: CurrentUser,
+    request: Request,
+):
+    try:
+        periods_handler.reopen_period(
+            wallet_id=wallet_id,
+            snapshot_id=snapshot_id,
+            db=db,
+            current_user=current_user,
+        )
+
+    except HTTPException as exc:
+        if exc.status_code == 403:
+            logger.warning(
+                "permission denied",
+                extra={
+                    "event_type": "permission_denied",
+                    "user_id": str(current_user.id),
+                    "src_ip": request.client.host if request.client else None,
+                    "user_agent": (request.headers.get("user-agent") or "")[:256],
+                    "status": exc.status_code,
+                    "data": {
+                        "wallet_id": str(wallet_id),
+                        "snapshot_id": str(snapshot_id),
+                        "action": "period_reopen",
+                    },
+                },
+            )
+        raise
+
+    logger.warning(
+        "period reopened",
+        extra={
+            "event_type": "audit_period_reopened",
+            "user_id": str(current_user.id),
+            "src_ip": request.client.host if request.client else None,
+            "user_agent": (request.headers.get("user-agent") or "")[:256],
+            "data": {
+                "wallet_id": str(wallet_id),
+                "snapshot_id": str(snapshot_id),
+            },
+        },
+    )
+    return None
@@ -3,12 +3,20 @@ from uuid import UUID
 from datetime import date
 
 from fastapi import APIRouter, Depends, Request, HTTPException
+from fastapi.responses import Response
 from sqlalchemy.orm import Session
 
 from ..deps import get_db, get_current_user
+from ..domain.enums import ProductImportance
 from ..models import User
-from ..schemas.product import ProductCreate, ProductRead, ProductReadSum
+from ..schemas.product import (
+    ProductCreate,
+    ProductRead,
+    ProductReadSum,
+    ProductTopRead,
+)
 from ..handlers import products as products_handler
+from ..helpers.serialization import list_response, prefers_ndjson
 from ..logging_setup import setup_logger
 
 router = APIRouter(
@@ -78,16 +86,26 @@ def list_products(
     wallet_id: UUID,
     db: DB,
     current_user: CurrentUser,
+    request: Request,
     category_id: UUID | None = None,
     deleted: bool = False,
-):
-    return products_handler.list_products(
+) -> Response:
+    if prefers_ndjson(request.headers.get("accept")):
+        return products_handler.stream_products(
+            wallet_id=wallet_id,
+            db=db,
+            current_user=current_user,
+            category_id=category_id,
+            deleted=deleted,
+        )
+    items = products_handler.list_products(
         wallet_id=wallet_id,
         db=db,
         current_user=current_user,
         category_id=category_id,
         deleted=deleted,
     )
+    return list_response(ProductRead, items)
 
 
 @router.delete("/{product_id}", status_code=204)
@@ -195,8 +213,9 @@ def list_products_with_sum(
     current_period: bool = True,
     from_date: date | None = None,
     to_date: date | None = None,
-) -> list[ProductReadSum]:
-    return products_handler.list_products_with_sum(
+    fields: str | None = None,
+) -> Response:
+    items = products_handler.list_products_with_sum(
         wallet_id=wallet_id,
         db=db,
         current_user=current_user,
@@ -204,4 +223,33 @@ def list_products_with_sum(
         current_period=current_period,
         from_date=from_date,
         to_date=to_date,
+        fields=fields,
+    )
+    return list_response(ProductReadSum, items)
+
+
+@router.get("/top", response_model=list[ProductTopRead], status_code=200)
+def top_products(
+    wallet_id: UUID,
+    db: DB,
+    current_user: CurrentUser,
+    limit: int = 5,
+    importance: ProductImportance | None = None,
+    current_period: bool = True,
+    from_date: date | None = None,
+    to_date: date | None = None,
+    include_share: bool = False,
+    include_rank_change: bool = False,
+) -> list[ProductTopRead]:
+    return products_handler.top_products(
+        wallet_id=wallet_id,
+        db=db,
+        current_user=current_user,
+        limit=limit,
+        importance=importance,
+        current_period=current_period,
+        from_date=from_date,
+        to_date=to_date,
+        include_share=include_share,
+        include_rank_change=include_rank_change,
     )
@@ -2,16 +2,20 @@ from typing import Annotated
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, Request, HTTPException
+from fastapi.responses import Response
 from sqlalchemy.orm import Session
 
 from ..deps import get_db, get_current_user
 from ..models import User
 from ..schemas.recurring_transactions import (
+    RecurringProjectionRead,
     RecurringTransactionRead,
     RecurringTransactionCreate,
 )
-from ..schemas.transaction import TransactionRead
+from ..schemas.transaction import TransactionColumnsRead, TransactionRead
 from ..handlers import recurring as recurring_handler
+from ..helpers.idempotency import IdempotencyKeyHeader, idempotent
+from ..helpers.serialization import list_response, prefers_ndjson
 from ..logging_setup import setup_logger
 
 router = APIRouter(
@@ -93,57 +97,93 @@ def list_recurring_transactions(
     wallet_id: UUID,
     db: DB,
     current_user: CurrentUser,
+    request: Request,
     active: bool | None = None,
-):
+) -> Response:
     # Bez dodatkowego event_type (http_request z middleware wystarczy)
-    return recurring_handler.list_recurring_transactions(
+    if prefers_ndjson(request.headers.get("accept")):
+        return recurring_handler.stream_recurring_transactions(
+            wallet_id=wallet_id, db=db, current_user=current_user, active=active
+        )
+    items = recurring_handler.list_recurring_transactions(
         wallet_id=wallet_id, db=db, current_user=current_user, active=active
     )
+    return list_response(RecurringTransactionRead, items)
 
 
-@router.post("/apply", response_model=list[TransactionRead])
+@router.get("/projection", response_model=RecurringProjectionRead)
+def recurring_projection(
+    wallet_id: UUID,
+    db: DB,
+    current_user: CurrentUser,
+    months: int = 12,
+):
+    return recurring_handler.recurring_projection(
+        wallet_id=wallet_id, db=db, current_user=current_user, months=months
+    )
+
+
+@router.post("/apply", response_model=list[TransactionRead] | TransactionColumnsRead)
 def apply_recurring_transactions(
     wallet_id: UUID,
     db: DB,
     current_user: CurrentUser,
     request: Request,
-):
-    try:
-        created_transactions = recurring_handler.apply_recurring_transactions(
-            wallet_id=wallet_id, db=db, current_user=current_user
-        )
-    except HTTPException as exc:
-        if exc.status_code == 403:
-            logger.warning(
-                "permission denied",
-                extra={
-                    "event_type": "permission_denied",
-                    "user_id": str(current_user.id),
-                    "src_ip": request.client.host if request.client else None,
-                    "user_agent": (request.headers.get("user-agent") or "")[:256],
-                    "status": exc.status_code,
-                    "data": {
-                        "wallet_id": str(wallet_id),
-                        "action": "recurring_apply",
-                    },
-                },
+    catch_up: bool = False,
+    shape: str = "rows",
+    idempotency_key: IdempotencyKeyHeader = None,
+) -> Response:
+    with idempotent(
+        request, db=db, user_id=current_user.id, key=idempotency_key
+    ) as call:
+        if call.replay is not None:
+            return call.replay
+
+        try:
+            created_transactions = recurring_handler.apply_recurring_transactions(
+                wallet_id=wallet_id,
+                db=db,
+                current_user=current_user,
+                catch_up=catch_up,
+                shape=shape,
             )
-        raise
+        except HTTPException as exc:
+            if exc.status_code == 403:
+                logger.warning(
+                    "permission denied",
+                    extra={
+                        "event_type": "permission_denied",
+                        "user_id": str(current_user.id),
+                        "src_ip": request.client.host if request.client else None,
+                        "user_agent": (request.headers.get("user-agent") or "")[:256],
+                        "status": exc.status_code,
+                        "data": {
+                            "wallet_id": str(wallet_id),
+                            "action": "recurring_apply",
+                        },
+                    },
+                )
+            raise
 
-    logger.info(
-        "recurring applied",
-        extra={
-            "event_type": "audit_recurring_applied",
-            "user_id": str(current_user.id),
-            "src_ip": request.client.host if request.client else None,
-            "user_agent": (request.headers.get("user-agent") or "")[:256],
-            "data": {
-                "wallet_id": str(wallet_id),
-                "created_transactions_count": len(created_transactions),
+        logger.info(
+            "recurring applied",
+            extra={
+                "event_type": "audit_recurring_applied",
+                "user_id": str(current_user.id),
+                "src_ip": request.client.host if request.client else None,
+                "user_agent": (request.headers.get("user-agent") or "")[:256],
+                "data": {
+                    "wallet_id": str(wallet_id),
+                    "created_transactions_count": (
+                        created_transactions["count"]
+                        if isinstance(created_transactions, dict)
+                        else len(created_transactions)
+                    ),
+                    "catch_up": catch_up,
+                },
             },
-        },
-    )
-    return created_transactions
+        )
+        return call.save(list_response(TransactionRead, created_transactions))
 
 
 @router.put("/{recurring_id}", response_model=RecurringTransactionRead)
@@ -8,16 +8,26 @@ from sqlalchemy.orm import Session
 from ..deps import get_current_user, get_db
 from ..models import User
 from ..schemas.aggregation import (
+    AllWalletsSummaryRead,
+    CategoriesComparisonSummaryRead,
     CategoriesProductsSummaryRead,
+    ImportanceComparisonSummaryRead,
     ImportanceSummaryRead,
+    MembersSummaryRead,
 )
 from ..handlers import summary as summary_handler
+from ..helpers.serialization import model_response
 
 router = APIRouter(
     prefix="/wallets/{wallet_id}/summary",
     tags=["summary"],
 )
 
+all_wallets_router = APIRouter(
+    prefix="/summary",
+    tags=["summary"],
+)
+
 DB = Annotated[Session, Depends(get_db)]
 CurrentUser = Annotated[User, Depends(get_current_user)]
 
@@ -35,7 +45,7 @@ def summary_categories_products(
     to_date: date | None = None,
     include_empty: bool = False,
 ):
-    return summary_handler.summary_categories_products(
+    summary = summary_handler.summary_categories_products(
         wallet_id=wallet_id,
         db=db,
         current_user=current_user,
@@ -44,6 +54,7 @@ def summary_categories_products(
         to_date=to_date,
         include_empty=include_empty,
     )
+    return model_response(summary)
 
 
 @router.get(
@@ -58,7 +69,76 @@ def summary_by_importance(
     from_date: date | None = None,
     to_date: date | None = None,
 ):
-    return summary_handler.summary_by_importance(
+    summary = summary_handler.summary_by_importance(
+        wallet_id=wallet_id,
+        db=db,
+        current_user=current_user,
+        current_period=current_period,
+        from_date=from_date,
+        to_date=to_date,
+    )
+    return model_response(summary)
+
+
+@router.get(
+    "/by-member",
+    response_model=MembersSummaryRead,
+)
+def summary_by_member(
+    wallet_id: UUID,
+    db: DB,
+    current_user: CurrentUser,
+    current_period: bool = True,
+    from_date: date | None = None,
+    to_date: date | None = None,
+):
+    summary = summary_handler.summary_by_member(
+        wallet_id=wallet_id,
+        db=db,
+        current_user=current_user,
+        current_period=current_period,
+        from_date=from_date,
+        to_date=to_date,
+    )
+    return model_response(summary)
+
+
+@router.get(
+    "/categories-comparison",
+    response_model=CategoriesComparisonSummaryRead,
+)
+def summary_categories_comparison(
+    wallet_id: UUID,
+    db: DB,
+    current_user: CurrentUser,
+    current_period: bool = True,
+    from_date: date | None = None,
+    to_date: date | None = None,
+):
+    summary = summary_handler.summary_categories_comparison(
+        wallet_id=wallet_id,
+        db=db,
+        current_user=current_user,
+        current_period=current_period,
+        from_date=from_date,
+        to_date=to_date,
+    )
+    return model_response(summary)
+
+
+@router.get(
+    "/by-importance-comparison",
+    response_model=ImportanceComparisonSummaryRead,
+)
+def summary_by_importance_comparison(
+    wallet_id: UUID,
+    db: DB,
+    current_user: CurrentUser,
+    current_period: bool = True,
+    from_date: date | None = None,
+    to_date: date | None = None,
+):
+    summary = summary_handler.summary_by_importance_comparison(
         wallet_id=wallet_id,
         db=db,
         current_user=current_user,
@@ -66,3 +146,25 @@ def summary_by_importance(
         from_date=from_date,
         to_date=to_date,
     )
+    return model_response(summary)
+
+
+@all_wallets_router.get(
+    "/all-wallets",
+    response_model=AllWalletsSummaryRead,
+)
+def summary_all_wallets(
+    db: DB,
+    current_user: CurrentUser,
+    current_period: bool = True,
+    from_date: date | None = None,
+    to_date: date | None = None,
+):
+    summary = summary_handler.summary_all_wallets(
+        db=db,
+        current_user=current_user,
+        current_period=current_period,
+        from_date=from_date,
+        to_date=to_date,
+    )
+    return model_response(summary)
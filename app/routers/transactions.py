@@ -5,14 +5,23 @@ from typing import Annotated
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, Request, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
 
 from ..deps import get_current_user, get_db
 from ..handlers import transactions as transactions_handler
+from ..helpers.idempotency import IdempotencyKeyHeader, idempotent
+from ..helpers.serialization import list_response, model_response, prefers_ndjson
 from ..logging_setup import setup_logger
 from ..models import User
-from ..schemas.transaction import TransactionCreate, TransactionRead
+from ..schemas.transaction import (
+    TransactionBulkRead,
+    TransactionBulkRequest,
+    TransactionCreate,
+    TransactionColumnsRead,
+    TransactionCreateRead,
+    TransactionRead,
+)
 
 router = APIRouter(
     prefix="/wallets/{wallet_id}/transactions",
@@ -29,85 +38,107 @@ def _clean_data(d: dict[str, object]) -> dict[str, object]:
     return {k: v for k, v in d.items() if v is not None}
 
 
-@router.post("", response_model=TransactionRead, status_code=201)
+@router.post("", response_model=TransactionCreateRead, status_code=201)
 def create_transaction(
     wallet_id: UUID,
     body: TransactionCreate,
     db: DB,
     current_user: CurrentUser,
     request: Request,
-) -> TransactionRead:
-    try:
-        tx = transactions_handler.create_transaction(
-            wallet_id=wallet_id,
-            body=body,
-            db=db,
-            current_user=current_user,
-        )
-    except HTTPException as exc:
-        if exc.status_code == 403:
-            logger.warning(
-                "permission denied",
-                extra={
-                    "event_type": "permission_denied",
-                    "user_id": str(current_user.id),
-                    "src_ip": request.client.host if request.client else None,
-                    "user_agent": (request.headers.get("user-agent") or "")[:256],
-                    "status": exc.status_code,
-                    "data": _clean_data(
-                        {
-                            "wallet_id": str(wallet_id),
-                            "action": "transaction_create",
-                            "category_id": str(body.category_id),
-                            "product_id": (
-                                str(body.product_id) if body.product_id else None
-                            ),
-                        }
-                    ),
-                },
+    idempotency_key: IdempotencyKeyHeader = None,
+) -> Response:
+    with idempotent(
+        request, db=db, user_id=current_user.id, key=idempotency_key, body=body
+    ) as call:
+        if call.replay is not None:
+            return call.replay
+
+        try:
+            tx = transactions_handler.create_transaction(
+                wallet_id=wallet_id,
+                body=body,
+                db=db,
+                current_user=current_user,
             )
-        raise
+        except HTTPException as exc:
+            if exc.status_code == 403:
+                logger.warning(
+                    "permission denied",
+                    extra={
+                        "event_type": "permission_denied",
+                        "user_id": str(current_user.id),
+                        "src_ip": request.client.host if request.client else None,
+                        "user_agent": (request.headers.get("user-agent") or "")[:256],
+                        "status": exc.status_code,
+                        "data": _clean_data(
+                            {
+                                "wallet_id": str(wallet_id),
+                                "action": "transaction_create",
+                                "category_id": str(body.category_id),
+                                "product_id": (
+                                    str(body.product_id) if body.product_id else None
+                                ),
+                            }
+                        ),
+                    },
+                )
+            raise
 
-    logger.info(
-        "transaction created",
-        extra={
-            "event_type": "audit_transaction_created",
-            "user_id": str(current_user.id),
-            "src_ip": request.client.host if request.client else None,
-            "user_agent": (request.headers.get("user-agent") or "")[:256],
-            "data": _clean_data(
-                {
-                    "wallet_id": str(wallet_id),
-                    "transaction_id": str(tx.id),
-                    "category_id": str(body.category_id),
-                    "product_id": str(body.product_id) if body.product_id else None,
-                    "amount": str(body.amount),
-                    "currency": body.currency,
-                    "amount_base": getattr(tx, "amount_base", None),
-                    "currency_base": getattr(tx, "currency_base", None),
-                    "amount_original": getattr(tx, "amount_original", None),
-                    "currency_original": getattr(tx, "currency_original", None),
-                    "fx_rate": getattr(tx, "fx_rate", None),
-                    "transaction_type": getattr(tx, "type", None),
-                }
-            ),
-        },
-    )
-    return tx
+        logger.info(
+            "transaction created",
+            extra={
+                "event_type": "audit_transaction_created",
+                "user_id": str(current_user.id),
+                "src_ip": request.client.host if request.client else None,
+                "user_agent": (request.headers.get("user-agent") or "")[:256],
+                "data": _clean_data(
+                    {
+                        "wallet_id": str(wallet_id),
+                        "transaction_id": str(tx.id),
+                        "category_id": str(body.category_id),
+                        "product_id": str(body.product_id) if body.product_id else None,
+                        "amount": str(body.amount),
+                        "currency": body.currency,
+                        "amount_base": getattr(tx, "amount_base", None),
+                        "currency_base": getattr(tx, "currency_base", None),
+                        "amount_original": getattr(tx, "amount_original", None),
+                        "currency_original": getattr(tx, "currency_original", None),
+                        "fx_rate": getattr(tx, "fx_rate", None),
+                        "transaction_type": getattr(tx, "type", None),
+                    }
+                ),
+            },
+        )
+        return call.save(model_response(tx, status_code=201))
 
 
-@router.get("", response_model=list[TransactionRead])
+@router.get("", response_model=list[TransactionRead] | TransactionColumnsRead)
 def list_transactions(
     wallet_id: UUID,
     db: DB,
     current_user: CurrentUser,
+    request: Request,
     from_date: date | None = None,
     to_date: date | None = None,
     current_period: bool = False,
     category_id: UUID | None = None,
     product_id: UUID | None = None,
-) -> list[TransactionRead]:
-    return transactions_handler.list_transactions(
+    shape: str = "rows",
+    fields: str | None = None,
+) -> Response:
+    if shape == "rows" and prefers_ndjson(request.headers.get("accept")):
+        return transactions_handler.stream_transactions(
+            wallet_id=wallet_id,
+            db=db,
+            current_user=current_user,
+            from_date=from_date,
+            to_date=to_date,
+            current_period=current_period,
+            category_id=category_id,
+            product_id=product_id,
+            fields=fields,
+        )
+    items = transactions_handler.list_transactions(
         wallet_id=wallet_id,
         db=db,
         current_user=current_user,
@@ -116,7 +147,10 @@ def list_transactions(
         current_period=current_period,
         category_id=category_id,
         product_id=product_id,
+        shape=shape,
+        fields=fields,
     )
+    return list_response(TransactionRead, items)
 
 
 @router.post(
@@ -128,9 +162,76 @@ def refund_transaction(
     db: DB,
     current_user: CurrentUser,
     request: Request,
-) -> TransactionRead:
+    idempotency_key: IdempotencyKeyHeader = None,
+) -> Response:
+    with idempotent(
+        request, db=db, user_id=current_user.id, key=idempotency_key
+    ) as call:
+        if call.replay is not None:
+            return call.replay
+
+        try:
+            refund_tx = transactions_handler.refund_transaction(
+                wallet_id=wallet_id,
+                transaction_id=transaction_id,
+                db=db,
+                current_user=current_user,
+            )
+        except HTTPException as exc:
+            if exc.status_code == 403:
+                logger.warning(
+                    "permission denied",
+                    extra={
+                        "event_type": "permission_denied",
+                        "user_id": str(current_user.id),
+                        "src_ip": request.client.host if request.client else None,
+                        "user_agent": (request.headers.get("user-agent") or "")[:256],
+                        "status": exc.status_code,
+                        "data": {
+                            "wallet_id": str(wallet_id),
+                            "action": "transaction_refund",
+                            "transaction_id": str(transaction_id),
+                        },
+                    },
+                )
+            raise
+
+        logger.info(
+            "transaction refunded",
+            extra={
+                "event_type": "audit_transaction_refunded",
+                "user_id": str(current_user.id),
+                "src_ip": request.client.host if request.client else None,
+                "user_agent": (request.headers.get("user-agent") or "")[:256],
+                "data": _clean_data(
+                    {
+                        "wallet_id": str(wallet_id),
+                        "original_transaction_id": str(transaction_id),
+                        "refund_transaction_id": str(refund_tx.id),
+                        "amount_base": getattr(refund_tx, "amount_base", None),
+                        "currency_base": getattr(refund_tx, "currency_base", None),
+                        "amount_original": getattr(refund_tx, "amount_original", None),
+                        "currency_original": getattr(
+                            refund_tx, "currency_original", None
+                        ),
+                        "fx_rate": getattr(refund_tx, "fx_rate", None),
+                    }
+                ),
+            },
+        )
+        return call.save(model_response(refund_tx, status_code=201))
+
+
+@router.delete("/{transaction_id}", status_code=204)
+def soft_delete_transaction(
+    wallet_id: UUID,
+    transaction_id: UUID,
+    db: DB,
+    current_user: CurrentUser,
+    request: Request,
+) -> None:
     try:
-        refund_tx = transactions_handler.refund_transaction(
+        transactions_handler.soft_delete_transaction(
             wallet_id=wallet_id,
             transaction_id=transaction_id,
             db=db,
@@ -148,7 +249,7 @@ def refund_transaction(
                     "status": exc.status_code,
                     "data": {
                         "wallet_id": str(wallet_id),
-                        "action": "transaction_refund",
+                        "action": "transaction_delete_soft",
                         "transaction_id": str(transaction_id),
                     },
                 },
@@ -156,77 +257,141 @@ def refund_transaction(
         raise
 
     logger.info(
-        "transaction refunded",
+        "transaction soft deleted",
         extra={
-            "event_type": "audit_transaction_refunded",
+            "event_type": "audit_transaction_deleted_soft",
             "user_id": str(current_user.id),
             "src_ip": request.client.host if request.client else None,
             "user_agent": (request.headers.get("user-agent") or "")[:256],
-            "data": _clean_data(
-                {
-                    "wallet_id": str(wallet_id),
-                    "original_transaction_id": str(transaction_id),
-                    "refund_transaction_id": str(refund_tx.id),
-                    "amount_base": getattr(refund_tx, "amount_base", None),
-                    "currency_base": getattr(refund_tx, "currency_base", None),
-                    "amount_original": getattr(refund_tx, "amount_original", None),
-                    "currency_original": getattr(refund_tx, "currency_original", None),
-                    "fx_rate": getattr(refund_tx, "fx_rate", None),
-                }
-            ),
+            "data": {
+                "wallet_id": str(wallet_id),
+                "transaction_id": str(transaction_id),
+            },
         },
     )
-    return refund_tx
+    return None
 
 
-@router.delete("/{transaction_id}", status_code=204)
-def soft_delete_transaction(
+def _log_bulk_permission_denied(
+    *,
+    request: Request,
+    current_user: User,
     wallet_id: UUID,
-    transaction_id: UUID,
+    action: str,
+    body: TransactionBulkRequest,
+    status_code: int,
+) -> None:
+    logger.warning(
+        "permission denied",
+        extra={
+            "event_type": "permission_denied",
+            "user_id": str(current_user.id),
+            "src_ip": request.client.host if request.client else None,
+            "user_agent": (request.headers.get("user-agent") or "")[:256],
+            "status": status_code,
+            "data": {
+                "wallet_id": str(wallet_id),
+                "action": action,
+                "transaction_ids": [str(t) for t in body.transaction_ids],
+            },
+        },
+    )
+
+
+@router.post("/bulk-delete", response_model=TransactionBulkRead)
+def bulk_soft_delete_transactions(
+    wallet_id: UUID,
+    body: TransactionBulkRequest,
     db: DB,
     current_user: CurrentUser,
     request: Request,
-) -> None:
+) -> TransactionBulkRead:
     try:
-        transactions_handler.soft_delete_transaction(
+        result = transactions_handler.bulk_soft_delete_transactions(
             wallet_id=wallet_id,
-            transaction_id=transaction_id,
+            body=body,
             db=db,
             current_user=current_user,
         )
     except HTTPException as exc:
         if exc.status_code == 403:
-            logger.warning(
-                "permission denied",
-                extra={
-                    "event_type": "permission_denied",
-                    "user_id": str(current_user.id),
-                    "src_ip": request.client.host if request.client else None,
-                    "user_agent": (request.headers.get("user-agent") or "")[:256],
-                    "status": exc.status_code,
-                    "data": {
-                        "wallet_id": str(wallet_id),
-                        "action": "transaction_delete_soft",
-                        "transaction_id": str(transaction_id),
-                    },
-                },
+            _log_bulk_permission_denied(
+                request=request,
+                current_user=current_user,
+                wallet_id=wallet_id,
+                action="transaction_delete_soft_bulk",
+                body=body,
+                status_code=exc.status_code,
             )
         raise
 
     logger.info(
-        "transaction soft deleted",
+        "transactions soft deleted",
         extra={
-            "event_type": "audit_transaction_deleted_soft",
+            "event_type": "audit_transactions_deleted_soft_bulk",
             "user_id": str(current_user.id),
             "src_ip": request.client.host if request.client else None,
             "user_agent": (request.headers.get("user-agent") or "")[:256],
             "data": {
                 "wallet_id": str(wallet_id),
-                "transaction_id": str(transaction_id),
+                "requested": len(result.results),
+                "deleted": result.succeeded,
+                "transaction_ids": [
+                    str(r.transaction_id) for r in result.results if r.status == 204
+                ],
             },
         },
     )
-    return None
+    return result
+
+
+@router.post("/bulk-refund", response_model=TransactionBulkRead)
+def bulk_refund_transactions(
+    wallet_id: UUID,
+    body: TransactionBulkRequest,
+    db: DB,
+    current_user: CurrentUser,
+    request: Request,
+) -> TransactionBulkRead:
+    try:
+        result = transactions_handler.bulk_refund_transactions(
+            wallet_id=wallet_id,
+            body=body,
+            db=db,
+            current_user=current_user,
+        )
+    except HTTPException as exc:
+        if exc.status_code == 403:
+            _log_bulk_permission_denied(
+                request=request,
+                current_user=current_user,
+                wallet_id=wallet_id,
+                action="transaction_refund_bulk",
+                body=body,
+                status_code=exc.status_code,
+            )
+        raise
+
+    logger.info(
+        "transactions refunded",
+        extra={
+            "event_type": "audit_transactions_refunded_bulk",
+            "user_id": str(current_user.id),
+            "src_ip": request.client.host if request.client else None,
+            "user_agent": (request.headers.get("user-agent") or "")[:256],
+            "data": {
+                "wallet_id": str(wallet_id),
+                "requested": len(result.results),
+                "refunded": result.succeeded,
+                "refunds": {
+                    str(r.transaction_id): str(r.refund_transaction_id)
+                    for r in result.results
+                    if r.refund_transaction_id is not None
+                },
+            },
+        },
+    )
+    return result
 
 
 @router.get("/export", response_class=StreamingResponse)
@@ -4,10 +4,12 @@ from typing import Annotated
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, Request, HTTPException
+from fastapi.responses import Response
 from sqlalchemy.orm import Session
 
 from ..deps import get_current_user, get_db
 from ..handlers import wallet as wallets_handler
+from ..helpers.serialization import list_response
 from ..models import User
 from ..schemas.wallet import WalletCreate, WalletRead, WalletMemberAdd, MemberRead
 from ..logging_setup import setup_logger
@@ -117,9 +119,8 @@ def add_wallet_member(
 
 
 @router.get("/{wallet_id}/members", response_model=list[MemberRead])
-def list_wallet_members(
-    wallet_id: UUID, db: DB, current_user: CurrentUser
-) -> list[MemberRead]:
-    return wallets_handler.list_wallet_members(
+def list_wallet_members(wallet_id: UUID, db: DB, current_user: CurrentUser) -> Response:
+    members = wallets_handler.list_wallet_members(
         wallet_id=wallet_id, db=db, current_user=current_user
     )
+    return list_response(MemberRead, members)
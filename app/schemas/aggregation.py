@@ -1,4 +1,5 @@
 from datetime import datetime
+from uuid import UUID
 from .transaction import ProductInTransactionRead
 from .category import CategoryRead
 from decimal import Decimal
@@ -25,6 +26,21 @@ class CategoriesProductsSummaryRead(BaseModel):
     categories: list[CategoriesWithProductsSummaryRead]
 
 
+class MemberSummaryRead(BaseModel):
+    user_id: UUID
+    display_name: str | None
+    total: Decimal
+    categories: list[CategoriesWithProductsSummaryRead]
+
+
+class MembersSummaryRead(BaseModel):
+    currency: str
+    period_start: datetime
+    period_end: datetime
+    total: Decimal
+    members: list[MemberSummaryRead]
+
+
 class ImportanceSummaryRead(BaseModel):
     currency: str
     period_start: datetime
@@ -45,3 +61,63 @@ class PeriodTotalRead(BaseModel):
 class LastPeriodsHistoryRead(BaseModel):
     currency: str
     periods: list[PeriodTotalRead]
+
+
+class SumComparisonRead(BaseModel):
+    current: Decimal
+    previous: Decimal
+    delta: Decimal
+    pct_change: Decimal | None
+
+
+class CategoryComparisonRead(BaseModel):
+    category: CategoryRead
+    category_sum: SumComparisonRead
+
+
+class CategoriesComparisonSummaryRead(BaseModel):
+    currency: str
+    period_start: datetime
+    period_end: datetime
+    previous_period_start: datetime
+    previous_period_end: datetime
+    total: SumComparisonRead
+    categories: list[CategoryComparisonRead]
+
+
+class ImportanceComparisonSummaryRead(BaseModel):
+    currency: str
+    period_start: datetime
+    period_end: datetime
+    previous_period_start: datetime
+    previous_period_end: datetime
+    total: SumComparisonRead
+    necessary: SumComparisonRead
+    important: SumComparisonRead
+    unnecessary: SumComparisonRead
+    unassigned: SumComparisonRead
+
+
+class WalletImportanceSummaryRead(BaseModel):
+    wallet_id: UUID
+    wallet_name: str
+    currency: str
+    fx_rate: Decimal
+    total: Decimal
+    total_converted: Decimal
+    necessary: Decimal
+    important: Decimal
+    unnecessary: Decimal
+    unassigned: Decimal
+
+
+class AllWalletsSummaryRead(BaseModel):
+    currency: str
+    period_start: datetime
+    period_end: datetime
+    total: Decimal
+    necessary: Decimal
+    important: Decimal
+    unnecessary: Decimal
+    unassigned: Decimal
+    wallets: list[WalletImportanceSummaryRead]
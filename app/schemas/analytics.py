@@ -0,0 +1,30 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+from pydantic import BaseModel
+
+from .category import CategoryRead
+
+
+class CategoryAnalyticsRead(BaseModel):
+    category: CategoryRead
+    total: Decimal
+    mean_daily: Decimal
+    median_daily: Decimal
+    std_daily: Decimal
+    rolling_avg: Decimal
+    latest_zscore: float
+    anomaly_days: list[date]
+
+
+class WalletAnalyticsRead(BaseModel):
+    currency: str
+    period_start: datetime
+    period_end: datetime
+    days: int
+    window: int
+    z_threshold: float
+    total: Decimal
+    mean_daily: Decimal
+    rolling_avg: Decimal
+    categories: list[CategoryAnalyticsRead]
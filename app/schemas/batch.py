@@ -0,0 +1,28 @@
+from typing import Any, Literal
+
+from sqlmodel import Field, SQLModel
+
+# górny limit sub-żądań w jednym POST /batch
+BATCH_MAX_REQUESTS = 20
+
+
+class BatchItem(SQLModel):
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"] = "GET"
+    path: str
+    query: dict[str, str | list[str]] | None = None
+    body: Any = None
+    # przekazywany sub-żądaniu jako nagłówek Idempotency-Key
+    idempotency_key: str | None = Field(default=None, min_length=1, max_length=255)
+
+
+class BatchRequest(SQLModel):
+    requests: list[BatchItem] = Field(min_length=1, max_length=BATCH_MAX_REQUESTS)
+
+
+class BatchItemRead(SQLModel):
+    status: int
+    body: Any = None
+
+
+class BatchRead(SQLModel):
+    responses: list[BatchItemRead]
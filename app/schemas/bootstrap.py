@@ -0,0 +1,18 @@
+from uuid import UUID
+
+from sqlmodel import SQLModel
+
+from .category import CategoryRead
+from .product import ProductRead
+from .user import UserRead
+from .user_settings import UserSettingsRead
+from .wallet import WalletRead
+
+
+class BootstrapRead(SQLModel):
+    user: UserRead
+    settings: UserSettingsRead | None
+    wallets: list[WalletRead]
+    active_wallet_id: UUID | None
+    categories: list[CategoryRead]
+    products: list[ProductRead]
@@ -0,0 +1,24 @@
+from datetime import datetime
+from decimal import Decimal
+
+from sqlmodel import SQLModel, Field
+from sqlalchemy import Numeric
+
+from .category import CategoryRead
+
+
+class CategoryBudgetBase(SQLModel):
+    amount: Decimal = Field(sa_type=Numeric(12, 2))
+
+
+class CategoryBudgetSet(CategoryBudgetBase):
+    pass
+
+
+class CategoryBudgetStatusRead(CategoryBudgetBase):
+    category: CategoryRead
+    currency: str
+    period_start: datetime
+    period_end: datetime
+    spent: Decimal
+    remaining: Decimal
@@ -25,3 +25,11 @@ class CategoryRead(CategoryBase):
 
 class CategoryReadSum(CategoryRead):
     period_sum: Decimal
+
+
+class CategoryTopRead(CategoryRead):
+    period_sum: Decimal
+    rank: int
+    share: Decimal | None = None
+    previous_rank: int | None = None
+    rank_change: int | None = None
@@ -0,0 +1,28 @@
+from datetime import datetime
+from decimal import Decimal
+
+from pydantic import BaseModel
+
+from .category import CategoryRead
+
+
+class CategoryForecastRead(BaseModel):
+    category: CategoryRead
+    spent: Decimal
+    run_rate_daily: Decimal
+    historical_daily: Decimal
+    recurring_pending: Decimal
+    projected_total: Decimal
+
+
+class WalletForecastRead(BaseModel):
+    currency: str
+    period_start: datetime
+    period_end: datetime
+    days_in_period: int
+    days_elapsed: int
+    days_remaining: int
+    spent: Decimal
+    recurring_pending: Decimal
+    projected_total: Decimal
+    categories: list[CategoryForecastRead]
@@ -0,0 +1,12 @@
+from datetime import date
+from decimal import Decimal
+
+from sqlmodel import SQLModel, Field
+from sqlalchemy import Numeric, String
+
+
+class FxRateBase(SQLModel):
+    currency: str = Field(sa_type=String(3))
+    rate_date: date
+    # ECB: ile jednostek waluty za 1 EUR
+    rate: Decimal = Field(sa_type=Numeric(18, 6))
@@ -0,0 +1,22 @@
+from datetime import datetime
+from decimal import Decimal
+from uuid import UUID
+
+from pydantic import ConfigDict
+from sqlmodel import SQLModel, Field
+from sqlalchemy import Numeric
+
+
+class PeriodSnapshotBase(SQLModel):
+    period_start: datetime
+    period_end: datetime
+    total: Decimal = Field(sa_type=Numeric(12, 2))
+
+
+class PeriodSnapshotRead(PeriodSnapshotBase):
+    id: UUID
+    wallet_id: UUID
+    closed_by: UUID
+    closed_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
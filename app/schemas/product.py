@@ -33,3 +33,11 @@ class ProductRead(ProductPublic):
 
 class ProductReadSum(ProductRead):
     period_sum: Decimal
+
+
+class ProductTopRead(ProductRead):
+    period_sum: Decimal
+    rank: int
+    share: Decimal | None = None
+    previous_rank: int | None = None
+    rank_change: int | None = None
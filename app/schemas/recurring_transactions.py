@@ -1,11 +1,12 @@
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 from uuid import UUID
 
 from pydantic import ConfigDict
 from sqlmodel import SQLModel, Field
-from sqlalchemy import Numeric, String
+from sqlalchemy import Date, Enum as SAEnum, Numeric, String
 
+from ..domain.enums import RecurrenceRule
 from .category import CategoryRead
 from .transaction import ProductInTransactionRead
 
@@ -16,12 +17,26 @@ class RecurringMoney(SQLModel):
     description: str | None = None
 
 
-class RecurringTransactionCreate(RecurringMoney):
+class RecurringSchedule(SQLModel):
+    rule: RecurrenceRule = Field(
+        default=RecurrenceRule.BILLING_PERIOD,
+        sa_type=SAEnum(RecurrenceRule, name="recurrence_rule_enum"),
+        sa_column_kwargs={"server_default": "BILLING_PERIOD"},
+    )
+    # co ile jednostek reguły (weekly + 2 = co dwa tygodnie)
+    rule_interval: int = Field(
+        default=1, ge=1, le=366, sa_column_kwargs={"server_default": "1"}
+    )
+    # pierwszy dzień harmonogramu (lokalnie); domyślnie dzień utworzenia
+    anchor_date: date | None = Field(default=None, sa_type=Date)
+
+
+class RecurringTransactionCreate(RecurringMoney, RecurringSchedule):
     category_id: UUID
     product_id: UUID | None = None
 
 
-class RecurringTransactionRead(RecurringMoney):
+class RecurringTransactionRead(RecurringMoney, RecurringSchedule):
     id: UUID
     wallet_id: UUID
     category: CategoryRead
@@ -32,3 +47,26 @@ class RecurringTransactionRead(RecurringMoney):
     last_applied_at: datetime | None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class RecurringOccurrenceRead(SQLModel):
+    recurring_id: UUID
+    category_id: UUID
+    product_id: UUID | None = None
+    description: str | None = None
+    occurs_on: date
+    amount_base: Decimal
+
+
+class RecurringProjectionPeriodRead(SQLModel):
+    period_start: datetime
+    period_end: datetime
+    total: Decimal
+    occurrences: list[RecurringOccurrenceRead]
+
+
+class RecurringProjectionRead(SQLModel):
+    currency: str
+    months: int
+    total: Decimal
+    periods: list[RecurringProjectionPeriodRead]
@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Any
 from decimal import Decimal
 from uuid import UUID
 
@@ -14,6 +15,10 @@ class ProductInTransactionRead(ProductPublic):
     pass
 
 
+# górny limit id w jednym żądaniu bulk-delete / bulk-refund
+BULK_MAX_TRANSACTIONS = 500
+
+
 class TransactionCreate(SQLModel):
     category_id: UUID
     product_id: UUID | None = None
@@ -42,3 +47,38 @@ class TransactionRead(TransactionMoney):
     product: ProductInTransactionRead | None = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class TransactionCreateRead(TransactionRead):
+    budget_remaining: Decimal | None = None
+
+
+class TransactionColumnsRead(SQLModel):
+    """`?shape=columnar` list: one array per TransactionRead field.
+
+    `columns["category"]` and `columns["product"]` hold indexes into
+    `categories` and `products` (null when a transaction has no product).
+    """
+
+    count: int
+    columns: dict[str, list[Any]]
+    categories: list[CategoryRead]
+    products: list[ProductInTransactionRead]
+
+
+class TransactionBulkRequest(SQLModel):
+    transaction_ids: list[UUID] = Field(min_length=1, max_length=BULK_MAX_TRANSACTIONS)
+
+
+class TransactionBulkItemRead(SQLModel):
+    """Outcome for one id, with the status code the single-id endpoint would return."""
+
+    transaction_id: UUID
+    status: int
+    detail: str | None = None
+    refund_transaction_id: UUID | None = None
+
+
+class TransactionBulkRead(SQLModel):
+    succeeded: int
+    results: list[TransactionBulkItemRead]
@@ -0,0 +1,94 @@
+"""Spending analytics benchmark on a synthetic 5-year, 200-category wallet.
+
+Run from the repository root:
+
+    python -m benchmarks.analytics_bench
+"""
+
+from __future__ import annotations
+
+import statistics
+import time
+import uuid
+from collections import defaultdict
+
+import numpy as np
+
+from app.helpers.analytics import (
+    DailyCategorySums,
+    build_daily_matrix,
+    compute_category_stats,
+)
+
+N_DAYS = 5 * 365
+N_CATEGORIES = 200
+DENSITY = 0.6
+WINDOW = 7
+Z_THRESHOLD = 3.0
+REPEAT = 5
+
+
+def synthetic_sums(seed: int = 42) -> DailyCategorySums:
+    rng = np.random.default_rng(seed)
+    mask = rng.random((N_DAYS, N_CATEGORIES)) < DENSITY
+    day, category_idx = np.nonzero(mask)
+    amount = np.round(rng.gamma(2.0, 25.0, size=day.size), 2)
+    return DailyCategorySums(
+        day=day.astype(np.int64),
+        category_idx=category_idx.astype(np.int64),
+        amount=amount,
+        category_ids=[uuid.uuid4() for _ in range(N_CATEGORIES)],
+    )
+
+
+def vectorized(sums: DailyCategorySums) -> None:
+    matrix = build_daily_matrix(sums, first_day=0, n_days=N_DAYS)
+    _ = compute_category_stats(matrix, window=WINDOW, z_threshold=Z_THRESHOLD)
+
+
+def python_loops(sums: DailyCategorySums) -> None:
+    per_category: defaultdict[int, list[float]] = defaultdict(lambda: [0.0] * N_DAYS)
+    for d, c, a in zip(
+        sums.day.tolist(), sums.category_idx.tolist(), sums.amount.tolist()
+    ):
+        per_category[c][d] += a
+
+    for series in per_category.values():
+        mean = statistics.fmean(series)
+        std = statistics.stdev(series)
+        _ = statistics.median(series)
+        _ = sum(series[-WINDOW:]) / WINDOW
+        if std > 0:
+            _ = [
+                d
+                for d, v in enumerate(series)
+                if v > 0 and (v - mean) / std > Z_THRESHOLD
+            ]
+
+
+def best_of(fn, sums: DailyCategorySums) -> float:
+    timings: list[float] = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn(sums)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    sums = synthetic_sums()
+    print(
+        f"rows={sums.day.size} days={N_DAYS} categories={N_CATEGORIES} "
+        f"window={WINDOW} repeat={REPEAT}"
+    )
+
+    t_loops = best_of(python_loops, sums)
+    t_numpy = best_of(vectorized, sums)
+
+    print(f"python loops : {t_loops * 1000:9.2f} ms")
+    print(f"numpy        : {t_numpy * 1000:9.2f} ms")
+    print(f"speedup      : {t_loops / t_numpy:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Occurrence expansion benchmark: 2,000 mixed rules over a two-year window.
+
+Run from the repository root:
+
+    python -m benchmarks.recurrence_bench
+"""
+
+from __future__ import annotations
+
+import calendar
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from app.domain.enums import RecurrenceRule
+from app.helpers.recurrence import (
+    RULE_STEPS,
+    RecurrenceSchedules,
+    build_schedules,
+    expand_occurrences,
+)
+
+N_RULES = 2000
+WINDOW_START = date(2025, 1, 1)
+WINDOW_END = date(2026, 12, 31)
+REPEAT = 5
+
+
+def synthetic_rules(
+    seed: int = 42,
+) -> list[tuple[RecurrenceRule, int, date, date, date]]:
+    rng = np.random.default_rng(seed)
+    rules = list(RecurrenceRule)
+    out: list[tuple[RecurrenceRule, int, date, date, date]] = []
+    for _ in range(N_RULES):
+        rule = rules[int(rng.integers(len(rules)))]
+        interval = int(rng.integers(1, 4))
+        anchor = date(2024, 1, 1) + timedelta(days=int(rng.integers(0, 900)))
+        out.append((rule, interval, anchor, WINDOW_START, WINDOW_END))
+    return out
+
+
+def python_loops(rules: list[tuple[RecurrenceRule, int, date, date, date]]) -> int:
+    count = 0
+    for rule, interval, anchor, first, last in rules:
+        unit, multiplier = RULE_STEPS[rule]
+        step = interval * multiplier
+        k = 0
+        while True:
+            if unit == "D":
+                day = anchor + timedelta(days=k * step)
+            else:
+                months = anchor.month - 1 + k * step
+                year, month = anchor.year + months // 12, months % 12 + 1
+                last_day = calendar.monthrange(year, month)[1]
+                day = date(year, month, min(anchor.day, last_day))
+            if day > last:
+                break
+            if day >= first:
+                count += 1
+            k += 1
+    return count
+
+
+def vectorized(schedules: RecurrenceSchedules) -> int:
+    return expand_occurrences(schedules).day.size
+
+
+def best_of(fn, arg) -> tuple[float, int]:
+    timings: list[float] = []
+    result = 0
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = fn(arg)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main() -> None:
+    rules = synthetic_rules()
+    schedules = build_schedules(rules)
+
+    t_loops, n_loops = best_of(python_loops, rules)
+    t_numpy, n_numpy = best_of(vectorized, schedules)
+    assert n_loops == n_numpy
+
+    print(f"rules={N_RULES} window={WINDOW_START}..{WINDOW_END} occurrences={n_numpy}")
+    print(f"python loops : {t_loops * 1000:9.2f} ms")
+    print(f"numpy        : {t_numpy * 1000:9.2f} ms")
+    print(f"speedup      : {t_loops / t_numpy:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
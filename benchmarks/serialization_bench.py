@@ -0,0 +1,103 @@
+"""Serialization benchmark for a 50k-row transaction list response.
+
+Run from the repository root:
+
+    python -m benchmarks.serialization_bench
+"""
+
+from __future__ import annotations
+
+import json
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+from pydantic import TypeAdapter
+
+from app.helpers.serialization import list_adapter, orjson_dumps, validate_list
+from app.schemas.transaction import TransactionRead
+
+N_ROWS = 50_000
+REPEAT = 3
+
+
+def synthetic_rows() -> list[SimpleNamespace]:
+    """ORM-like objects with the attributes TransactionRead reads."""
+    now = datetime.now(timezone.utc)
+    wallet_id = uuid.uuid4()
+    user_id = uuid.uuid4()
+    categories = [
+        SimpleNamespace(
+            id=uuid.uuid4(), name=f"cat {i}", color="#aabbcc", icon=None, created_at=now
+        )
+        for i in range(20)
+    ]
+    products = [
+        SimpleNamespace(id=uuid.uuid4(), name=f"product {i}", importance="necessary")
+        for i in range(100)
+    ]
+    return [
+        SimpleNamespace(
+            id=uuid.uuid4(),
+            wallet_id=wallet_id,
+            user_id=user_id,
+            refund_of_transaction_id=None,
+            type="expense",
+            occurred_at=now - timedelta(minutes=i),
+            created_at=now,
+            category=categories[i % len(categories)],
+            product=products[i % len(products)] if i % 3 else None,
+            amount_base=Decimal(f"{(i % 9000) / 100 + 1:.2f}"),
+            currency_base="PLN",
+            amount_original=None,
+            currency_original=None,
+            fx_rate=None,
+        )
+        for i in range(N_ROWS)
+    ]
+
+
+def per_row(rows: list[SimpleNamespace]) -> bytes:
+    # dotychczasowa ścieżka: model_validate per wiersz, ponowna walidacja
+    # response_model w FastAPI i json.dumps z JSONResponse
+    items = [TransactionRead.model_validate(r) for r in rows]
+    adapter = TypeAdapter(list[TransactionRead])
+    content = adapter.dump_python(adapter.validate_python(items), mode="json")
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode()
+
+
+def batched(rows: list[SimpleNamespace]) -> bytes:
+    items = validate_list(TransactionRead, rows)
+    return orjson_dumps(list_adapter(TransactionRead).dump_python(items))
+
+
+def best_of(fn, rows: list[SimpleNamespace]) -> float:
+    timings: list[float] = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        _ = fn(rows)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    rows = synthetic_rows()
+    print(f"rows={N_ROWS} repeat={REPEAT}")
+
+    if json.loads(per_row(rows)) != json.loads(batched(rows)):
+        raise SystemExit("outputs differ")
+
+    t_before = best_of(per_row, rows)
+    t_after = best_of(batched, rows)
+
+    print(f"per-row + json : {t_before * 1000:9.2f} ms")
+    print(f"batch + orjson : {t_after * 1000:9.2f} ms")
+    print(f"speedup        : {t_before / t_after:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()